@@ -0,0 +1,101 @@
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jarvis.commands import CLOSE_ACTIONS, OPEN_ACTIONS, CommandStore, _write_commands
+
+WORDS = (
+    "youtube", "google", "notepad", "spotify", "chrome", "calculator", "mail", "drive", "photos", "music",
+    "weather", "office", "code", "terminal", "slack", "zoom", "netflix", "maps", "news", "calendar",
+)
+SYLLABLES = ("ka", "ri", "zo", "mel", "tan", "vu", "po", "shi", "lex", "dra", "no", "qui", "ba", "fen", "go", "ta")
+
+def pseudo_word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+def linear_match(query, commands):
+    for cmd in commands:
+        if cmd["trigger"] in query:
+            if any(a in query for a in OPEN_ACTIONS):
+                return cmd, "open"
+            if cmd["type"] == "app" and any(a in query for a in CLOSE_ACTIONS):
+                return cmd, "close"
+    return None, None
+
+def make_commands(n: int, rng: random.Random):
+    commands, seen = [], set()
+    while len(commands) < n:
+        if len(commands) < len(WORDS):
+            trigger = WORDS[len(commands)]
+        else:
+            trigger = " ".join(pseudo_word(rng) for _ in range(rng.randint(1, 2)))
+        if trigger in seen:
+            continue
+        seen.add(trigger)
+        if rng.random() < 0.5:
+            commands.append({"trigger": trigger, "type": "website", "target": f"https://example.com/{len(commands)}"})
+        else:
+            commands.append({"trigger": trigger, "type": "app", "target": f"C:\\apps\\{len(commands)}.exe", "process_name": f"{len(commands)}.exe"})
+    return commands
+
+def make_queries(commands, count: int, rng: random.Random):
+    queries = []
+    for _ in range(count):
+        if rng.random() < 0.7:
+            cmd = rng.choice(commands)
+            verb = rng.choice(OPEN_ACTIONS + CLOSE_ACTIONS)
+            queries.append(f"please {verb} {cmd['trigger']} for me")
+        else:
+            queries.append(f"open something about {rng.choice(WORDS)} that does not exist")
+    return queries
+
+def time_per_query(fn, queries) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) * 1e6 / len(queries)
+
+def main():
+    parser = argparse.ArgumentParser(description="Custom command lookup: linear scan vs CommandStore index.")
+    parser.add_argument("--sizes", default="10,100,1000,5000")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="arjun_cmds_")
+    try:
+        print(f"{'commands':>9} {'linear us/q':>12} {'indexed us/q':>13} {'load ms':>9} {'add ms':>8} {'remove ms':>10} {'mismatches':>11}")
+        for n in (int(s) for s in args.sizes.split(",")):
+            rng = random.Random(args.seed)
+            commands = make_commands(n, rng)
+            queries = make_queries(commands, args.queries, rng)
+            path = os.path.join(tmp_dir, f"commands_{n}.json")
+            _write_commands(path, commands)
+
+            start = time.perf_counter()
+            store = CommandStore(path).load()
+            load_ms = (time.perf_counter() - start) * 1000
+
+            mismatches = sum(1 for q in queries if linear_match(q, commands) != store.match(q))
+            linear = time_per_query(lambda q: linear_match(q, commands), queries)
+            indexed = time_per_query(store.match, queries)
+
+            start = time.perf_counter()
+            store.add({"trigger": "benchmark probe", "type": "website", "target": "https://example.com"})
+            add_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            store.remove("benchmark probe")
+            remove_ms = (time.perf_counter() - start) * 1000
+
+            print(f"{n:>9} {linear:>12.1f} {indexed:>13.1f} {load_ms:>9.1f} {add_ms:>8.1f} {remove_ms:>10.1f} {mismatches:>11}")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+import queue
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeAudioManager, Recorder, install_fakes
+from jarvis.headless import sandbox_paths
+
+UTTERANCES = (
+    "what's the time and weather in delhi and read my gmail summary",
+    "tell me a joke, what is the system status and give me the latest news",
+    "weather in mumbai and the latest news headlines",
+    "gmail summary and any new attachments and weather in pune",
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compound utterances: parallel sub-intents vs handling each part in sequence.")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply the stand-in backend latencies.")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="arjun_compound_")
+    sandbox_paths(tmp_dir)
+    recorder = Recorder({}, seed=args.seed, scale=args.scale)
+    install_fakes(recorder)
+    from jarvis import compound
+    from jarvis.assistant import JarvisAssistant
+    from jarvis.tracing import tracer
+
+    audio = FakeAudioManager(recorder)
+    assistant = JarvisAssistant(queue.Queue(), lambda text: None, audio=audio)
+    assistant.initialize()
+
+    try:
+        print(f"{'utterance':<58} {'parts':>5} {'sequential ms':>14} {'parallel ms':>12} {'speedup':>8}")
+        for utterance in UTTERANCES:
+            parts = compound.plan(utterance, assistant.route)
+            if not parts:
+                print(f"{utterance[:58]:<58} not split")
+                continue
+            sequential, parallel = [], []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                for text, _, _ in parts:
+                    with tracer.turn(text):
+                        assistant._try_handle_query(text, text.lower())
+                sequential.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                with tracer.turn(utterance):
+                    assistant.handle_query(utterance)
+                parallel.append((time.perf_counter() - start) * 1000)
+            seq, par = statistics.median(sequential), statistics.median(parallel)
+            print(f"{utterance[:58]:<58} {len(parts):>5} {seq:>14.0f} {par:>12.0f} {seq / par:>7.2f}x")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
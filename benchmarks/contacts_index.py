@@ -0,0 +1,86 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jarvis.contacts import Contact, ContactDirectory
+
+FIRST = (
+    "rahul", "priya", "amit", "sneha", "vikram", "anjali", "rohit", "pooja", "suresh", "kavita", "arjun", "neha",
+    "shubham", "deepak", "sunita", "manish", "ritu", "karan", "divya", "sanjay", "meera", "ajay", "swati", "nikhil",
+)
+LAST = ("sharma", "verma", "gupta", "singh", "kumar", "patel", "reddy", "iyer", "nair", "joshi", "mehta", "das")
+SYLLABLES = (
+    "ka", "ri", "van", "esh", "pra", "dee", "mo", "han", "ti", "la", "su", "nit", "ra", "jo", "bha", "gau", "tam",
+    "vi", "shal", "ne", "del", "har", "ish", "ma", "dhu", "ku", "ber", "sa", "chin", "ya", "ro", "zan",
+)
+HONORIFICS = ("bhai", "ji", "sir", "didi")
+
+def make_contacts(n: int, rng: random.Random):
+    contacts, seen = [], set()
+    while len(contacts) < n:
+        first = rng.choice(FIRST) if rng.random() < 0.3 else "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+        last = rng.choice(LAST) if rng.random() < 0.5 else "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+        name = f"{first.title()} {last.title()}"
+        if name not in seen:
+            seen.add(name)
+            contacts.append(Contact(name, f"+91{9000000000 + len(contacts)}"))
+    return contacts
+
+def speech_variant(name: str, rng: random.Random) -> str:
+    words = name.lower().split()
+    roll = rng.random()
+    if roll < 0.25:
+        words.append(rng.choice(HONORIFICS))
+    elif roll < 0.5:
+        i = rng.randrange(len(words))
+        vowels = [j for j, c in enumerate(words[i]) if c in "aeiou"]
+        if vowels:
+            j = rng.choice(vowels)
+            words[i] = words[i][:j] + words[i][j] + words[i][j:]
+    elif roll < 0.75:
+        i = rng.randrange(len(words))
+        j = rng.randrange(len(words[i]))
+        words[i] = words[i][:j] + words[i][j + 1:]
+    return " ".join(words)
+
+def main():
+    parser = argparse.ArgumentParser(description="Contact directory: index build time and fuzzy lookup latency/accuracy.")
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'contacts':>9} {'build s':>8} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} {'top-1':>6} {'top-5':>6} {'resolved':>9}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        rng = random.Random(args.seed)
+        contacts = make_contacts(n, rng)
+        start = time.perf_counter()
+        directory = ContactDirectory().extend(contacts)
+        build = time.perf_counter() - start
+
+        timings, top1, top5, resolved = [], 0, 0, 0
+        for _ in range(args.queries):
+            target = rng.choice(contacts)
+            query = speech_variant(target.name, rng)
+            t0 = time.perf_counter()
+            ranked = directory.rank(query)
+            timings.append((time.perf_counter() - t0) * 1000)
+            names = [c.name for c, _ in ranked]
+            top1 += bool(names) and names[0] == target.name
+            top5 += target.name in names
+            contact, _ = directory.resolve(query)
+            resolved += contact is not None and contact.name == target.name
+        timings.sort()
+        q = args.queries
+        print(
+            f"{n:>9} {build:>8.2f} {statistics.median(timings):>7.2f} {timings[int(q * 0.95)]:>7.2f} {timings[-1]:>7.2f} "
+            f"{top1 / q:>6.1%} {top5 / q:>6.1%} {resolved / q:>9.1%}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jarvis.dedup import DEDUP_CAPACITY, NearDuplicateFilter, normalize
+
+REPEATED = (
+    ("what is the time", "The time is 10:42:07"),
+    ("tell me a joke", "Why don't scientists trust atoms? Because they make up everything!"),
+    ("volume up", "Turning the volume up."),
+    ("what's the weather in delhi", "Clear skies and warm, around thirty one degrees."),
+    ("read my notes", "You have 3 notes. Reading the latest 3."),
+)
+SYLLABLES = ("ka", "ri", "zo", "mel", "tan", "vu", "po", "shi", "lex", "dra", "no", "qui", "ba", "fen", "go", "ta")
+TOPICS = ("recursion", "python", "black holes", "egg sandwich", "the roman empire", "neural networks", "gardening", "chess")
+
+def stt_noise(text: str, rng: random.Random) -> str:
+    words = text.split()
+    i = rng.randrange(len(words))
+    word = words[i]
+    if len(word) > 3:
+        j = rng.randrange(len(word))
+        words[i] = word[:j] + word[j + 1:]
+    return " ".join(words)
+
+def make_examples(n: int, rng: random.Random):
+    examples = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.3:
+            user, reply = rng.choice(REPEATED)
+            if rng.random() < 0.3:
+                user = stt_noise(user, rng)
+            examples.append((f"{user}\n{reply}", "repeat"))
+        else:
+            words = " ".join("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(3, 8)))
+            topic = rng.choice(TOPICS)
+            examples.append((f"tell me about {topic} {words}\nHere is a long answer about {topic}: {words} {i}", "unique"))
+    return examples
+
+def jaccard(a: str, b: str) -> float:
+    sa = {a[i:i + 4] for i in range(max(1, len(a) - 3))}
+    sb = {b[i:i + 4] for i in range(max(1, len(b) - 3))}
+    return len(sa & sb) / len(sa | sb)
+
+def main():
+    parser = argparse.ArgumentParser(description="MinHash/LSH near-duplicate filter: throughput, memory bound and accuracy.")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--capacity", type=int, default=DEDUP_CAPACITY)
+    parser.add_argument("--batch", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'examples':>9} {'seconds':>8} {'us/example':>11} {'kept':>8} {'dropped':>8} {'unique lost':>12} {'repeats kept':>13} {'table MB':>9}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        rng = random.Random(args.seed)
+        examples = make_examples(n, rng)
+        dedup = NearDuplicateFilter(args.threshold, capacity=args.capacity)
+        keep = []
+        start = time.perf_counter()
+        for i in range(0, n, args.batch):
+            keep.extend(dedup.filter([text for text, _ in examples[i:i + args.batch]]))
+        elapsed = time.perf_counter() - start
+        unique_lost = sum(1 for (_, kind), kept in zip(examples, keep) if kind == "unique" and not kept)
+        repeats_kept = sum(1 for (_, kind), kept in zip(examples, keep) if kind == "repeat" and kept)
+        table_mb = (dedup._keys.nbytes + dedup._owners.nbytes + dedup._sigs.nbytes + dedup._sig_owner.nbytes) / 1e6
+        print(f"{n:>9} {elapsed:>8.2f} {elapsed * 1e6 / n:>11.1f} {dedup.kept:>8} {dedup.dropped:>8} {unique_lost:>12} {repeats_kept:>13} {table_mb:>9.1f}")
+
+    kept_repeats = [normalize(t) for (t, kind), k in zip(examples, keep) if kind == "repeat" and k]
+    if len(kept_repeats) > 1:
+        closest = max(jaccard(a, b) for i, a in enumerate(kept_repeats) for b in kept_repeats[i + 1:])
+        print(f"Highest 4-gram Jaccard between kept repeat variants: {closest:.2f}")
+    print("Cluster stats:", {k: v for k, v in dedup.stats().items() if k != "top_clusters"})
+
+if __name__ == "__main__":
+    main()
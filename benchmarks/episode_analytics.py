@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jarvis.analytics import load_columns, summarize
+
+HANDLERS = (
+    ("chat", 0.35, 0.04, 1800.0), ("time", 0.08, 0.0, 5.0), ("weather_builtin", 0.07, 0.06, 900.0),
+    ("notes_add", 0.05, 0.01, 40.0), ("notes_read", 0.05, 0.0, 30.0), ("gmail_summary", 0.06, 0.12, 1400.0),
+    ("news", 0.06, 0.08, 1100.0), ("volume_up", 0.06, 0.0, 8.0), ("media_playpause", 0.07, 0.0, 6.0),
+    ("joke", 0.05, 0.0, 4.0), ("custom_command", 0.06, 0.03, 60.0), ("system_status", 0.04, 0.0, 250.0),
+)
+NOTES = ("I'm having trouble connecting to my brain.", "cancelled", "timeout", "HTTP 503 from wttr.in")
+
+def write_log(path: str, n: int, rng: random.Random):
+    names = [h[0] for h in HANDLERS]
+    weights = [h[1] for h in HANDLERS]
+    params = {h[0]: h[2:] for h in HANDLERS}
+    ts = time.time() - n * 30
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            handler = rng.choices(names, weights)[0]
+            fail_rate, latency = params[handler]
+            success = rng.random() >= fail_rate
+            ms = rng.lognormvariate(0, 0.5) * latency
+            spans = [{"name": "route", "start_ms": 0.1, "ms": 0.2}]
+            if handler in ("chat", "weather_builtin", "news"):
+                spans.append({"name": "llm.chat" if handler == "chat" else "llm.generate", "start_ms": 0.4, "ms": round(ms * 0.9, 1), "model": "gemma:2b"})
+            record = {
+                "ts": ts + i * 30, "query": f"query number {i} for {handler}",
+                "assistant_reply": "Sure, here is a reply with a few words in it." if success else "",
+                "handler": handler, "success": success, "notes": "" if success else rng.choice(NOTES),
+                "turn_id": f"{i:012x}", "latency_ms": round(ms, 1), "spans": spans,
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def naive_summary(path: str):
+    counts, failures, latencies = defaultdict(int), defaultdict(int), defaultdict(list)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            ep = json.loads(line)
+            h = ep["handler"]
+            counts[h] += 1
+            failures[h] += not ep["success"]
+            latencies[h].append(ep.get("latency_ms", 0.0))
+    return {h: (counts[h], failures[h] / counts[h], sorted(latencies[h])[len(latencies[h]) // 2]) for h in counts}
+
+def main():
+    parser = argparse.ArgumentParser(description="Episode analytics on synthetic logs: columnar loader vs json.loads loop.")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-naive", action="store_true")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="arjun_analytics_")
+    try:
+        print(f"{'episodes':>9} {'file MB':>8} {'load s':>7} {'summarize s':>12} {'naive s':>8}")
+        for n in (int(s) for s in args.sizes.split(",")):
+            path = os.path.join(tmp_dir, f"episodes_{n}.jsonl")
+            write_log(path, n, random.Random(args.seed))
+            size_mb = os.path.getsize(path) / 1e6
+
+            t0 = time.perf_counter()
+            cols = load_columns(path)
+            t1 = time.perf_counter()
+            report = summarize(cols)
+            t2 = time.perf_counter()
+            assert report["episodes"] == n, report["episodes"]
+
+            naive = float("nan")
+            if not args.skip_naive:
+                t3 = time.perf_counter()
+                naive_summary(path)
+                naive = time.perf_counter() - t3
+            print(f"{n:>9} {size_mb:>8.1f} {t1 - t0:>7.2f} {t2 - t1:>12.3f} {naive:>8.2f}")
+            os.remove(path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import random
+import sys
+import threading
+import time
+import types
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+DEFAULT_LATENCIES = {
+    "stt": {"kind": "lognormal", "median_ms": 450, "sigma": 0.35},
+    "tts": {"kind": "lognormal", "median_ms": 300, "sigma": 0.3},
+    "ollama.chat": {"kind": "lognormal", "median_ms": 1800, "sigma": 0.45},
+    "ollama.generate": {"kind": "lognormal", "median_ms": 1200, "sigma": 0.4},
+    "gmail.list": {"kind": "lognormal", "median_ms": 250, "sigma": 0.3},
+    "gmail.get": {"kind": "lognormal", "median_ms": 60, "sigma": 0.3},
+    "wttr": {"kind": "lognormal", "median_ms": 400, "sigma": 0.5},
+    "newsapi": {"kind": "lognormal", "median_ms": 350, "sigma": 0.4},
+    "wikipedia": {"kind": "lognormal", "median_ms": 700, "sigma": 0.5},
+    "local": {"kind": "constant", "ms": 0},
+}
+
+class LatencyModel:
+    def __init__(self, spec: dict, rng: random.Random, scale: float = 1.0):
+        self.kind = spec.get("kind", "constant")
+        self.spec = spec
+        self.rng = rng
+        self.scale = scale
+
+    def sample_ms(self) -> float:
+        s = self.spec
+        if self.kind == "constant":
+            value = s.get("ms", 0)
+        elif self.kind == "uniform":
+            value = self.rng.uniform(s["min_ms"], s["max_ms"])
+        elif self.kind == "normal":
+            value = self.rng.gauss(s["mean_ms"], s.get("stdev_ms", 0))
+        elif self.kind == "lognormal":
+            value = s["median_ms"] * self.rng.lognormvariate(0, s.get("sigma", 0.3))
+        elif self.kind == "choice":
+            value = self.rng.choice(s["values_ms"])
+        else:
+            raise ValueError(f"Unknown latency kind: {self.kind}")
+        return max(0.0, value) * self.scale
+
+class Recorder:
+    def __init__(self, latencies: dict, seed: int = 1234, scale: float = 1.0):
+        rng = random.Random(seed)
+        merged = dict(DEFAULT_LATENCIES)
+        merged.update(latencies or {})
+        self.models = {name: LatencyModel(spec, rng, scale) for name, spec in merged.items()}
+        self._lock = threading.Lock()
+        self._stages = defaultdict(float)
+
+    def reset(self):
+        with self._lock:
+            stages = dict(self._stages)
+            self._stages.clear()
+        return stages
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self._stages[stage] += seconds
+
+    @contextmanager
+    def stage(self, name: str, backend: str | None = None):
+        model = self.models.get(backend or name)
+        start = time.perf_counter()
+        try:
+            if model is not None:
+                time.sleep(model.sample_ms() / 1000.0)
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+class FakeAudioManager:
+    def __init__(self, recorder: Recorder):
+        self.recorder = recorder
+        self.is_asleep = False
+        self.voice_profile = "friendly"
+        self.offline_mode = False
+        self.spoken = []
+        self.followups = []
+
+    def say(self, text: str):
+        with self.recorder.stage("tts"):
+            self.spoken.append(text)
+
+    def listen(self, barge_in: bool = False) -> str:
+        with self.recorder.stage("stt"):
+            if self.followups:
+                return self.followups.pop(0).lower()
+            return "none"
+
+    def stop_speaking(self):
+        pass
+
+    def set_sleep(self, sleep: bool):
+        self.is_asleep = sleep
+
+    def cleanup(self):
+        pass
+
+    def set_voice_profile(self, profile: str):
+        profile = (profile or "").lower()
+        if profile in ("friendly", "jarvis"):
+            self.voice_profile = profile
+
+def _fake_ollama(recorder: Recorder):
+    mod = types.ModuleType("ollama")
+
+    def chat(model, messages, **kwargs):
+        with recorder.stage("ollama.chat"):
+            last = messages[-1]["content"] if messages else ""
+            reply = (
+                f"Sure, here is a short answer about {last[:40]}. "
+                "It has a few sentences so the persona filters have something to do. "
+                "Let me know if you need anything else."
+            )
+            return {"message": {"role": "assistant", "content": reply}, "done": True}
+
+    def generate(model, prompt, **kwargs):
+        with recorder.stage("ollama.generate"):
+            if "self-improvement" in prompt:
+                return {"response": '{"new_triggers": [], "system_prompt_append": ""}', "done": True}
+            context = list(kwargs.get("context") or ())
+            prompt_tokens = len(prompt.split())
+            return {
+                "response": "Clear skies and warm, around thirty one degrees.", "done": True,
+                "context": context + list(range(prompt_tokens + 1)),
+                "prompt_eval_count": prompt_tokens, "prompt_eval_duration": prompt_tokens * 200_000,
+            }
+
+    mod.chat = chat
+    mod.generate = generate
+    return mod
+
+def _fake_requests(recorder: Recorder):
+    mod = types.ModuleType("requests")
+
+    class Response:
+        status_code = 200
+        text = "Sunny +31°C ↗11km/h"
+
+    def get(url, *args, **kwargs):
+        with recorder.stage("wttr"):
+            return Response()
+
+    mod.get = get
+    return mod
+
+def _fake_newsapi(recorder: Recorder):
+    mod = types.ModuleType("newsapi")
+
+    class NewsApiClient:
+        def __init__(self, api_key=None):
+            self.api_key = api_key
+
+        def get_top_headlines(self, **kwargs):
+            with recorder.stage("newsapi"):
+                articles = [{"title": f"Headline number {i}"} for i in range(kwargs.get("page_size", 5))]
+                return {"status": "ok", "totalResults": len(articles), "articles": articles}
+
+    mod.NewsApiClient = NewsApiClient
+    return mod
+
+def _fake_wikipedia(recorder: Recorder):
+    mod = types.ModuleType("wikipedia")
+
+    def summary(topic, sentences=2, **kwargs):
+        with recorder.stage("wikipedia"):
+            return f"{topic.title()} is a widely known topic. This is a stand-in summary."
+
+    mod.summary = summary
+    return mod
+
+def _local_module(name: str, **attrs):
+    mod = types.ModuleType(name)
+    for key, value in attrs.items():
+        setattr(mod, key, value)
+    return mod
+
+class _FakeGmailService:
+    def __init__(self, recorder: Recorder):
+        self.recorder = recorder
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def list(self, userId, q, maxResults=10):
+        return _FakeCall(self.recorder, "gmail.list", {"messages": [{"id": str(i)} for i in range(min(maxResults, 5))]})
+
+    def get(self, userId, id, **kwargs):
+        payload = {"headers": [
+            {"name": "From", "value": f"Sender {id} <sender{id}@example.com>"},
+            {"name": "Subject", "value": f"Stand-in subject {id}"},
+        ]}
+        return _FakeCall(self.recorder, "gmail.get", {"id": id, "payload": payload, "snippet": "stand-in snippet"})
+
+class _FakeCall:
+    def __init__(self, recorder, backend, result):
+        self.recorder = recorder
+        self.backend = backend
+        self.result = result
+
+    def execute(self):
+        with self.recorder.stage("gmail", backend=self.backend):
+            return self.result
+
+class _FakeProcess:
+    def oneshot(self):
+        return nullcontext()
+
+    def cpu_percent(self, interval=None):
+        return 3.0
+
+    def memory_info(self):
+        return types.SimpleNamespace(rss=180 * 1024 * 1024)
+
+    def num_threads(self):
+        return threading.active_count()
+
+def install_fakes(recorder: Recorder):
+    sys.modules["ollama"] = _fake_ollama(recorder)
+    sys.modules["requests"] = _fake_requests(recorder)
+    sys.modules["newsapi"] = _fake_newsapi(recorder)
+    sys.modules["wikipedia"] = _fake_wikipedia(recorder)
+    sys.modules["pyautogui"] = _local_module("pyautogui", press=lambda *a, **k: None, hotkey=lambda *a, **k: None)
+    sys.modules["screen_brightness_control"] = _local_module(
+        "screen_brightness_control", get_brightness=lambda: [50], set_brightness=lambda v: None
+    )
+    sys.modules["psutil"] = _local_module(
+        "psutil",
+        cpu_percent=lambda interval=None: 12.5,
+        virtual_memory=lambda: types.SimpleNamespace(percent=48.0),
+        disk_usage=lambda path: types.SimpleNamespace(percent=61.0),
+        net_io_counters=lambda: types.SimpleNamespace(bytes_sent=0, bytes_recv=0),
+        Process=_FakeProcess,
+    )
+    sys.modules["pyperclip"] = _local_module("pyperclip", paste=lambda: "stand-in clipboard text")
+
+    import webbrowser
+    webbrowser.open = lambda *a, **k: True
+
+    from jarvis import gmail_tools
+    gmail_tools._get_gmail_service = lambda: _FakeGmailService(recorder)
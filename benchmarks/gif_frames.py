@@ -0,0 +1,62 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from gui.frames import GifFrameCache
+from jarvis.paths import paths
+
+def rss_mb() -> float:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except Exception:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def eager_decode(gif_path: str, size):
+    gif = Image.open(gif_path)
+    frames = []
+    for i in range(getattr(gif, "n_frames", 1)):
+        gif.seek(i)
+        frames.append(gif.copy().resize(size, Image.LANCZOS))
+    return frames
+
+def measure(label: str, fn):
+    before = rss_mb()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{label:<28} {elapsed:9.1f} ms   RSS +{rss_mb() - before:7.1f} MB")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare eager vs cached GIF avatar startup.")
+    parser.add_argument("--gif", default=paths.assistant_gif)
+    parser.add_argument("--width", type=int, default=250)
+    parser.add_argument("--height", type=int, default=180)
+    args = parser.parse_args()
+    size = (args.width, args.height)
+
+    cache_root = tempfile.mkdtemp(prefix="arjun_frames_")
+    try:
+        frames = measure("eager (before)", lambda: eager_decode(args.gif, size))
+        print(f"  frames held in memory: {len(frames)}")
+        del frames
+
+        cold = measure("cache open, cold", lambda: GifFrameCache(args.gif, size, cache_root))
+        measure("first frame, cold", lambda: cold.frame(0))
+        measure("fill cache (one pass)", lambda: [cold.frame(i) for i in range(len(cold))])
+        warm = measure("cache open, warm (after)", lambda: GifFrameCache(args.gif, size, cache_root))
+        measure("first frame, warm", lambda: warm.frame(0))
+    finally:
+        shutil.rmtree(cache_root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
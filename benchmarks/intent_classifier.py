@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jarvis.intents import FALLBACK_LABEL, IntentClassifier
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_LABELS = os.path.join(BENCH_DIR, "transcripts", "intents.json")
+
+def evaluate(classifier, utterances):
+    correct = false_actions = missed = wrong = 0
+    errors = []
+    for utt in utterances:
+        expected = utt["handler"]
+        label, score = classifier.classify(utt["query"])
+        label = label or FALLBACK_LABEL
+        if label == expected:
+            correct += 1
+            continue
+        if expected == FALLBACK_LABEL:
+            false_actions += 1
+        elif label == FALLBACK_LABEL:
+            missed += 1
+        else:
+            wrong += 1
+        errors.append((utt["query"], expected, label, score))
+    return correct, false_actions, missed, wrong, errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy and latency of the intent classifier on a labelled phrase set.")
+    parser.add_argument("--labels", default=DEFAULT_LABELS, help="JSON file with labelled utterances.")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--thresholds", default="0.35,0.4,0.45,0.5,0.55")
+    parser.add_argument("--show-errors", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.labels, "r", encoding="utf-8") as f:
+        utterances = json.load(f)["utterances"]
+    actions = sum(1 for u in utterances if u["handler"] != FALLBACK_LABEL)
+
+    start = time.perf_counter()
+    classifier = IntentClassifier().build()
+    build_ms = (time.perf_counter() - start) * 1000
+    if not classifier.enabled:
+        return
+    print(f"{len(classifier._base.labels)} examples, build {build_ms:.1f} ms, {len(utterances)} labelled phrases ({actions} actions)")
+
+    print(f"{'threshold':>9} {'accuracy':>9} {'false actions':>14} {'missed':>7} {'wrong':>6}")
+    for threshold in (float(t) for t in args.thresholds.split(",")):
+        classifier.threshold = threshold
+        correct, false_actions, missed, wrong, errors = evaluate(classifier, utterances)
+        print(f"{threshold:>9.2f} {correct / len(utterances):>9.1%} {false_actions:>14} {missed:>7} {wrong:>6}")
+        if args.show_errors:
+            for query, expected, label, score in errors:
+                print(f"    {query!r}: expected {expected}, got {label} ({score:.2f})")
+
+    timings = []
+    for _ in range(args.repeat):
+        for utt in utterances:
+            t0 = time.perf_counter()
+            classifier.classify(utt["query"])
+            timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    print(f"latency per query: p50 {timings[len(timings) // 2]:.3f} ms, p95 {timings[int(len(timings) * 0.95)]:.3f} ms, max {timings[-1]:.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeAudioManager, Recorder, install_fakes
+from jarvis.headless import sandbox_paths
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TRANSCRIPT = os.path.join(BENCH_DIR, "transcripts", "default.json")
+DEFAULT_RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+def summarize(values_ms):
+    ordered = sorted(values_ms)
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+        "p50": round(percentile(ordered, 50), 2),
+        "p95": round(percentile(ordered, 95), 2),
+        "p99": round(percentile(ordered, 99), 2),
+    }
+
+def run_benchmark(transcript: dict, latencies: dict, iterations: int, seed: int, scale: float):
+    recorder = Recorder(latencies, seed=seed, scale=scale)
+    install_fakes(recorder)
+
+    from jarvis.assistant import JarvisAssistant
+
+    audio = FakeAudioManager(recorder)
+    assistant = JarvisAssistant(queue.Queue(), lambda text: None, audio=audio)
+    assistant.initialize()
+
+    e2e = defaultdict(list)
+    stages = defaultdict(lambda: defaultdict(list))
+
+    for _ in range(iterations):
+        for utt in transcript["utterances"]:
+            handler = utt.get("handler", "unlabelled")
+            query = utt["query"]
+            audio.followups = list(utt.get("followups", []))
+            recorder.reset()
+
+            start = time.perf_counter()
+            with recorder.stage("stt"):
+                lower_q = query.lower()
+            assistant._try_handle_query(query, lower_q)
+            total_ms = (time.perf_counter() - start) * 1000
+
+            stage_ms = {name: sec * 1000 for name, sec in recorder.reset().items()}
+            stage_ms["route+local"] = max(0.0, total_ms - sum(stage_ms.values()))
+            e2e[handler].append(total_ms)
+            for name, ms in stage_ms.items():
+                stages[handler][name].append(ms)
+
+            if assistant.audio.is_asleep:
+                assistant.audio.set_sleep(False)
+
+    return {
+        handler: {
+            "e2e": summarize(values),
+            "stages": {name: summarize(v) for name, v in sorted(stages[handler].items())},
+        }
+        for handler, values in e2e.items()
+    }
+
+def print_report(results: dict, baseline: dict | None = None):
+    print(f"{'handler':<18} {'n':>4} {'p50':>9} {'p95':>9} {'p99':>9}  slowest stage (p95)")
+    for handler, data in sorted(results.items()):
+        e = data["e2e"]
+        slow = max(data["stages"].items(), key=lambda kv: kv[1]["p95"])
+        line = f"{handler:<18} {e['count']:>4} {e['p50']:>9.1f} {e['p95']:>9.1f} {e['p99']:>9.1f}  {slow[0]} {slow[1]['p95']:.1f} ms"
+        if baseline and handler in baseline:
+            old = baseline[handler]["e2e"]["p95"]
+            if old:
+                line += f"  (p95 {100.0 * (e['p95'] - old) / old:+.1f}% vs baseline)"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end latency benchmark with local stand-in backends.")
+    parser.add_argument("--transcript", default=DEFAULT_TRANSCRIPT, help="JSON file with scripted utterances.")
+    parser.add_argument("--latency-config", default=None, help="JSON file overriding backend latency distributions.")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every simulated latency (e.g. 0.01 for a quick run).")
+    parser.add_argument("--out", default=None, help="Where to write the JSON results (default: benchmarks/results/).")
+    parser.add_argument("--compare", default=None, help="Previous results JSON to compare against.")
+    args = parser.parse_args()
+
+    with open(args.transcript, "r", encoding="utf-8") as f:
+        transcript = json.load(f)
+    latencies = {}
+    if args.latency_config:
+        with open(args.latency_config, "r", encoding="utf-8") as f:
+            latencies = json.load(f)
+
+    tmp_dir = tempfile.mkdtemp(prefix="arjun_bench_")
+    try:
+        sandbox_paths(tmp_dir)
+        results = run_benchmark(transcript, latencies, args.iterations, args.seed, args.scale)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("handlers")
+    print_report(results, baseline)
+
+    out_path = args.out or os.path.join(DEFAULT_RESULTS_DIR, f"latency-{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "created": time.time(),
+                "transcript": os.path.abspath(args.transcript),
+                "iterations": args.iterations,
+                "seed": args.seed,
+                "scale": args.scale,
+                "latencies": latencies,
+            },
+            "handlers": results,
+        }, f, indent=2)
+    print(f"Results written to {out_path}")
+
+if __name__ == "__main__":
+    main()
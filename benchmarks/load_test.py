@@ -0,0 +1,143 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.latency import summarize
+
+DEFAULT_QUERIES = [
+    "what is the time",
+    "what's the weather in delhi",
+    "give me my gmail summary",
+    "tell me the latest news",
+    "tell me a joke",
+    "explain recursion simply",
+]
+
+class HttpClient:
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method: str, path: str, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value.strip())
+        data = await self.reader.readexactly(length) if length else b"{}"
+        return status, json.loads(data)
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+async def _client(host, port, turns, queries, latencies, statuses):
+    client = HttpClient(host, port)
+    await client.connect()
+    try:
+        status, data = await client.request("POST", "/sessions")
+        if status != 201:
+            statuses[status] = statuses.get(status, 0) + 1
+            return
+        sid = data["session_id"]
+        for i in range(turns):
+            start = time.perf_counter()
+            status, _ = await client.request("POST", f"/sessions/{sid}/turns", {"text": queries[i % len(queries)]})
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                latencies.append((time.perf_counter() - start) * 1000)
+        await client.request("DELETE", f"/sessions/{sid}")
+    finally:
+        await client.close()
+
+async def run_level(host, port, concurrency, turns, queries):
+    latencies = []
+    statuses = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, turns, queries, latencies, statuses) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": summarize(latencies),
+    }
+
+def spawn_server(scale: float, rate: float, max_inflight: int):
+    from benchmarks.fakes import Recorder, install_fakes
+    from jarvis.headless import sandbox_paths
+    from jarvis.server import serve
+
+    install_fakes(Recorder({}, scale=scale))
+    sandbox_paths(tempfile.mkdtemp(prefix="arjun_load_"))
+
+    ready = threading.Event()
+    bound = {}
+
+    def on_ready(port, app):
+        bound["port"] = port
+        ready.set()
+
+    def run():
+        asyncio.run(serve("127.0.0.1", 0, ready=on_ready, rate=rate, burst=max(5, int(rate)),
+                          max_inflight=max_inflight, workers=max_inflight, max_queued=10000))
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait(30)
+    return bound["port"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the assistant server at increasing concurrency.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Target an already running server instead of spawning one.")
+    parser.add_argument("--levels", default="1,2,4,8,16,32")
+    parser.add_argument("--turns", type=int, default=20, help="Turns per client at each level.")
+    parser.add_argument("--scale", type=float, default=0.05, help="Latency scale for the spawned server's stand-in backends.")
+    parser.add_argument("--rate", type=float, default=0.0, help="Per-session rate limit on the spawned server (0 = off).")
+    parser.add_argument("--max-inflight", type=int, default=8)
+    parser.add_argument("--out", default=None, help="Write the results as JSON.")
+    args = parser.parse_args()
+
+    port = args.port or spawn_server(args.scale, args.rate, args.max_inflight)
+    levels = [int(x) for x in args.levels.split(",") if x.strip()]
+
+    results = []
+    print(f"{'clients':>7} {'ok':>6} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}  statuses")
+    for level in levels:
+        r = asyncio.run(run_level(args.host, port, level, args.turns, DEFAULT_QUERIES))
+        results.append(r)
+        lat = r["latency_ms"]
+        print(f"{level:>7} {r['ok']:>6} {r['throughput_rps']:>8.1f} {lat['p50']:>9.1f} {lat['p95']:>9.1f} {lat['p99']:>9.1f}  {r['statuses']}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "levels": results}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+if __name__ == "__main__":
+    main()
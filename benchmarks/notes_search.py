@@ -0,0 +1,100 @@
+import argparse
+import datetime
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jarvis.dates import parse_date_range
+from jarvis.notes import LEGACY_LINE_RE, NotesStore, search_terms
+
+TOPICS = (
+    "milk", "eggs", "dentist", "meeting", "project", "deadline", "mom", "birthday", "gym", "rent",
+    "invoice", "flight", "passport", "car", "insurance", "recipe", "book", "movie", "laptop", "garden",
+)
+FILLER = ("buy", "call", "remember", "check", "pay", "book", "send", "pick up", "finish", "plan", "ask about", "cancel")
+SYLLABLES = ("ka", "ri", "zo", "mel", "tan", "vu", "po", "shi", "lex", "dra", "no", "qui", "ba", "fen", "go", "ta")
+
+def make_notes(n: int, rng: random.Random, now: float):
+    rows = []
+    for i in range(n):
+        words = [rng.choice(FILLER), rng.choice(TOPICS)]
+        words += ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))) for _ in range(rng.randint(2, 8))]
+        rows.append((now - (n - i) * 600, " ".join(words)))
+    return rows
+
+def linear_search(lines, query, start=None, end=None, limit=3):
+    terms = search_terms(query)
+    hits = []
+    for line in reversed(lines):
+        m = LEGACY_LINE_RE.match(line)
+        ts = datetime.datetime.strptime(m.group(1), "%Y-%m-%d %H:%M:%S").timestamp()
+        if start is not None and ts < start:
+            continue
+        if end is not None and ts >= end:
+            continue
+        text = m.group(2).lower()
+        if all(t in text for t in terms):
+            hits.append(line)
+            if len(hits) >= limit:
+                break
+    return hits
+
+def time_ms(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description="Note lookup: notes.txt scan vs SQLite FTS5 NotesStore.")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="arjun_notes_")
+    now_dt = datetime.datetime.now()
+    now = now_dt.timestamp()
+    start, end, _ = parse_date_range("last week", now_dt)
+    week = (start.timestamp(), end.timestamp())
+    try:
+        print(f"{'notes':>7} {'insert ms':>10} {'scan ms':>8} {'fts ms':>7} {'scan+date ms':>13} {'fts+date ms':>12} {'scan miss ms':>13} {'fts miss ms':>12} {'latest ms':>10} {'txt read ms':>12}")
+        for n in (int(s) for s in args.sizes.split(",")):
+            rng = random.Random(args.seed)
+            rows = make_notes(n, rng, now)
+            lines = [f"{datetime.datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')}: {text}" for ts, text in rows]
+            txt_path = os.path.join(tmp_dir, f"notes_{n}.txt")
+            with open(txt_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+            store = NotesStore(os.path.join(tmp_dir, f"notes_{n}.db")).open()
+            t0 = time.perf_counter()
+            store.add_many(rows)
+            insert_ms = (time.perf_counter() - t0) * 1000
+
+            query = f"find my note about {rng.choice(TOPICS)} {rng.choice(FILLER).split()[0]}"
+            scan = time_ms(lambda: linear_search(lines, query), args.repeat)
+            fts = time_ms(lambda: store.search(query, 3), args.repeat)
+            scan_date = time_ms(lambda: linear_search(lines, query, *week), args.repeat)
+            fts_date = time_ms(lambda: store.search(query, 3, *week), args.repeat)
+            scan_miss = time_ms(lambda: linear_search(lines, "note about unicorn"), args.repeat)
+            fts_miss = time_ms(lambda: store.search("note about unicorn", 3), args.repeat)
+            latest = time_ms(lambda: store.latest(5), args.repeat)
+
+            def read_txt():
+                with open(txt_path, "r", encoding="utf-8") as f:
+                    return f.readlines()[-5:]
+            txt_read = time_ms(read_txt, args.repeat)
+
+            print(f"{n:>7} {insert_ms:>10.1f} {scan:>8.2f} {fts:>7.2f} {scan_date:>13.2f} {fts_date:>12.2f} {scan_miss:>13.2f} {fts_miss:>12.3f} {latest:>10.3f} {txt_read:>12.2f}")
+            store.close()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jarvis import persona
+from jarvis.paths import paths
+
+SAMPLE_REPLIES = (
+    "Absolutely! The capital of France is Paris. I hope this helps.",
+    "Certainly, sir. I have set a timer for ten minutes. Let me know if you need anything else.",
+    "Of course. Python lists are ordered and mutable, while tuples are immutable. Feel free to ask if you want more examples!",
+    "That's a great question. Black holes form when massive stars collapse. If you want, I can explain event horizons too.",
+    "Greetings, the weather today is sunny with a high of 31 degrees.",
+    "Dear sir, your meeting starts at 4 pm.",
+    "Hello sir! Main yahin hu, bata kya karna hai?",
+    "Sir, all systems are nominal.",
+    "Haan bhai, tension mat le. Exam ke liye roz 2 ghante revision kar, aur sleep schedule fix rakh. Main tere sath hu.",
+    "Sure, here is a quick plan: first, list your tasks. Second, block focused time. Third, review at night.",
+    "Okay.",
+    "Done",
+    "Arre yaar, bura laga sun ke. Thoda paani pi, deep breath le, aur bata kya hua.",
+    "The mitochondria is the powerhouse of the cell. It produces ATP through cellular respiration, which fuels most of the cell's activities.",
+)
+SAMPLE_QUERIES = (
+    "what is the capital of france",
+    "i am feeling sad today",
+    "how to make egg sandwich",
+    "help me plan my study",
+    "tell me a fun fact",
+    "yes or no, is it raining",
+)
+
+def legacy_apply_persona_style(reply: str, persona_name: str) -> str:
+    reply = reply.strip()
+    if not reply:
+        return reply
+    if persona_name == "jarvis":
+        low = reply.lower().strip()
+        for p in persona.JARVIS_FLUFF_PREFIXES:
+            if low.startswith(p):
+                reply = re.sub(r"^[^,.!?]*[,.!?]\s*", "", reply).strip() or reply
+                low = reply.lower().strip()
+                break
+        for p in persona.JARVIS_FLUFF_PHRASES:
+            reply = re.sub(rf"\b{re.escape(p)}\b[,.!?\s]*", "", reply, flags=re.IGNORECASE)
+            low = reply.lower().strip()
+        reply = re.sub(r"\s+", " ", reply).strip()
+        if not reply:
+            reply = "Done."
+        if reply[-1] not in ".!?":
+            reply += "."
+        if not reply.lower().startswith("sir"):
+            reply = "Sir, " + reply[0].lower() + reply[1:]
+        return reply
+
+    for p in persona.STIFF_PREFIXES:
+        if reply.lower().startswith(p.lower()):
+            reply = reply[len(p):].lstrip(" ,.")
+            break
+    reply = re.sub(r"^(sir|madam|dear)\b[,:\s-]*", "", reply, flags=re.IGNORECASE).strip()
+    return reply
+
+def legacy_enrich_friendly_reply(query_lower: str, reply: str) -> str:
+    words = len(reply.split())
+    is_recipe_query = any(c in query_lower for c in persona.RECIPE_CUES)
+    generic_reply = reply.lower().strip()
+    looks_generic = any(g in generic_reply for g in persona.GENERIC_REPLY_CUES)
+
+    if is_recipe_query and (words < 30 or looks_generic):
+        return persona.RECIPE_REPLY
+    if words > 10:
+        return reply
+    if any(k in query_lower for k in persona.ONE_WORD_ALLOW):
+        return reply
+    if not any(c in query_lower for c in persona.EMOTIONAL_CUES):
+        if words > persona.SHORT_REPLY_MAX_WORDS:
+            return reply
+        tail = persona.DEFAULT_TAIL
+        if any(x in query_lower for x in persona.EXPLAIN_CUES):
+            tail = persona.EXPLAIN_TAIL
+        elif any(x in query_lower for x in persona.PLAN_CUES):
+            tail = persona.PLAN_TAIL
+        if reply and reply[-1] not in ".!?":
+            reply += "."
+        return f"{reply} {tail}"
+    if reply and reply[-1] not in ".!?":
+        reply += "."
+    return f"{reply} {persona.SUPPORT_TAIL}"
+
+def legacy_pipeline(reply: str, persona_name: str, query_lower: str) -> str:
+    reply = legacy_apply_persona_style(reply.strip(), persona_name)
+    if persona_name == "friendly":
+        reply = legacy_enrich_friendly_reply(query_lower, reply)
+    return reply
+
+def new_pipeline(reply: str, persona_name: str, query_lower: str) -> str:
+    return "".join(persona.style_stream((reply,), persona_name, query_lower if persona_name == "friendly" else None))
+
+def tokenize(reply: str):
+    return re.findall(r"\s*\S+|\s+$", reply)
+
+def load_corpus(path: str):
+    corpus = []
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    ep = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                reply = ep.get("assistant_reply") or ""
+                if reply:
+                    corpus.append((reply, (ep.get("query") or "").lower()))
+    if not corpus:
+        corpus = [(r, q) for r in SAMPLE_REPLIES for q in SAMPLE_QUERIES]
+    return corpus
+
+def time_it(fn, corpus, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for reply, query in corpus:
+            for name in ("jarvis", "friendly"):
+                fn(reply, name, query)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the legacy and precompiled persona filters on a reply corpus.")
+    parser.add_argument("--episodes", default=paths.episode_log, help="Episodes JSONL; assistant_reply is used as the corpus.")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.episodes)
+    chars = sum(len(r) for r, _ in corpus)
+    print(f"Corpus: {len(corpus)} replies, {chars} chars")
+
+    mismatches = 0
+    for reply, query in corpus:
+        for name in ("jarvis", "friendly"):
+            expected = legacy_pipeline(reply, name, query)
+            q = query if name == "friendly" else None
+            if new_pipeline(reply, name, query) != expected or "".join(persona.style_stream(tokenize(reply), name, q)) != expected:
+                mismatches += 1
+    print(f"Output mismatches vs legacy: {mismatches}")
+
+    total_chars = chars * 2 * args.repeat
+    legacy = time_it(legacy_pipeline, corpus, args.repeat)
+    full = time_it(new_pipeline, corpus, args.repeat)
+    streamed = time_it(lambda r, n, q: "".join(persona.style_stream(tokenize(r), n, q if n == "friendly" else None)), corpus, args.repeat)
+    for label, secs in (("legacy full-string", legacy), ("precompiled full-string", full), ("precompiled token stream", streamed)):
+        print(f"{label:<26} {secs * 1000:9.1f} ms   {total_chars / secs / 1e6:7.2f} Mchar/s")
+
+if __name__ == "__main__":
+    main()
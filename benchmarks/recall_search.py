@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jarvis.recall import RecallIndex
+
+TOPICS = (
+    "flights to goa", "black holes", "python decorators", "egg curry recipe", "cricket score", "stock market",
+    "train tickets", "monsoon forecast", "guitar chords", "tax filing", "yoga for back pain", "electric cars",
+)
+FILLER = ("tell me about", "what is", "explain", "how do i", "search for", "give me tips on", "kya hai")
+SYLLABLES = ("ka", "ri", "zo", "mel", "tan", "vu", "po", "shi", "lex", "dra", "no", "qui", "ba", "fen", "go", "ta")
+
+def write_log(path: str, n: int, rng: random.Random, start_ts: float):
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(n):
+            topic = rng.choice(TOPICS) if rng.random() < 0.3 else " ".join(
+                "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))) for _ in range(rng.randint(2, 4))
+            )
+            query = f"{rng.choice(FILLER)} {topic}"
+            record = {
+                "ts": start_ts + i * 30, "query": query,
+                "assistant_reply": f"Here is what I know about {topic}. It is a short answer with a few words.",
+                "handler": "chat", "success": True, "notes": "",
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def timed(fn, repeats: int):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall index over episodes.jsonl: build, incremental sync and BM25 query latency.")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="arjun_recall_")
+    try:
+        print(f"{'episodes':>9} {'build s':>8} {'sync 1k ms':>11} {'db MB':>7} {'rare p50/p95 ms':>16} {'common p50/p95 ms':>18} {'ranged p50/p95 ms':>18}")
+        for n in (int(s) for s in args.sizes.split(",")):
+            rng = random.Random(args.seed)
+            log = os.path.join(tmp_dir, f"episodes_{n}.jsonl")
+            db = os.path.join(tmp_dir, f"recall_{n}.db")
+            start_ts = time.time() - (n + 1000) * 30
+            write_log(log, n, rng, start_ts)
+
+            index = RecallIndex(db, log)
+            t0 = time.perf_counter()
+            index.sync()
+            build = time.perf_counter() - t0
+            write_log(log, 1000, rng, start_ts + n * 30)
+            t0 = time.perf_counter()
+            index.sync()
+            sync_ms = (time.perf_counter() - t0) * 1000
+            assert index.count() == n + 1000
+
+            rare = [f"what did i ask about {''.join(rng.choice(SYLLABLES) for _ in range(3))}" for _ in range(args.queries)]
+            common = [f"what did i ask you about {rng.choice(TOPICS)}" for _ in range(args.queries)]
+            day = start_ts + rng.randrange(n) * 30
+            rare_it, common_it, ranged_it = iter(rare * 2), iter(common * 2), iter(common * 2)
+            rare_t = timed(lambda: index.search(next(rare_it)), args.queries)
+            common_t = timed(lambda: index.search(next(common_it)), args.queries)
+            ranged_t = timed(lambda: index.search(next(ranged_it), start=day, end=day + 86400), args.queries)
+            db_mb = os.path.getsize(db) / 1e6
+            print(
+                f"{n:>9} {build:>8.1f} {sync_ms:>11.0f} {db_mb:>7.1f} {rare_t[0]:>7.2f}/{rare_t[1]:<8.2f} "
+                f"{common_t[0]:>8.2f}/{common_t[1]:<9.2f} {ranged_t[0]:>8.2f}/{ranged_t[1]:<9.2f}"
+            )
+            index.close()
+            os.remove(log)
+            os.remove(db)
+        print(f"Peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import os
+import queue
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeAudioManager, Recorder, install_fakes
+from jarvis.headless import sandbox_paths
+
+QUESTIONS = (
+    "explain recursion simply", "what is a black hole", "how does photosynthesis work", "tell me about the roman empire",
+    "what is machine learning", "explain compound interest", "how do vaccines work", "what is quantum computing",
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="Assistant start-up: cold load versus restoring a state snapshot.")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--commands", type=int, default=2000, help="Custom commands written to the sandboxed commands file.")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="arjun_snapshot_")
+    sandbox_paths(tmp_dir)
+    recorder = Recorder({}, seed=args.seed, scale=0.0)
+    install_fakes(recorder)
+    from jarvis.ai_engine import context_cache
+    from jarvis.assistant import JarvisAssistant
+    from jarvis.commands import save_commands
+    from jarvis.reply_cache import reply_cache
+
+    save_commands([
+        {"trigger": f"project {i} dashboard", "type": "website", "target": f"https://example.com/{i}"}
+        for i in range(args.commands)
+    ])
+    reply_cache.enable()
+
+    def boot(warm: bool):
+        reply_cache.clear()
+        context_cache.clear()
+        assistant = JarvisAssistant(queue.Queue(), lambda text: None, audio=FakeAudioManager(recorder), warm_start=warm)
+        start = time.perf_counter()
+        assistant.initialize()
+        return assistant, (time.perf_counter() - start) * 1000
+
+    try:
+        first, _ = boot(True)
+        for question in QUESTIONS:
+            first._try_handle_query(question, question)
+        first.set_persona("jarvis")
+        first._try_handle_query(QUESTIONS[0], QUESTIONS[0])
+        first.snapshots.save()
+        cached = reply_cache.stats()["entries"]
+        stats = first.snapshots.stats()
+        print(f"Snapshot: {stats['bytes'] / 1024:.1f} KB written in {stats['save_ms']} ms ({cached} cached replies)")
+
+        cold, warm = [], []
+        for _ in range(args.iterations):
+            cold.append(boot(False)[1])
+            resumed, ms = boot(True)
+            warm.append(ms)
+        assert resumed.state.chat_history == first.state.chat_history
+        assert resumed.state.current_persona == "jarvis"
+        assert reply_cache.stats()["entries"] == cached
+
+        print(f"Restored sections: {', '.join(resumed.snapshots.stats()['restored'])}")
+        print(f"{'start-up':<10} {'p50 ms':>8} {'min ms':>8}")
+        for name, values in (("cold", cold), ("warm", warm)):
+            print(f"{name:<10} {statistics.median(values):>8.1f} {min(values):>8.1f}")
+        print(f"Snapshot restore alone: {resumed.snapshots.stats()['restore_ms']} ms")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
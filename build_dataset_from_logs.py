@@ -3,6 +3,8 @@ import json
 import os
 import argparse
 
+DEDUP_BATCH = 512
+
 CANDIDATE_USER_KEYS = [
     "query",
     "user",
@@ -60,19 +62,39 @@ def build_dataset(
     max_examples: int | None = None,
     min_user_len: int = 4,
     min_assist_len: int = 4,
+    dedup_threshold: float | None = 0.8,
+    dedup_capacity: int | None = None,
 ) -> None:
     if not os.path.exists(log_path):
         print(f"[ERROR] Log file not found: {log_path}")
         return
 
+    dedup = None
+    if dedup_threshold is not None:
+        try:
+            from jarvis.dedup import DEDUP_CAPACITY, NearDuplicateFilter
+            dedup = NearDuplicateFilter(dedup_threshold, capacity=dedup_capacity or DEDUP_CAPACITY)
+        except ImportError as e:
+            print(f"[WARN] Near-duplicate filtering disabled ({e}).")
+
     total_lines = 0
     used_examples = 0
     skipped_no_json = 0
     skipped_missing_fields = 0
+    pending = []
 
     out_dir = os.path.dirname(out_path) or "."
     os.makedirs(out_dir, exist_ok=True)
 
+    def flush():
+        nonlocal used_examples
+        keep = dedup.filter([text for _, text in pending]) if dedup else [True] * len(pending)
+        for (example, _), kept in zip(pending, keep):
+            if kept and (max_examples is None or used_examples < max_examples):
+                fout.write(example + "\n")
+                used_examples += 1
+        pending.clear()
+
     with open(log_path, "r", encoding="utf-8") as fin, open(
         out_path, "w", encoding="utf-8"
     ) as fout:
@@ -109,8 +131,10 @@ def build_dataset(
                     {"role": "assistant", "content": assist_text},
                 ]
             }
-            fout.write(json.dumps(example, ensure_ascii=False) + "\n")
-            used_examples += 1
+            pending.append((json.dumps(example, ensure_ascii=False), f"{user_text}\n{assist_text}"))
+            if len(pending) >= DEDUP_BATCH:
+                flush()
+        flush()
 
     print("=== Dataset build summary ===")
     print(f"Log file:           {log_path}")
@@ -119,6 +143,15 @@ def build_dataset(
     print(f"Examples written:   {used_examples}")
     print(f"Skipped (no JSON):  {skipped_no_json}")
     print(f"Skipped (missing user/assistant text): {skipped_missing_fields}")
+    if dedup:
+        stats = dedup.stats()
+        print(f"Near-duplicates:    {stats['dropped']} dropped at threshold {dedup_threshold} "
+              f"({stats['bands']} bands x {stats['rows']} rows)")
+        print(f"Clusters with dups: {stats['clusters_with_duplicates']} (largest {stats['largest_cluster']})")
+        if stats["cluster_size_histogram"]:
+            print("Cluster sizes:      " + ", ".join(f"{k}: {v}" for k, v in sorted(stats["cluster_size_histogram"].items())))
+        for size, sample in stats["top_clusters"]:
+            print(f"  {size:6d} x {sample.splitlines()[0][:60]!r}")
 
 def main():
     parser = argparse.ArgumentParser(description="Build fine-tuning dataset from logs.")
@@ -153,6 +186,24 @@ def main():
         help="Minimum assistant text length (chars) to keep an example.",
     )
 
+    parser.add_argument(
+        "--dedup-threshold",
+        type=float,
+        default=0.8,
+        help="Estimated Jaccard similarity above which an example counts as a near-duplicate.",
+    )
+    parser.add_argument(
+        "--dedup-capacity",
+        type=int,
+        default=None,
+        help="LSH table slots per band; bounds dedup memory (default 131072, about 50 MB).",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Write every qualifying episode, including near-duplicates.",
+    )
+
     args = parser.parse_args()
     build_dataset(
         log_path=args.log,
@@ -160,6 +211,8 @@ def main():
         max_examples=args.max_examples,
         min_user_len=args.min_user_len,
         min_assist_len=args.min_assist_len,
+        dedup_threshold=None if args.no_dedup else args.dedup_threshold,
+        dedup_capacity=args.dedup_capacity,
     )
 
 if __name__ == "__main__":
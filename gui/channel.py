@@ -0,0 +1,36 @@
+import queue
+import time
+from collections import deque
+
+LAG_WINDOW = 200
+
+class GuiChannel:
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._lags = deque(maxlen=LAG_WINDOW)
+
+    def put(self, msg: str):
+        self._queue.put((time.perf_counter(), msg))
+
+    def drain(self):
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def mark_rendered(self, enqueued_at: float):
+        self._lags.append((time.perf_counter() - enqueued_at) * 1000.0)
+
+    def lag_stats(self):
+        if not self._lags:
+            return {"count": 0, "avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self._lags)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return {
+            "count": len(ordered),
+            "avg_ms": round(sum(ordered) / len(ordered), 2),
+            "p95_ms": round(p95, 2),
+            "max_ms": round(ordered[-1], 2),
+        }
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+PHOTO_CACHE_SIZE = 6
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+class GifFrameCache:
+    def __init__(self, gif_path: str, size, cache_root: str):
+        self.gif_path = gif_path
+        self.size = tuple(size)
+        key = f"{_file_digest(gif_path)[:16]}_{self.size[0]}x{self.size[1]}"
+        self.cache_dir = os.path.join(cache_root, key)
+        self._gif = None
+        self._photos = OrderedDict()
+
+        index_path = os.path.join(self.cache_dir, "index.json")
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                self.n_frames = json.load(f)["n_frames"]
+        except Exception:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.n_frames = getattr(self._source(), "n_frames", 1)
+            with open(index_path, "w", encoding="utf-8") as f:
+                json.dump({"n_frames": self.n_frames, "source": gif_path}, f)
+
+    def __len__(self):
+        return self.n_frames
+
+    def _source(self):
+        if self._gif is None:
+            self._gif = Image.open(self.gif_path)
+        return self._gif
+
+    def _frame_path(self, idx: int) -> str:
+        return os.path.join(self.cache_dir, f"{idx:04d}.png")
+
+    def frame(self, idx: int):
+        path = self._frame_path(idx)
+        if os.path.exists(path):
+            with Image.open(path) as img:
+                img.load()
+                return img.copy()
+
+        gif = self._source()
+        if self.n_frames > 1:
+            gif.seek(idx)
+        frame = gif.copy().convert("RGBA").resize(self.size, Image.LANCZOS)
+        tmp = path + ".tmp"
+        frame.save(tmp, format="PNG")
+        os.replace(tmp, path)
+
+        if idx == self.n_frames - 1:
+            self.close()
+        return frame
+
+    def photo(self, idx: int):
+        photo = self._photos.get(idx)
+        if photo is not None:
+            self._photos.move_to_end(idx)
+            return photo
+        photo = ImageTk.PhotoImage(self.frame(idx))
+        self._photos[idx] = photo
+        while len(self._photos) > PHOTO_CACHE_SIZE:
+            self._photos.popitem(last=False)
+        return photo
+
+    def close(self):
+        if self._gif is not None:
+            self._gif.close()
+            self._gif = None
@@ -1,16 +1,19 @@
 
 import tkinter as tk
-from PIL import Image, ImageTk
 import threading
-import queue
 
+from gui.channel import GuiChannel
+from gui.frames import GifFrameCache
 from jarvis.assistant import JarvisAssistant
 from jarvis.paths import paths
+from jarvis.profiler import profiler
+from jarvis.tracing import tracer
 
 def run_app():
 
     WINDOW_WIDTH = 280
     WINDOW_BASE_HEIGHT = 350
+    GUI_POLL_MS = 30
 
     root = tk.Tk()
     root.title("Arjun")
@@ -18,6 +21,7 @@ def run_app():
 
     current_wake_name = "Arjun"
     base_status_height = None
+    current_height = WINDOW_BASE_HEIGHT
 
     BG_COLOR = "#2B2B2B"
     TEXT_COLOR = "#E0E0E0"
@@ -30,33 +34,22 @@ def run_app():
     root.attributes("-topmost", True)
     root.attributes("-alpha", 0.95)
 
-    gui_queue = queue.Queue()
+    gui_queue = GuiChannel()
 
     def update_gui_status(text):
         gui_queue.put(text)
 
-    try:
-        gif = Image.open(paths.assistant_gif)
-        frames = []
-        w, h = 250, 180
-        if hasattr(gif, "n_frames"):
-            for i in range(gif.n_frames):
-                gif.seek(i)
-                frame = gif.copy().resize((w, h), Image.LANCZOS)
-                frames.append(ImageTk.PhotoImage(frame))
-        else:
-            frames.append(ImageTk.PhotoImage(gif.resize((w, h), Image.LANCZOS)))
+    FRAME_DELAYS = {"idle": 140, "listening": 90, "thinking": 60, "speaking": 80}
+    frames = None
+    anim_state = "idle"
+    anim_idx = 0
+    anim_job = None
 
+    try:
+        with profiler.phase("gui: avatar frame cache"):
+            frames = GifFrameCache(paths.assistant_gif, (250, 180), paths.frame_cache_dir)
         image_label = tk.Label(root, bg=BG_COLOR)
         image_label.pack(pady=(10, 5))
-
-        def animate(idx=0):
-            frame = frames[idx]
-            image_label.config(image=frame)
-            if len(frames) > 1:
-                root.after(100, animate, (idx + 1) % len(frames))
-
-        animate()
     except Exception as e:
         print(f"GIF error: {e}")
         image_label = tk.Label(
@@ -64,6 +57,37 @@ def run_app():
         )
         image_label.pack(pady=(10, 5))
 
+    def animate():
+        nonlocal anim_idx, anim_job
+        anim_job = None
+        if frames is None:
+            return
+        try:
+            image_label.config(image=frames.photo(anim_idx))
+        except Exception as e:
+            print(f"GIF frame error: {e}")
+            return
+        if len(frames) > 1 and anim_state != "sleeping":
+            anim_idx = (anim_idx + 1) % len(frames)
+            anim_job = root.after(FRAME_DELAYS[anim_state], animate)
+
+    def set_anim_state(new_state: str):
+        nonlocal anim_state
+        anim_state = new_state
+        if new_state != "sleeping" and anim_job is None:
+            animate()
+
+    def anim_state_for(msg: str) -> str:
+        if msg.startswith("Listening"):
+            return "listening"
+        if msg.startswith(("Arjun:", "Jarvis:")):
+            return "speaking"
+        if msg.endswith("..."):
+            return "thinking"
+        return "idle"
+
+    root.after(0, animate)
+
     status_label = tk.Label(
         root,
         text="Arjun is inactive.",
@@ -76,10 +100,9 @@ def run_app():
     status_label.pack(pady=(5, 10), padx=10)
 
     def set_status(msg: str):
-        nonlocal base_status_height
+        nonlocal base_status_height, current_height
 
         status_label.config(text=msg)
-        root.update_idletasks()
 
         needed = status_label.winfo_reqheight()
 
@@ -91,7 +114,9 @@ def run_app():
         extra = min(extra, 220)
 
         new_height = WINDOW_BASE_HEIGHT + extra
-        root.geometry(f"{WINDOW_WIDTH}x{new_height}")
+        if new_height != current_height:
+            current_height = new_height
+            root.geometry(f"{WINDOW_WIDTH}x{new_height}")
 
     set_status("Arjun is inactive.")
 
@@ -115,7 +140,8 @@ def run_app():
     for col in (0, 1, 2):
         button_frame.columnconfigure(col, weight=1)
 
-    assistant = JarvisAssistant(gui_queue, update_gui_status)
+    assistant = JarvisAssistant(gui_queue, update_gui_status, warm_start=True)
+    assistant.start_background_init()
 
     def start_thread():
         start_button.config(state="disabled")
@@ -190,23 +216,59 @@ def run_app():
 
     image_label.bind("<B1-Motion>", move_window)
 
+    overlay_label = tk.Label(
+        root,
+        text="",
+        fg=ACCENT_COLOR,
+        bg="#1E1E1E",
+        font=("Consolas", 8),
+        justify="left",
+        anchor="nw",
+        wraplength=250,
+    )
+    overlay_visible = False
+
+    def refresh_overlay():
+        if not overlay_visible:
+            return
+        lag = gui_queue.lag_stats()
+        lines = tracer.report_lines(top=6) or ["No timing data yet."]
+        lines.append(f"gui lag: avg {lag['avg_ms']:.0f} ms, p95 {lag['p95_ms']:.0f} ms")
+        overlay_label.config(text="\n".join(lines))
+        root.after(1000, refresh_overlay)
+
+    def toggle_overlay(event=None):
+        nonlocal overlay_visible
+        overlay_visible = not overlay_visible
+        if overlay_visible:
+            overlay_label.place(x=10, y=10)
+            overlay_label.lift()
+            refresh_overlay()
+        else:
+            overlay_label.place_forget()
+
+    image_label.bind("<Button-3>", toggle_overlay)
+
     def process_gui_queue():
         nonlocal current_wake_name
 
-        try:
-            msg = gui_queue.get_nowait()
+        batch = gui_queue.drain()
+        pending_status = None
+        pending_anim = None
 
+        for _, msg in batch:
             if msg == "QUIT":
                 root.destroy()
+                return
 
             elif msg == "STATE:SLEEPING":
-                text = f"Sleeping... (Say 'Hey {current_wake_name}' to wake)"
-                set_status(text)
+                pending_status = f"Sleeping... (Say 'Hey {current_wake_name}' to wake)"
+                pending_anim = "sleeping"
                 sleep_button.config(text="Wake Up", bg="#006400")
 
             elif msg == "STATE:AWAKE":
-                text = "Arjun is online and ready."
-                set_status(text)
+                pending_status = "Arjun is online and ready."
+                pending_anim = "idle"
                 sleep_button.config(text="Sleep", bg="#555555")
 
             elif msg.startswith("MODE:"):
@@ -219,17 +281,38 @@ def run_app():
                 new_name = msg.split(":", 1)[1].strip() or "Arjun"
                 current_wake_name = new_name
 
-                if "Sleeping..." in status_label.cget("text"):
-                    text = f"Sleeping... (Say 'Hey {current_wake_name}' to wake)"
-                    set_status(text)
+                shown = pending_status if pending_status is not None else status_label.cget("text")
+                if "Sleeping..." in shown:
+                    pending_status = f"Sleeping... (Say 'Hey {current_wake_name}' to wake)"
 
             else:
-                set_status(msg)
+                pending_status = msg
+                if pending_anim != "sleeping" and anim_state != "sleeping":
+                    pending_anim = anim_state_for(msg)
 
-        except queue.Empty:
-            pass
+        if pending_status is not None:
+            set_status(pending_status)
+        if pending_anim is not None and pending_anim != anim_state:
+            set_anim_state(pending_anim)
+
+        for enqueued_at, _ in batch:
+            gui_queue.mark_rendered(enqueued_at)
+
+        root.after(GUI_POLL_MS, process_gui_queue)
+
+    def report_startup():
+        if assistant.ready.is_set():
+            print(profiler.report())
+        else:
+            root.after(200, report_startup)
 
-        root.after(100, process_gui_queue)
+    def on_interactive():
+        profiler.mark("gui: window interactive")
+        if profiler.enabled:
+            report_startup()
 
-    root.after(100, process_gui_queue)
+    root.after(GUI_POLL_MS, process_gui_queue)
+    root.after(0, on_interactive)
     root.mainloop()
+    assistant.snapshots.save()
+    print(f"GUI update lag: {gui_queue.lag_stats()}")
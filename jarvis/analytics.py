@@ -0,0 +1,277 @@
+import argparse
+import datetime
+import json
+import os
+import re
+import sys
+import time
+
+from .paths import paths
+
+CHUNK_LINES = 100_000
+FALLBACK_HANDLER = "chat"
+PERCENTILES = (50, 90, 95, 99)
+TOP_FAILURE_NOTES = 3
+
+_TS_PREFIX = '{"ts": '
+_HANDLER_KEY = ', "handler": "'
+_TAIL_RE = re.compile(
+    r'((?:[^"\\]|\\.)*)", "success": (true|false), "notes": "((?:[^"\\]|\\.)*)"'
+    r'(?:, "turn_id": "[^"]*", "latency_ms": ([0-9.eE+-]+))?'
+)
+_LLM_SPAN = '"name": "llm.'
+_CANCELLED = '"cancelled": true'
+
+def _unescape(value: str) -> str:
+    return json.loads(f'"{value}"')
+
+class EpisodeColumns:
+    def __init__(self, np):
+        self.np = np
+        self.handlers = []
+        self.notes = []
+        self._handler_codes = {}
+        self._note_codes = {"": 0}
+        self.notes.append("")
+        self._chunks = []
+        self.skipped = 0
+        self.ts = self.handler = self.success = self.latency = self.cancelled = self.llm = self.note = None
+
+    def _code(self, table: dict, values: list, value: str) -> int:
+        code = table.get(value)
+        if code is None:
+            code = len(values)
+            table[value] = code
+            values.append(value)
+        return code
+
+    def _parse_slow(self, line: str):
+        try:
+            ep = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(ep, dict) or "handler" not in ep:
+            return None
+        llm = any(str(s.get("name", "")).startswith("llm.") for s in ep.get("spans") or () if isinstance(s, dict))
+        latency = ep.get("latency_ms")
+        return (
+            float(ep.get("ts") or 0.0), str(ep.get("handler") or "unknown"), bool(ep.get("success")),
+            str(ep.get("notes") or ""), float("nan") if latency is None else float(latency),
+            bool(ep.get("cancelled")), llm,
+        )
+
+    def add_lines(self, lines):
+        np = self.np
+        ts, handler, success, latency, cancelled, llm, note = [], [], [], [], [], [], []
+        handler_codes, note_codes = self._handler_codes, self._note_codes
+        match = _TAIL_RE.match
+        skip = len(_HANDLER_KEY)
+        nan = float("nan")
+        for line in lines:
+            m = None
+            pos = line.find(_HANDLER_KEY) if line.startswith(_TS_PREFIX) else -1
+            if pos != -1:
+                m = match(line, pos + skip)
+            if m:
+                h, ok, notes, lat = m.groups()
+                try:
+                    t = float(line[len(_TS_PREFIX):line.index(",")])
+                except ValueError:
+                    m = None
+            if m:
+                ok = ok == "true"
+                row_latency = float(lat) if lat else nan
+                row_cancelled = _CANCELLED in line
+                row_llm = _LLM_SPAN in line
+                if "\\" in h:
+                    h = _unescape(h)
+                if not ok and "\\" in notes:
+                    notes = _unescape(notes)
+            else:
+                row = self._parse_slow(line)
+                if row is None:
+                    self.skipped += 1
+                    continue
+                t, h, ok, notes, row_latency, row_cancelled, row_llm = row
+            code = handler_codes.get(h)
+            handler.append(code if code is not None else self._code(handler_codes, self.handlers, h))
+            if ok:
+                note.append(0)
+            else:
+                code = note_codes.get(notes)
+                note.append(code if code is not None else self._code(note_codes, self.notes, notes))
+            ts.append(t)
+            success.append(ok)
+            latency.append(row_latency)
+            cancelled.append(row_cancelled)
+            llm.append(row_llm)
+        self._chunks.append((
+            np.array(ts, dtype=np.float64), np.array(handler, dtype=np.int32), np.array(success, dtype=np.bool_),
+            np.array(latency, dtype=np.float32), np.array(cancelled, dtype=np.bool_), np.array(llm, dtype=np.bool_),
+            np.array(note, dtype=np.int32),
+        ))
+
+    def finish(self):
+        np = self.np
+        if not self._chunks:
+            self.add_lines([])
+        cols = [np.concatenate(parts) for parts in zip(*self._chunks)]
+        self.ts, self.handler, self.success, self.latency, self.cancelled, self.llm, self.note = cols
+        self._chunks = []
+        return self
+
+    def __len__(self):
+        return 0 if self.ts is None else len(self.ts)
+
+def load_columns(path: str, chunk_lines: int = CHUNK_LINES, start: float | None = None, end: float | None = None):
+    import numpy as np
+    cols = EpisodeColumns(np)
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        while True:
+            lines = f.readlines(chunk_lines * 256)
+            if not lines:
+                break
+            cols.add_lines([line for line in lines if line.strip()])
+    cols.finish()
+    if start is not None or end is not None:
+        keep = np.ones(len(cols), dtype=np.bool_)
+        if start is not None:
+            keep &= cols.ts >= start
+        if end is not None:
+            keep &= cols.ts < end
+        for name in ("ts", "handler", "success", "latency", "cancelled", "llm", "note"):
+            setattr(cols, name, getattr(cols, name)[keep])
+    return cols
+
+def _percentiles(np, values) -> dict:
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {}
+    return {f"p{p}": round(float(v), 1) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+def summarize(cols: EpisodeColumns) -> dict:
+    np = cols.np
+    total = len(cols)
+    report = {"episodes": total, "skipped_lines": cols.skipped}
+    if not total:
+        return report
+
+    report["first"] = datetime.datetime.fromtimestamp(float(cols.ts.min())).isoformat(timespec="seconds")
+    report["last"] = datetime.datetime.fromtimestamp(float(cols.ts.max())).isoformat(timespec="seconds")
+    failed = ~cols.success
+    fallback_code = cols._handler_codes.get(FALLBACK_HANDLER, -1)
+    report["failure_rate"] = round(float(failed.mean()), 4)
+    report["cancelled_rate"] = round(float(cols.cancelled.mean()), 4)
+    report["llm_fallback_share"] = round(float((cols.handler == fallback_code).mean()), 4)
+    report["llm_turn_share"] = round(float(cols.llm.mean()), 4)
+    report["latency_ms"] = _percentiles(np, cols.latency)
+
+    offset = time.localtime().tm_gmtoff
+    hours = ((cols.ts + offset) // 3600 % 24).astype(np.int64)
+    report["hourly"] = {f"{h:02d}": int(c) for h, c in enumerate(np.bincount(hours, minlength=24))}
+
+    volume = np.bincount(cols.handler, minlength=len(cols.handlers))
+    failures = np.bincount(cols.handler, weights=failed, minlength=len(cols.handlers))
+    llm = np.bincount(cols.handler, weights=cols.llm, minlength=len(cols.handlers))
+    order = np.argsort(cols.handler, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(volume)))
+    handlers = {}
+    for code in np.argsort(-volume):
+        count = int(volume[code])
+        if not count:
+            continue
+        rows = order[bounds[code]:bounds[code + 1]]
+        entry = {
+            "count": count,
+            "share": round(count / total, 4),
+            "failure_rate": round(float(failures[code]) / count, 4),
+            "llm_share": round(float(llm[code]) / count, 4),
+            "latency_ms": _percentiles(np, cols.latency[rows]),
+        }
+        failed_notes = cols.note[rows][failed[rows]]
+        failed_notes = failed_notes[failed_notes > 0]
+        if len(failed_notes):
+            note_counts = np.bincount(failed_notes)
+            top = np.argsort(-note_counts)[:TOP_FAILURE_NOTES]
+            entry["top_failures"] = {cols.notes[n]: int(note_counts[n]) for n in top if note_counts[n]}
+        handlers[cols.handlers[code]] = entry
+    report["handlers"] = handlers
+    return report
+
+def _ms(value) -> str:
+    return "-" if value is None else f"{value:.0f}"
+
+def print_report(report: dict):
+    total = report["episodes"]
+    print(f"Episodes:           {total} ({report['skipped_lines']} unparseable lines skipped)")
+    if not total:
+        return
+    print(f"Period:             {report['first']} to {report['last']}")
+    print(f"Failure rate:       {report['failure_rate']:.1%}   cancelled: {report['cancelled_rate']:.1%}")
+    print(f"LLM fallback share: {report['llm_fallback_share']:.1%} routed to chat, {report['llm_turn_share']:.1%} of turns called an LLM")
+    lat = report["latency_ms"]
+    if lat:
+        print("Turn latency:       " + "  ".join(f"{k} {v:.0f} ms" for k, v in lat.items()))
+
+    print()
+    print(f"{'handler':<20} {'count':>8} {'share':>7} {'fail':>7} {'llm':>7} {'p50 ms':>8} {'p95 ms':>8}  top failures")
+    for name, h in report["handlers"].items():
+        lat = h["latency_ms"]
+        failures = ", ".join(f"{note[:30]} ({count})" for note, count in (h.get("top_failures") or {}).items())
+        print(
+            f"{name[:20]:<20} {h['count']:>8} {h['share']:>7.1%} {h['failure_rate']:>7.1%} {h['llm_share']:>7.1%} "
+            f"{_ms(lat.get('p50')):>8} {_ms(lat.get('p95')):>8}  {failures}"
+        )
+
+    print()
+    print("Hourly usage:")
+    peak = max(report["hourly"].values()) or 1
+    for hour, count in report["hourly"].items():
+        print(f"  {hour}:00 {count:>8} {'#' * round(40 * count / peak)}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Summarize the episode log: volume, failures, LLM fallbacks, hourly usage, latency.")
+    parser.add_argument("--log", default=paths.episode_log, help="Episodes JSONL file.")
+    parser.add_argument("--period", default=None, help="Only include episodes in a period, e.g. 'last week' or 'since monday'.")
+    parser.add_argument("--json", dest="json_out", default=None, help="Write the report as JSON instead of printing it.")
+    parser.add_argument("--chunk-lines", type=int, default=CHUNK_LINES)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not os.path.exists(args.log):
+        print(f"No episode log at {args.log}")
+        return
+    try:
+        import numpy
+    except ImportError:
+        print("Episode analytics needs numpy (pip install numpy).")
+        return
+
+    start = end = None
+    if args.period:
+        from .dates import parse_date_range
+        found = parse_date_range(args.period)
+        if not found:
+            print(f"I don't understand the period '{args.period}'.")
+            return
+        start, end = found[0].timestamp(), found[1].timestamp()
+
+    t0 = time.perf_counter()
+    cols = load_columns(args.log, args.chunk_lines, start, end)
+    t1 = time.perf_counter()
+    report = summarize(cols)
+    t2 = time.perf_counter()
+    report["timing_s"] = {"load": round(t1 - t0, 3), "summarize": round(t2 - t1, 3)}
+
+    if args.json_out:
+        os.makedirs(os.path.dirname(args.json_out) or ".", exist_ok=True)
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Report for {report['episodes']} episodes written to {args.json_out}")
+    else:
+        print_report(report)
+    print(f"Loaded in {t1 - t0:.2f} s, summarized in {t2 - t1:.2f} s.", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
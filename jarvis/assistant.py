@@ -1,16 +1,31 @@
 
+import contextlib
+import contextvars
+import os
+import re
 import threading
 import datetime
-import pythoncom
-from .audio import AudioManager
+import time
 from .whatsapp import handle_whatsapp_command
 from jarvis.logger import log_episode
 from .memory import MemoryState, load_memory, remember_fact
-from .ai_engine import chat as ai_chat, ai_generate, self_evaluate_and_improve
-from .commands import load_commands, save_commands, learn_new_command, run_custom_commands
+from .ai_engine import PERSONA_MODELS, chat as ai_chat, ai_generate
+from .improve import SelfImprover
+from .intents import IntentClassifier
+from .reply_cache import reply_cache
+from .sysmon import monitor
+from .residency import residency
+from .snapshot import SnapshotManager
+from . import compound
+from .commands import CommandStore, learn_new_command, match_custom_command, execute_custom_command
+from .whatsapp import parse_send_message_command
+from .recall import get_recall_index
+from .paths import paths
+from .profiler import profiler
+from .tracing import tracer, span, current_turn, Turn
 from .features import (
     check_command,
-    take_note, read_notes, find_file,
+    take_note, read_notes, find_note, recall_conversations, find_file,
     set_alarm, set_timer, simple_weather,
     speak_latest_news, speak_system_status,
     volume_up, volume_down,
@@ -28,6 +43,12 @@ from .gmail_tools import (
 SLEEP_TRIGGERS = ("go to sleep", "stop arjun", "stop listening")
 NOTE_ADD_TRIGGERS = ("take a note", "write this down", "make a note")
 NOTE_READ_TRIGGERS = ("read my notes", "show my notes", "what are my notes")
+NOTE_FIND_TRIGGERS = ("find my note", "find note", "search my notes", "search notes", "note about", "notes about", "notes mentioning")
+RECALL_TRIGGERS = (
+    "what did i ask", "did i ask you", "what did we talk about", "what did you tell me about", "when did i ask",
+    "our conversation about", "past conversations", "maine kya pucha",
+)
+NOTE_READ_RE = re.compile(r"\b(read|show|list)\b.*\bnotes\b")
 FILE_SEARCH_TRIGGERS = ("find file", "search for file", "search file")
 GMAIL_SUMMARY_TRIGGERS = ("gmail summary", "summary of my gmail", "gmail ka summary", "inbox summary")
 GMAIL_SEARCH_TRIGGERS = ("search gmail for", "gmail search for", "gmail me search", "gmail me dekh")
@@ -42,18 +63,166 @@ JOKE_TRIGGERS = ("tell me a joke", "say a joke", "make me laugh")
 SHUTDOWN_TRIGGERS = ("shutdown", "turn off", "power off")
 RESTART_TRIGGERS = ("restart", "reboot")
 SELF_IMPROVE_TRIGGERS = ("optimize yourself", "improve yourself", "update yourself", "upgrade yourself")
+LATENCY_REPORT_TRIGGERS = ("latency report", "performance report", "how fast are you", "speed report")
+STOP_TRIGGERS = ("stop", "cancel", "be quiet", "shut up", "enough", "chup")
+BARGE_IN_HANDLERS = (
+    "chat", "news", "weather_builtin", "joke", "latency_report", "clipboard", "system_status",
+    "gmail_summary", "gmail_search", "gmail_important", "gmail_attachments", "compound",
+)
+ECHO_OVERLAP = 0.6
+CANCEL_JOIN_TIMEOUT = 2.0
+
+_audio_override = contextvars.ContextVar("arjun_audio", default=None)
+_session = contextvars.ContextVar("arjun_session", default=None)
+
+class SessionContext:
+    def __init__(self, gui_queue, audio, update_gui_status=None):
+        self.gui_queue = gui_queue
+        self.audio = audio
+        self.update_gui_status = update_gui_status or (lambda text: None)
+        self.state = MemoryState()
+        self.display_name = "Arjun"
+
+def _session_attr(name: str):
+    private = "_" + name
+
+    def get(self):
+        session = _session.get()
+        return getattr(self, private) if session is None else getattr(session, name)
+
+    def set(self, value):
+        session = _session.get()
+        if session is None:
+            setattr(self, private, value)
+        else:
+            setattr(session, name, value)
+
+    return property(get, set)
 
 class JarvisAssistant:
-    def __init__(self, gui_queue, update_gui_status):
+    state = _session_attr("state")
+    gui_queue = _session_attr("gui_queue")
+    update_gui_status = _session_attr("update_gui_status")
+    display_name = _session_attr("display_name")
+
+    def __init__(self, gui_queue, update_gui_status, audio=None, warm_start=False):
         self.gui_queue = gui_queue
         self.update_gui_status = update_gui_status
-        self.audio = AudioManager(update_gui_status)
-        self.audio.set_voice_profile("friendly")
+        self._audio = audio
         self.state = MemoryState()
-        load_memory(self.state)
-        self.commands = load_commands()
+        self.commands = CommandStore()
         self.force_sleep_toggle = False
         self.display_name = "Arjun"
+        self.ready = threading.Event()
+        self._init_lock = threading.Lock()
+        self._init_started = False
+        self._routes = self._build_routes()
+        self._handlers = {name: handler for name, _, handler in self._routes}
+        self.intents = IntentClassifier()
+        self.improver = SelfImprover()
+        self.snapshots = SnapshotManager(self) if warm_start else None
+
+    @property
+    def audio(self):
+        override = _audio_override.get()
+        if override is not None:
+            return override
+        session = _session.get()
+        return self._audio if session is None else session.audio
+
+    @audio.setter
+    def audio(self, value):
+        self._audio = value
+
+    def new_session(self, gui_queue, audio) -> SessionContext:
+        session = SessionContext(gui_queue, audio, getattr(audio, "update_gui_status", None))
+        load_memory(session.state)
+        return session
+
+    @contextlib.contextmanager
+    def session(self, session: SessionContext):
+        token = _session.set(session)
+        try:
+            yield session
+        finally:
+            _session.reset(token)
+
+    def initialize(self):
+        with self._init_lock:
+            if self._init_started:
+                return
+            self._init_started = True
+        try:
+            if self.audio is None:
+                with profiler.phase("init: audio (vosk + mic calibration)"):
+                    self.update_gui_status("Loading speech engine...")
+                    from .audio import AudioManager
+                    self.audio = AudioManager(self.update_gui_status)
+            self.audio.set_voice_profile("friendly")
+
+            restored = set()
+            if self.snapshots is not None:
+                with profiler.phase("init: snapshot restore"):
+                    restored = self.snapshots.restore()
+
+            with profiler.phase("init: memory"):
+                if "memory" in restored:
+                    self._resume_persona()
+                else:
+                    self.update_gui_status("Loading memory...")
+                    load_memory(self.state)
+
+            with profiler.phase("init: custom commands"):
+                if "commands" not in restored:
+                    self.update_gui_status("Loading custom commands...")
+                    self.commands.load()
+
+            with profiler.phase("init: intent classifier"):
+                if "intents" not in restored:
+                    self.intents.build()
+
+            with profiler.phase("init: recall index"):
+                threading.Thread(target=self._sync_recall, daemon=True, name="arjun-recall").start()
+
+            with profiler.phase("init: system monitor"):
+                monitor.start()
+
+            with profiler.phase("init: model residency"):
+                if getattr(self.audio, "offline_mode", False):
+                    residency.register("vosk", load=self.audio.load_vosk, unload=self.audio.unload_vosk)
+                residency.start()
+
+            if self.snapshots is not None:
+                self.snapshots.start()
+
+            self.update_gui_status(f"{self.display_name} is ready. Press Start.")
+        except Exception as e:
+            print(f"Initialization error: {e}")
+            self.update_gui_status(f"Startup error: {e}")
+        finally:
+            profiler.mark("assistant ready")
+            self.ready.set()
+
+    def _resume_persona(self):
+        if self.state.current_persona != "jarvis":
+            return
+        self.audio.set_voice_profile("jarvis")
+        self.display_name = "Jarvis"
+        self.gui_queue.put("MODE:JARVIS")
+        self.gui_queue.put("WAKEWORD:Jarvis")
+
+    def _sync_recall(self):
+        try:
+            added = get_recall_index().sync()
+            if added:
+                print(f"Recall index: added {added} episodes.")
+        except Exception as e:
+            print(f"Recall index error: {e}")
+
+    def start_background_init(self):
+        t = threading.Thread(target=self.initialize, daemon=True)
+        t.start()
+        return t
 
     def _contains_any(self, text, phrases):
         return any(p in text for p in phrases)
@@ -61,173 +230,326 @@ class JarvisAssistant:
     def _say_by_persona(self, friendly_text: str, jarvis_text: str | None = None):
         self.audio.say(jarvis_text if self.state.current_persona == "jarvis" and jarvis_text else friendly_text)
 
+    def _build_routes(self):
+        has = self._contains_any
+        return (
+            ("sleep", lambda q, l: has(l, SLEEP_TRIGGERS), self._handle_sleep),
+            ("custom_command", lambda q, l: match_custom_command(q, self.commands)[0] is not None, self._handle_custom_command),
+            ("learn_command", lambda q, l: "learn a new command" in l or "new command" in l, self._handle_learn_command),
+            ("clipboard", lambda q, l: "read my clipboard" in l or "what's on my clipboard" in l, self._handle_clipboard),
+            ("remember", lambda q, l: "arjun remember" in l or "remember this" in l, self._handle_remember),
+            ("notes_add", lambda q, l: has(l, NOTE_ADD_TRIGGERS), lambda q, l: take_note(self.audio)),
+            ("notes_find", lambda q, l: has(l, NOTE_FIND_TRIGGERS), lambda q, l: find_note(self.audio, l)),
+            ("notes_read", lambda q, l: has(l, NOTE_READ_TRIGGERS) or NOTE_READ_RE.search(l) is not None, lambda q, l: read_notes(self.audio, l)),
+            ("recall", lambda q, l: has(l, RECALL_TRIGGERS), lambda q, l: recall_conversations(self.audio, l)),
+            ("file_search", lambda q, l: has(l, FILE_SEARCH_TRIGGERS), lambda q, l: find_file(self.audio, self.update_gui_status)),
+            ("gmail_summary", lambda q, l: has(l, GMAIL_SUMMARY_TRIGGERS), self._handle_gmail_summary),
+            ("gmail_search", lambda q, l: has(l, GMAIL_SEARCH_TRIGGERS), self._handle_gmail_search),
+            ("gmail_important", lambda q, l: has(l, GMAIL_IMPORTANT_TRIGGERS), self._handle_gmail_important),
+            ("gmail_attachments", lambda q, l: has(l, GMAIL_ATTACH_TRIGGERS), self._handle_gmail_attachments),
+            ("whatsapp", lambda q, l: parse_send_message_command(q)[0] is not None, self._handle_whatsapp),
+            ("music", lambda q, l: check_command(l, ["play", "open", "start"], ["music", "song", "track"]), self._handle_music),
+            ("whoami", lambda q, l: ("what is" in l and "my name" in l) or "who am i" in l, self._handle_whoami),
+            ("time", lambda q, l: check_command(l, ["what is", "tell me"], ["the time"]), self._handle_time),
+            ("weather_builtin", lambda q, l: "weather in" in l, lambda q, l: simple_weather(l, self.audio, self.state, self.update_gui_status)),
+            ("alarm", lambda q, l: "wake me up at" in l or "set an alarm for" in l, lambda q, l: set_alarm(q, self.audio)),
+            ("timer", lambda q, l: "set a timer for" in l, lambda q, l: set_timer(q, self.audio)),
+            ("news", lambda q, l: "latest news" in l or "news headlines" in l, lambda q, l: speak_latest_news(self.audio, self.state, self.update_gui_status)),
+            ("system_status", lambda q, l: has(l, SYSTEM_STATUS_TRIGGERS), lambda q, l: speak_system_status(self.audio)),
+            ("latency_report", lambda q, l: has(l, LATENCY_REPORT_TRIGGERS), self._handle_latency_report),
+            ("volume_up", lambda q, l: has(l, VOL_UP_TRIGGERS), lambda q, l: volume_up(self.audio)),
+            ("volume_down", lambda q, l: has(l, VOL_DOWN_TRIGGERS), lambda q, l: volume_down(self.audio)),
+            ("media_playpause", lambda q, l: "pause" in l or "play" in l, lambda q, l: media_playpause(self.audio)),
+            ("media_next", lambda q, l: "next song" in l or "next track" in l, lambda q, l: media_next(self.audio)),
+            ("media_prev", lambda q, l: "previous song" in l or "previous track" in l, lambda q, l: media_prev(self.audio)),
+            ("brightness_up", lambda q, l: has(l, BRIGHT_UP_TRIGGERS), lambda q, l: brightness_up(self.audio)),
+            ("brightness_down", lambda q, l: has(l, BRIGHT_DOWN_TRIGGERS), lambda q, l: brightness_down(self.audio)),
+            ("joke", lambda q, l: has(l, JOKE_TRIGGERS), lambda q, l: tell_joke(self.audio)),
+            ("shutdown", lambda q, l: has(l, SHUTDOWN_TRIGGERS), lambda q, l: shutdown_pc(self.audio)),
+            ("restart", lambda q, l: has(l, RESTART_TRIGGERS), lambda q, l: restart_pc(self.audio)),
+            ("quit", lambda q, l: "arjun quit" in l or "exit" in l, self._handle_quit),
+            ("persona_jarvis", self._wants_jarvis, lambda q, l: self.set_persona("jarvis")),
+            ("persona_friendly", self._wants_friendly, lambda q, l: self.set_persona("friendly")),
+            ("reset_chat", lambda q, l: "reset chat" in l, self._handle_reset_chat),
+            ("self_improve", lambda q, l: has(l, SELF_IMPROVE_TRIGGERS), self._handle_self_improve),
+        )
+
+    def route(self, query: str, lower_q: str):
+        for name, matches, handler in self._routes:
+            if matches(query, lower_q):
+                return name, handler
+        with span("intent") as attrs:
+            label, score = self.intents.classify(lower_q, self.commands)
+            attrs["label"], attrs["score"] = label, round(score, 3)
+        if label is not None:
+            return self._intent_route(label)
+        return "chat", self._handle_chat
+
+    def _intent_route(self, label: str):
+        if label.startswith("custom:"):
+            _, action, trigger = label.split(":", 2)
+            cmd = self.commands.find(trigger)
+            if cmd is None:
+                return "chat", self._handle_chat
+            return "custom_command", lambda q, l: execute_custom_command(cmd, action, q, self.audio, self.update_gui_status, self.state)
+        return label, self._handlers.get(label, self._handle_chat)
+
     def _try_handle_query(self, query: str, lower_q: str):
-        if self._contains_any(lower_q, SLEEP_TRIGGERS):
-            self._say_by_persona("Going to sleep.", "Entering sleep mode.")
-            self.audio.set_sleep(True)
-            self.gui_queue.put("STATE:SLEEPING")
-            return "handled"
+        with span("query"):
+            with span("route"):
+                name, handler = self.route(query, lower_q)
+            turn = current_turn()
+            if turn is not None:
+                turn.handler = name
+            with span(f"handler.{name}"):
+                result = handler(query, lower_q)
+        return "quit" if result == "quit" else "handled"
+
+    def handle_query(self, query: str):
+        turn = current_turn()
+        if turn is None:
+            with tracer.turn(query):
+                return self.handle_query(query)
+
+        turn.query = query
+        self.apply_improvements()
+        with span("compound.plan"):
+            parts = compound.plan(query, self.route)
+        if parts:
+            route = self._handle_compound(turn, parts)
+        else:
+            route = self._try_handle_query(query, query.lower())
+        if not turn.logged:
+            cancelled = turn.cancelled.is_set()
+            log_episode(query, " ".join(turn.replies), turn.handler or "unknown", not cancelled, "cancelled" if cancelled else "")
+        return route
+
+    def _run_part(self, child, text: str, name: str, handler, deferred=None):
+        with tracer.activate(child):
+            token = _audio_override.set(deferred) if deferred is not None else None
+            child.handler = name
+            notes = ""
+            result = None
+            try:
+                with span(f"handler.{name}", part=True):
+                    result = handler(text, text.lower())
+            except Exception as e:
+                print(f"Compound part error ({name}): {e}")
+                notes = str(e)
+            finally:
+                if token is not None:
+                    _audio_override.reset(token)
+            if not child.logged:
+                cancelled = child.cancelled.is_set()
+                log_episode(text, " ".join(child.replies), name, not cancelled and not notes, "cancelled" if cancelled else notes)
+        return result
+
+    def _handle_compound(self, turn, parts):
+        turn.handler = "compound"
+        audio = self.audio
+        pending = []
+        route = "handled"
+        with span("compound", parts=len(parts)):
+            for text, name, handler in parts:
+                child = Turn(text, turn.session_id)
+                turn.on_cancel(child.cancel)
+                if name in compound.PARALLEL_HANDLERS:
+                    deferred = compound.DeferredAudio(audio)
+                    pending.append((child, text, name, handler, deferred, compound.submit(self._run_part, child, text, name, handler, deferred)))
+                else:
+                    pending.append((child, text, name, handler, None, None))
+            for child, text, name, handler, deferred, future in pending:
+                if turn.cancelled.is_set():
+                    break
+                if future is None:
+                    result = self._run_part(child, text, name, handler)
+                    turn.replies.extend(child.replies)
+                else:
+                    result = future.result()
+                    noted = len(turn.replies)
+                    deferred.flush()
+                    if len(turn.replies) == noted:
+                        turn.replies.extend(child.replies)
+                if result == "quit":
+                    route = "quit"
+        turn.logged = True
+        return route
+
+    def interrupt(self, turn, worker=None):
+        start = time.perf_counter()
+        turn.cancel()
+        if worker is not None:
+            worker.join(CANCEL_JOIN_TIMEOUT)
+        tracer.record("cancel.latency", (time.perf_counter() - start) * 1000.0)
+
+    def _is_stop(self, heard: str) -> bool:
+        heard = heard.strip()
+        if any(t in heard for t in SLEEP_TRIGGERS):
+            return False
+        return any(heard == t or heard.startswith(t + " ") for t in STOP_TRIGGERS)
+
+    def _is_echo(self, heard: str, turn) -> bool:
+        words = heard.split()
+        spoken = set(" ".join(turn.replies).lower().split())
+        if not words or not spoken:
+            return False
+        return sum(w in spoken for w in words) / len(words) >= ECHO_OVERLAP
+
+    def _run_turn(self, turn, query: str):
+        result = {}
+
+        def work():
+            with tracer.turn(turn=turn):
+                result["route"] = self.handle_query(query)
+
+        worker = threading.Thread(target=work, daemon=True, name="arjun-turn")
+        worker.start()
+        while worker.is_alive():
+            if self.force_sleep_toggle:
+                self.interrupt(turn, worker)
+                return None, None
+            if turn.handler not in BARGE_IN_HANDLERS:
+                worker.join(0.1)
+                continue
+            heard = self.audio.listen(barge_in=True)
+            if "none" in heard or not worker.is_alive() or self._is_echo(heard, turn):
+                continue
+            self.interrupt(turn, worker)
+            if self._is_stop(heard):
+                return None, None
+            return None, heard
+        return result.get("route"), None
+
+    def _wants_jarvis(self, query, lower_q):
+        return "jarvis" in lower_q and (any(w in lower_q for w in ["mode", "style", "switch", "change", "become", "mod"]) or lower_q.strip() == "jarvis")
+
+    def _wants_friendly(self, query, lower_q):
+        return "friendly" in lower_q or "friend mode" in lower_q or ("normal" in lower_q and "mode" in lower_q) or "back to normal" in lower_q
+
+    def _handle_sleep(self, query, lower_q):
+        self._say_by_persona("Going to sleep.", "Entering sleep mode.")
+        self.audio.set_sleep(True)
+        self.gui_queue.put("STATE:SLEEPING")
+
+    def _handle_custom_command(self, query, lower_q):
+        cmd, action = match_custom_command(query, self.commands)
+        execute_custom_command(cmd, action, query, self.audio, self.update_gui_status, self.state)
+
+    def _handle_learn_command(self, query, lower_q):
+        learn_new_command(trigger=None, audio_mgr=self.audio, update_gui_status=self.update_gui_status, commands=self.commands)
+
+    def _handle_clipboard(self, query, lower_q):
+        import pyperclip
+        try:
+            text = pyperclip.paste()
+            if text:
+                self.audio.say("Your clipboard contains the following text:")
+                self.audio.say(text)
+            else:
+                self.audio.say("Your clipboard is empty.")
+        except Exception as e:
+            print(e)
+            self.audio.say("I had trouble reading your clipboard.")
 
-        if run_custom_commands(query, self.commands, self.audio, self.update_gui_status, self.state):
-            return "handled"
+    def _handle_remember(self, query, lower_q):
+        ok, msg = remember_fact(query, self.state)
+        self.audio.say(msg)
 
-        if "learn a new command" in lower_q or "new command" in lower_q:
-            learn_new_command(trigger=None, audio_mgr=self.audio, update_gui_status=self.update_gui_status, commands=self.commands)
-            save_commands(self.commands)
-            return "handled"
+    def _handle_gmail_summary(self, query, lower_q):
+        self.update_gui_status("Fetching Gmail summary...")
+        self.audio.say(gmail_summary_text())
 
-        if "read my clipboard" in lower_q or "what's on my clipboard" in lower_q:
-            import pyperclip
-            try:
-                text = pyperclip.paste()
-                if text:
-                    self.audio.say("Your clipboard contains the following text:")
-                    self.audio.say(text)
-                else:
-                    self.audio.say("Your clipboard is empty.")
-            except Exception as e:
-                print(e)
-                self.audio.say("I had trouble reading your clipboard.")
-            return "handled"
-
-        if "arjun remember" in lower_q or "remember this" in lower_q:
-            ok, msg = remember_fact(query)
-            self.audio.say(msg)
-            if ok:
-                load_memory(self.state)
-            return "handled"
-
-        if self._contains_any(lower_q, NOTE_ADD_TRIGGERS):
-            take_note(self.audio)
-            return "handled"
-        if self._contains_any(lower_q, NOTE_READ_TRIGGERS):
-            read_notes(self.audio)
-            return "handled"
-
-        if self._contains_any(lower_q, FILE_SEARCH_TRIGGERS):
-            find_file(self.audio, self.update_gui_status)
-            return "handled"
-
-        if self._contains_any(lower_q, GMAIL_SUMMARY_TRIGGERS):
-            self.update_gui_status("Fetching Gmail summary...")
-            self.audio.say(gmail_summary_text())
-            return "handled"
-        if self._contains_any(lower_q, GMAIL_SEARCH_TRIGGERS):
-            self.update_gui_status("Searching your Gmail...")
-            self.audio.say(gmail_search_text(query))
-            return "handled"
-        if self._contains_any(lower_q, GMAIL_IMPORTANT_TRIGGERS):
-            self.update_gui_status("Checking important emails...")
-            self.audio.say(gmail_important_text())
-            return "handled"
-        if self._contains_any(lower_q, GMAIL_ATTACH_TRIGGERS):
-            self.update_gui_status("Checking recent email attachments...")
-            self.audio.say(gmail_attachments_text(days=7))
-            return "handled"
-
-        if handle_whatsapp_command(query, self.audio, self.update_gui_status):
-            return "handled"
-
-        if check_command(lower_q, ["play", "open", "start"], ["music", "song", "track"]):
-            self._say_by_persona("Starting your music.", "Starting music playback.")
-            music_path = r"C:\Users\PURJEET\Downloads\song.mp3"
+    def _handle_gmail_search(self, query, lower_q):
+        self.update_gui_status("Searching your Gmail...")
+        self.audio.say(gmail_search_text(query))
+
+    def _handle_gmail_important(self, query, lower_q):
+        self.update_gui_status("Checking important emails...")
+        self.audio.say(gmail_important_text())
+
+    def _handle_gmail_attachments(self, query, lower_q):
+        self.update_gui_status("Checking recent email attachments...")
+        self.audio.say(gmail_attachments_text(days=7))
+
+    def _handle_whatsapp(self, query, lower_q):
+        handle_whatsapp_command(query, self.audio, self.update_gui_status)
+
+    def _handle_music(self, query, lower_q):
+        self._say_by_persona("Starting your music.", "Starting music playback.")
+        music_path = r"C:\Users\PURJEET\Downloads\song.mp3"
+        try:
+            import os
+            os.system(f"start {music_path}")
+        except Exception as e:
+            print(e)
+            self.audio.say("I couldn't play that music file.")
+
+    def _handle_whoami(self, query, lower_q):
+        if self.state.user_name:
+            self._say_by_persona(f"Your name is {self.state.user_name}.", f"Your name: {self.state.user_name}.")
+        else:
+            self.audio.say("I don't know your name yet. You can tell me by saying 'Arjun remember my name is...'")
+
+    def _handle_time(self, query, lower_q):
+        now = datetime.datetime.now().strftime('%H:%M:%S')
+        self._say_by_persona(f"The time is {now}", f"Time: {now}.")
+
+    def _handle_latency_report(self, query, lower_q):
+        stats = tracer.stats()
+        stats.pop("query", None)
+        stats.pop("handler.latency_report", None)
+        if not stats:
+            self.audio.say("I don't have any timing data yet.")
+            return
+        slowest = sorted(stats.items(), key=lambda kv: kv[1]["p95"], reverse=True)[:4]
+        parts = [
+            f"{name.replace('handler.', '').replace('.', ' ').replace('_', ' ')} takes about {s['p50']:.0f} milliseconds, up to {s['p95']:.0f}"
+            for name, s in slowest
+        ]
+        cache = reply_cache.stats()
+        if cache["hits"]:
+            parts.append(
+                f"my reply cache answered {cache['hits']} of {cache['lookups']} questions, saving about {cache['saved_ms'] / 1000:.1f} seconds"
+            )
+        self._say_by_persona("Here are my slowest stages recently. " + ". ".join(parts) + ".", ". ".join(parts) + ".")
+
+    def _handle_quit(self, query, lower_q):
+        self._say_by_persona("Goodbye. Shutting down.", "Shutting down.")
+        if monitor.samples:
             try:
-                import os
-                os.system(f"start {music_path}")
-            except Exception as e:
-                print(e)
-                self.audio.say("I couldn't play that music file.")
-            return "handled"
+                monitor.export(paths.sysmon_export)
+            except OSError as e:
+                print(f"System monitor export error: {e}")
+        if self.snapshots is not None:
+            self.snapshots.save()
+        self.gui_queue.put("QUIT")
+        return "quit"
+
+    def _handle_reset_chat(self, query, lower_q):
+        self.audio.say("Chat history has been reset.")
+        load_memory(self.state)
 
-        if ("what is" in lower_q and "my name" in lower_q) or "who am i" in lower_q:
-            if self.state.user_name:
-                self._say_by_persona(f"Your name is {self.state.user_name}.", f"Your name: {self.state.user_name}.")
-            else:
-                self.audio.say("I don't know your name yet. You can tell me by saying 'Arjun remember my name is...'")
-            return "handled"
-
-        if check_command(lower_q, ["what is", "tell me"], ["the time"]):
-            now = datetime.datetime.now().strftime('%H:%M:%S')
-            self._say_by_persona(f"The time is {now}", f"Time: {now}.")
-            return "handled"
-
-        if simple_weather(lower_q, self.audio, self.state, self.update_gui_status):
-            return "handled"
-
-        if "wake me up at" in lower_q or "set an alarm for" in lower_q:
-            set_alarm(query, self.audio)
-            return "handled"
-        if "set a timer for" in lower_q:
-            set_timer(query, self.audio)
-            return "handled"
-
-        if "latest news" in lower_q or "news headlines" in lower_q:
-            speak_latest_news(self.audio, self.state, self.update_gui_status)
-            return "handled"
-
-        if self._contains_any(lower_q, SYSTEM_STATUS_TRIGGERS):
-            speak_system_status(self.audio)
-            return "handled"
-        if self._contains_any(lower_q, VOL_UP_TRIGGERS):
-            volume_up(self.audio)
-            return "handled"
-        if self._contains_any(lower_q, VOL_DOWN_TRIGGERS):
-            volume_down(self.audio)
-            return "handled"
-
-        if "pause" in lower_q or "play" in lower_q:
-            media_playpause(self.audio)
-            return "handled"
-        if "next song" in lower_q or "next track" in lower_q:
-            media_next(self.audio)
-            return "handled"
-        if "previous song" in lower_q or "previous track" in lower_q:
-            media_prev(self.audio)
-            return "handled"
-
-        if self._contains_any(lower_q, BRIGHT_UP_TRIGGERS):
-            brightness_up(self.audio)
-            return "handled"
-        if self._contains_any(lower_q, BRIGHT_DOWN_TRIGGERS):
-            brightness_down(self.audio)
-            return "handled"
-
-        if self._contains_any(lower_q, JOKE_TRIGGERS):
-            tell_joke(self.audio)
-            return "handled"
-
-        if self._contains_any(lower_q, SHUTDOWN_TRIGGERS):
-            shutdown_pc(self.audio)
-            return "handled"
-        if self._contains_any(lower_q, RESTART_TRIGGERS):
-            restart_pc(self.audio)
-            return "handled"
-
-        if "arjun quit" in lower_q or "exit" in lower_q:
-            self._say_by_persona("Goodbye. Shutting down.", "Shutting down.")
-            self.gui_queue.put("QUIT")
-            return "quit"
-
-        if "jarvis" in lower_q and (any(w in lower_q for w in ["mode", "style", "switch", "change", "become", "mod"]) or lower_q.strip() == "jarvis"):
-            self.set_persona("jarvis")
-            return "handled"
-
-        if "friendly" in lower_q or "friend mode" in lower_q or ("normal" in lower_q and "mode" in lower_q) or "back to normal" in lower_q:
-            self.set_persona("friendly")
-            return "handled"
-
-        if "reset chat" in lower_q:
-            self.audio.say("Chat history has been reset.")
-            load_memory(self.state)
-            return "handled"
-
-        if self._contains_any(lower_q, SELF_IMPROVE_TRIGGERS):
-            self.audio.say("Okay, I will review recent interactions and try to improve.")
-            self_evaluate_and_improve(self.state, self.audio.say)
-            return "handled"
+    def _handle_self_improve(self, query, lower_q):
+        if not os.path.exists(paths.episode_log):
+            self.audio.say("I have no interaction history to learn from yet.")
+        elif not self.improver.has_new_episodes():
+            self.audio.say("I have already reviewed all of my recent interactions.")
+        elif self.improver.start():
+            self.audio.say("Okay, I will review my new interactions in the background and improve.")
+        else:
+            self.audio.say("I am already reviewing my interactions in the background.")
 
+    def apply_improvements(self, announce: bool = False):
+        applied = self.improver.apply_pending(self.state)
+        if not applied:
+            return
+        episodes = sum(u["episodes"] for u in applied)
+        self.update_gui_status(f"Self-improvement applied ({episodes} new interactions reviewed).")
+        if announce:
+            self.audio.say("I have reviewed my recent interactions and updated some of my internal settings to improve future responses.")
+
+    def _handle_chat(self, query, lower_q):
         ai_chat(query, self.state, self.audio.say, self.update_gui_status)
-        return "handled"
 
     def set_persona(self, mode: str):
         mode = (mode or "").lower().strip()
@@ -239,6 +561,7 @@ class JarvisAssistant:
             self.display_name = "Arjun"
             self.audio.say("Okay, switching to friendly companion mode.")
             self.gui_queue.put("MODE:FRIENDLY")
+            self._expect_models("persona switch")
             self.gui_queue.put("WAKEWORD:Arjun")
 
         elif mode in ("jarvis", "assistant", "formal"):
@@ -248,11 +571,17 @@ class JarvisAssistant:
             self.display_name = "Jarvis"
             self.audio.say("Jarvis mode activated.")
             self.gui_queue.put("MODE:JARVIS")
+            self._expect_models("persona switch")
             self.gui_queue.put("WAKEWORD:Jarvis")
 
         else:
             self.audio.say("I don't recognise that personality mode.")
 
+    def _expect_models(self, reason: str):
+        residency.expect(PERSONA_MODELS.get(self.state.current_persona, "arjun-custom"), reason)
+        if reason == "wake" and "vosk" in residency.entries:
+            residency.expect("vosk", reason)
+
     def toggle_sleep(self):
         self.force_sleep_toggle = True
 
@@ -266,33 +595,49 @@ class JarvisAssistant:
             self.gui_queue.put("STATE:SLEEPING")
         else:
             self.gui_queue.put("STATE:AWAKE")
+            self._expect_models("wake")
             self._say_by_persona("I am online and ready.", "Online.")
 
     def run(self):
+        self.initialize()
+        self.ready.wait()
+        if self.audio is None:
+            return
+
         self.update_gui_status("Arjun A.I is ready.")
         self.audio.say("Welcome to Arjun A.I. I have loaded your custom commands.")
 
         try:
+            pending = None
             while True:
                 self._handle_sleep_toggle()
+                self.apply_improvements(announce=not self.audio.is_asleep and pending is None)
 
                 if self.audio.is_asleep:
                     query = self.audio.listen()
                     if "hey arjun" in query or "wake up" in query:
+                        self._expect_models("wake")
                         self.audio.set_sleep(False)
                         self.gui_queue.put("STATE:AWAKE")
                         self._say_by_persona("I am online and ready.", "Online.")
                     continue
 
-                query = self.audio.listen()
-                if "none" in query:
-                    continue
-
-                lower_q = query.lower()
-                route = self._try_handle_query(query, lower_q)
+                turn = Turn()
+                query, pending = pending, None
+                if query is None:
+                    with tracer.activate(turn):
+                        query = self.audio.listen()
+                    if "none" in query:
+                        continue
+                self._expect_models("heard query")
+                route, pending = self._run_turn(turn, query)
                 if route == "quit":
                     break
 
         finally:
             self.audio.cleanup()
-            pythoncom.CoUninitialize()
+            try:
+                import pythoncom
+                pythoncom.CoUninitialize()
+            except ImportError:
+                pass
@@ -3,10 +3,14 @@ import speech_recognition as sr
 import pyttsx3
 import os
 import json
-import vosk
+import threading
+import time
 from jarvis.paths import paths
+from jarvis.residency import residency
+from jarvis.tracing import span, note_reply, current_turn
 
-vosk.SetLogLevel(-1)
+BARGE_IN_TIMEOUT = 1
+BARGE_IN_PHRASE_LIMIT = 6
 
 class AudioManager:
     def __init__(self, update_gui_status):
@@ -17,20 +21,37 @@ class AudioManager:
 
         self.model_path = os.path.join(paths.PROJECT_DIR, "model")
         self.offline_mode = False
+        self.vosk = None
         self.vosk_model = None
+        self._engine = None
+        self._mic_lock = threading.Lock()
 
-        if os.path.exists(self.model_path):
-            try:
-                self.update_gui_status("Loading offline backup...")
-                self.vosk_model = vosk.Model(self.model_path)
-                self.offline_mode = True
-                print("Vosk model loaded (Backup).")
-            except Exception as e:
-                print(f"Error loading Vosk: {e}")
-        else:
+        self._load_vosk()
+        self._init_mic()
+
+    def _load_vosk(self):
+        if not os.path.exists(self.model_path):
             print("No offline model found.")
+            return
+        try:
+            self.update_gui_status("Loading offline backup...")
+            import vosk
+            vosk.SetLogLevel(-1)
+            self.vosk = vosk
+            self.vosk_model = vosk.Model(self.model_path)
+            self.offline_mode = True
+            print("Vosk model loaded (Backup).")
+        except Exception as e:
+            print(f"Error loading Vosk: {e}")
 
-        self._init_mic()
+    def load_vosk(self):
+        if self.vosk is not None and self.vosk_model is None:
+            self.vosk_model = self.vosk.Model(self.model_path)
+
+    def unload_vosk(self):
+        self.vosk_model = None
+        import gc
+        gc.collect()
 
     def _init_mic(self):
         self.update_gui_status("Calibrating microphone...")
@@ -42,59 +63,99 @@ class AudioManager:
             print(f"Mic error: {e}")
 
     def say(self, text: str):
+        turn = current_turn()
+        if turn is not None and turn.cancelled.is_set():
+            return
 
         display_name = "Jarvis" if self.voice_profile == "jarvis" else "Arjun"
         self.update_gui_status(f"{display_name}: {text}")
+        note_reply(text)
+        with span("tts", chars=len(text)):
+            cancel = None
+            try:
+                engine = pyttsx3.init()
+                self._engine = engine
+                if turn is not None:
+                    cancel = turn.on_cancel(self.stop_speaking)
+                voices = engine.getProperty("voices") or []
+
+                idx = 1 if len(voices) > 1 and self.voice_profile == "jarvis" else 0
+                if voices:
+                    engine.setProperty("voice", voices[idx].id)
+                engine.setProperty("rate", 165 if self.voice_profile == "jarvis" else 185)
+
+                engine.say(text)
+                engine.runAndWait()
+                engine.stop()
+            except Exception as e:
+                print(f"TTS error: {e}")
+            finally:
+                self._engine = None
+                if cancel is not None:
+                    turn.remove_cancel_callback(cancel)
+
+    def stop_speaking(self):
+        engine = self._engine
+        if engine is None:
+            return
         try:
-            engine = pyttsx3.init()
-            voices = engine.getProperty("voices") or []
-
-            idx = 1 if len(voices) > 1 and self.voice_profile == "jarvis" else 0
-            if voices:
-                engine.setProperty("voice", voices[idx].id)
-            engine.setProperty("rate", 165 if self.voice_profile == "jarvis" else 185)
-
-            engine.say(text)
-            engine.runAndWait()
             engine.stop()
         except Exception as e:
-            print(f"TTS error: {e}")
+            print(f"TTS stop error: {e}")
+
+    def listen(self, barge_in: bool = False) -> str:
+        with span("listen.barge_in" if barge_in else "listen"):
+            return self._listen(barge_in)
 
-    def listen(self) -> str:
-        with sr.Microphone() as source:
-            if not self.is_asleep:
+    def _listen(self, barge_in: bool = False) -> str:
+        quiet = self.is_asleep or barge_in
+        with self._mic_lock, span("capture"), sr.Microphone() as source:
+            if not quiet:
                 self.update_gui_status("Listening...")
 
             try:
                 self.recognizer.pause_threshold = 1.0
-                audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10)
+                if barge_in:
+                    audio = self.recognizer.listen(source, timeout=BARGE_IN_TIMEOUT, phrase_time_limit=BARGE_IN_PHRASE_LIMIT)
+                else:
+                    audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10)
             except sr.WaitTimeoutError:
                 return "none"
 
         query = ""
-        if not self.is_asleep:
+        if not quiet:
             self.update_gui_status("Recognizing...")
 
         try:
-            query = self.recognizer.recognize_google(audio, language="en-in")
+            with span("stt.google"):
+                query = self.recognizer.recognize_google(audio, language="en-in")
         except:
 
-            if self.offline_mode and self.vosk_model:
+            if self.offline_mode:
+                residency.begin("vosk")
+                load_ms = None
                 try:
-                    raw_data = audio.get_raw_data(convert_rate=16000, convert_width=2)
-                    rec = vosk.KaldiRecognizer(self.vosk_model, 16000)
-                    rec.AcceptWaveform(raw_data)
-                    result_json = rec.FinalResult()
-                    data = json.loads(result_json)
-                    query = data.get("text", "")
+                    with span("stt.vosk"):
+                        if self.vosk_model is None:
+                            start = time.perf_counter()
+                            self.load_vosk()
+                            load_ms = (time.perf_counter() - start) * 1000.0
+                        raw_data = audio.get_raw_data(convert_rate=16000, convert_width=2)
+                        rec = self.vosk.KaldiRecognizer(self.vosk_model, 16000)
+                        rec.AcceptWaveform(raw_data)
+                        result_json = rec.FinalResult()
+                        data = json.loads(result_json)
+                        query = data.get("text", "")
                 except:
                     pass
+                finally:
+                    residency.end("vosk", load_ms=load_ms)
 
         if not query:
             return "none"
 
         query = query.lower()
-        if not self.is_asleep:
+        if not quiet:
             self.update_gui_status(f"User said: {query}")
         return query
 
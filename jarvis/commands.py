@@ -1,34 +1,192 @@
-
 import json
 import os
-import requests
-import pyperclip
+import threading
+import time
 from .paths import paths
 from .ai_engine import ai_generate, log_episode
 
 OPEN_ACTIONS = ["open", "launch", "start", "visit", "go to"]
 CLOSE_ACTIONS = ["close", "quit", "terminate", "shut down"]
+RELOAD_CHECK_SECONDS = 1.0
+INDEX_PREFIX_CHARS = 6
 
-def load_commands():
-    if not os.path.exists(paths.commands_file):
-        with open(paths.commands_file, "w", encoding="utf-8") as f:
-            json.dump({"commands": []}, f, indent=4)
-        return []
-    try:
-        with open(paths.commands_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data.get("commands", [])
-    except Exception as e:
-        print(f"Error loading commands: {e}")
-        return []
+def _write_commands(path, commands):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"commands": commands}, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
 
 def save_commands(commands):
     try:
-        with open(paths.commands_file, "w", encoding="utf-8") as f:
-            json.dump({"commands": commands}, f, indent=4)
+        _write_commands(paths.commands_file, commands)
     except Exception as e:
         print(f"Error saving commands: {e}")
 
+class CommandStore:
+    def __init__(self, path=None):
+        self.path = path or paths.commands_file
+        self.commands = []
+        self._by_prefix = {}
+        self._prefix_lens = {}
+        self._seq = 0
+        self.version = 0
+        self._stamp = None
+        self._checked = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __iter__(self):
+        return iter(list(self.commands))
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _index(self, cmd):
+        trigger = cmd.get("trigger") or ""
+        if not trigger:
+            return
+        prefix = trigger[:INDEX_PREFIX_CHARS]
+        self._by_prefix.setdefault(prefix, []).append((self._seq, cmd))
+        self._prefix_lens[len(prefix)] = self._prefix_lens.get(len(prefix), 0) + 1
+        self._seq += 1
+
+    def _unindex(self, cmd):
+        prefix = (cmd.get("trigger") or "")[:INDEX_PREFIX_CHARS]
+        bucket = self._by_prefix.get(prefix)
+        if not bucket:
+            return
+        kept = [(seq, c) for seq, c in bucket if c is not cmd]
+        if len(kept) == len(bucket):
+            return
+        if kept:
+            self._by_prefix[prefix] = kept
+        else:
+            del self._by_prefix[prefix]
+        self._prefix_lens[len(prefix)] -= 1
+        if not self._prefix_lens[len(prefix)]:
+            del self._prefix_lens[len(prefix)]
+
+    def load(self):
+        with self._lock:
+            if not os.path.exists(self.path):
+                try:
+                    _write_commands(self.path, [])
+                except Exception as e:
+                    print(f"Error saving commands: {e}")
+            commands = []
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    commands = json.load(f).get("commands", [])
+            except Exception as e:
+                print(f"Error loading commands: {e}")
+                if self.commands:
+                    return self
+            self._replace(commands, self._file_stamp())
+        return self
+
+    def _replace(self, commands, stamp):
+        self.commands = commands
+        self._by_prefix = {}
+        self._prefix_lens = {}
+        self._seq = 0
+        for cmd in commands:
+            self._index(cmd)
+        self.version += 1
+        self._stamp = stamp
+        self._checked = time.monotonic()
+
+    def snapshot(self):
+        with self._lock:
+            return {"commands": list(self.commands), "stamp": self._stamp}
+
+    def restore(self, data) -> bool:
+        with self._lock:
+            if not data or data["stamp"] is None or data["stamp"] != self._file_stamp():
+                return False
+            self._replace(data["commands"], data["stamp"])
+        return True
+
+    def reload_if_changed(self, force: bool = False) -> bool:
+        now = time.monotonic()
+        if not force and now - self._checked < RELOAD_CHECK_SECONDS:
+            return False
+        self._checked = now
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        print("Custom commands changed on disk, reloading.")
+        self.load()
+        return True
+
+    def save(self):
+        with self._lock:
+            try:
+                _write_commands(self.path, self.commands)
+                self._stamp = self._file_stamp()
+            except Exception as e:
+                print(f"Error saving commands: {e}")
+
+    def add(self, cmd):
+        with self._lock:
+            self.reload_if_changed(force=True)
+            self.commands.append(cmd)
+            self._index(cmd)
+            self.version += 1
+            self.save()
+
+    def remove(self, trigger: str) -> bool:
+        with self._lock:
+            self.reload_if_changed(force=True)
+            removed = [c for c in self.commands if c.get("trigger") == trigger]
+            if not removed:
+                return False
+            self.commands = [c for c in self.commands if c.get("trigger") != trigger]
+            for cmd in removed:
+                self._unindex(cmd)
+            self.version += 1
+            self.save()
+            return True
+
+    def candidates(self, query: str):
+        by_prefix = self._by_prefix
+        found = {}
+        for length in list(self._prefix_lens):
+            for i in range(len(query) - length + 1):
+                bucket = by_prefix.get(query[i:i + length])
+                if not bucket:
+                    continue
+                for seq, cmd in bucket:
+                    if seq not in found and query.startswith(cmd["trigger"], i):
+                        found[seq] = cmd
+        return [found[seq] for seq in sorted(found)]
+
+    def find(self, trigger: str):
+        for cmd in self.commands:
+            if (cmd.get("trigger") or "").strip().lower() == trigger:
+                return cmd
+        return None
+
+    def match(self, query: str):
+        self.reload_if_changed()
+        wants_open = any(a in query for a in OPEN_ACTIONS)
+        wants_close = any(a in query for a in CLOSE_ACTIONS)
+        if not wants_open and not wants_close:
+            return None, None
+        for cmd in self.candidates(query):
+            if wants_open:
+                return cmd, "open"
+            if cmd["type"] == "app":
+                return cmd, "close"
+        return None, None
+
 def learn_new_command(trigger, audio_mgr, update_gui_status, commands):
     say = audio_mgr.say
 
@@ -68,6 +226,7 @@ def learn_new_command(trigger, audio_mgr, update_gui_status, commands):
             status = audio_mgr.listen()
             if any(w in status for w in ["done", "ready"]):
                 try:
+                    import pyperclip
                     target = pyperclip.paste()
                     if not target.strip():
                         say("Your clipboard is empty. Cancelling.")
@@ -95,60 +254,69 @@ def learn_new_command(trigger, audio_mgr, update_gui_status, commands):
         say("I didn't recognize that action type. Cancelling.")
         return
 
-    commands.append(new_command)
-    save_commands(commands)
+    commands.add(new_command)
     say(f"Command saved. When you say '{trigger}', I will perform the action.")
 
-def run_custom_commands(query, commands, audio_mgr, update_gui_status, state):
-    say = audio_mgr.say
+def match_custom_command(query, commands):
+    if isinstance(commands, CommandStore):
+        return commands.match(query)
     for cmd in commands:
         if cmd["trigger"] in query:
-
             if any(a in query for a in OPEN_ACTIONS):
-                say(f"Opening {cmd['trigger']}...")
-                if cmd["type"] == "website":
-                    import webbrowser
-                    webbrowser.open(cmd["target"])
-                elif cmd["type"] == "app":
-                    import os
-                    try:
-                        os.startfile(cmd["target"])
-                    except Exception as e:
-                        say(f"I couldn't open the file. Check the path.")
-                        print(e)
-                elif cmd["type"] == "weather":
-                    city = cmd["target"]
-                    say(f"Getting the weather for {city}...")
-                    try:
-                        url = f"https://wttr.in/{city}?format=%C+%t+%w"
-                        response = requests.get(url)
-                        if response.status_code == 200:
-                            weather_data = response.text
-                            ai_prompt = (
-                                "You are a weather reporter. State the following weather data "
-                                f"in one simple sentence, starting directly with the conditions: {weather_data}"
-                            )
-                            ai_generate(ai_prompt, state, say, update_gui_status, speak_result=True)
-                        else:
-                            say(f"Sorry, I couldn't retrieve the weather for {city}.")
-                    except Exception as e:
-                        say("Weather service is unreachable.")
-
-                log_episode(query, f"Opened {cmd['trigger']}", "custom_command_open", True)
-                return True
-
+                return cmd, "open"
             if cmd["type"] == "app" and any(a in query for a in CLOSE_ACTIONS):
-                try:
-                    if "process_name" in cmd and cmd["process_name"]:
-                        import os
-                        os.system(f'taskkill /IM "{cmd["process_name"]}" /F')
-                        say(f"Closing {cmd['trigger']}.")
-                    else:
-                        say(f"Sorry, I don't know the process name for {cmd['trigger']}.")
-                except Exception as e:
-                    print(f"Error closing app: {e}")
-                    say(f"Sorry, I had trouble trying to close {cmd['trigger']}.")
+                return cmd, "close"
+    return None, None
+
+def execute_custom_command(cmd, action, query, audio_mgr, update_gui_status, state):
+    say = audio_mgr.say
+
+    if action == "open":
+        say(f"Opening {cmd['trigger']}...")
+        if cmd["type"] == "website":
+            import webbrowser
+            webbrowser.open(cmd["target"])
+        elif cmd["type"] == "app":
+            import os
+            try:
+                os.startfile(cmd["target"])
+            except Exception as e:
+                say(f"I couldn't open the file. Check the path.")
+                print(e)
+        elif cmd["type"] == "weather":
+            city = cmd["target"]
+            say(f"Getting the weather for {city}...")
+            try:
+                import requests
+                url = f"https://wttr.in/{city}?format=%C+%t+%w"
+                response = requests.get(url)
+                if response.status_code == 200:
+                    weather_data = response.text
+                    ai_prompt = (
+                        "You are a weather reporter. State the following weather data "
+                        f"in one simple sentence, starting directly with the conditions: {weather_data}"
+                    )
+                    ai_generate(ai_prompt, state, say, update_gui_status, speak_result=True)
+                else:
+                    say(f"Sorry, I couldn't retrieve the weather for {city}.")
+            except Exception as e:
+                say("Weather service is unreachable.")
+
+        log_episode(query, f"Opened {cmd['trigger']}", "custom_command_open", True)
+        return True
+
+    if action == "close":
+        try:
+            if "process_name" in cmd and cmd["process_name"]:
+                import os
+                os.system(f'taskkill /IM "{cmd["process_name"]}" /F')
+                say(f"Closing {cmd['trigger']}.")
+            else:
+                say(f"Sorry, I don't know the process name for {cmd['trigger']}.")
+        except Exception as e:
+            print(f"Error closing app: {e}")
+            say(f"Sorry, I had trouble trying to close {cmd['trigger']}.")
 
-                log_episode(query, f"Closed {cmd['trigger']}", "custom_command_close", True)
-                return True
+        log_episode(query, f"Closed {cmd['trigger']}", "custom_command_close", True)
+        return True
     return False
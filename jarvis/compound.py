@@ -0,0 +1,65 @@
+import contextvars
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from .tracing import current_turn, note_reply
+
+COMPOUND_WORKERS = 4
+MAX_PARTS = 4
+CONJUNCTION_RE = re.compile(r"\s*,\s*(?:and\s+|then\s+)?|\s+(?:and then|and also|and|then|also|plus|aur phir|aur|phir)\s+")
+PARALLEL_HANDLERS = {
+    "time", "whoami", "weather_builtin", "news", "joke", "system_status", "notes_find", "recall",
+    "gmail_summary", "gmail_important", "gmail_attachments", "latency_report", "clipboard",
+}
+EXCLUSIVE_HANDLERS = {
+    "notes_add", "notes_read", "remember", "whatsapp", "learn_command", "alarm", "timer", "custom_command",
+    "gmail_search", "file_search", "sleep", "quit", "shutdown", "restart",
+}
+
+_pool = None
+
+def split_utterance(text: str):
+    return [p.strip() for p in CONJUNCTION_RE.split(text) if p and p.strip()]
+
+def plan(text: str, route):
+    pieces = split_utterance(text)
+    if len(pieces) < 2 or len(pieces) > MAX_PARTS * 2:
+        return None
+    parts = []
+    for piece in pieces:
+        name, handler = route(piece, piece.lower())
+        if name == "chat":
+            if not parts:
+                return None
+            parts[-1] = (parts[-1][0] + " and " + piece,) + parts[-1][1:]
+            continue
+        parts.append((piece, name, handler))
+    if len(parts) < 2 or len(parts) > MAX_PARTS or any(name in EXCLUSIVE_HANDLERS for _, name, _ in parts):
+        return None
+    return parts
+
+def submit(fn, *args):
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=COMPOUND_WORKERS, thread_name_prefix="arjun-part")
+    return _pool.submit(contextvars.copy_context().run, fn, *args)
+
+class DeferredAudio:
+    def __init__(self, audio):
+        self._audio = audio
+        self.spoken = []
+
+    def say(self, text: str):
+        turn = current_turn()
+        if turn is not None and turn.cancelled.is_set():
+            return
+        note_reply(text)
+        self.spoken.append(text)
+
+    def flush(self):
+        for text in self.spoken:
+            self._audio.say(text)
+        self.spoken = []
+
+    def __getattr__(self, name):
+        return getattr(self._audio, name)
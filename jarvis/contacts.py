@@ -0,0 +1,301 @@
+import csv
+import glob
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+
+from .paths import paths
+
+HONORIFICS = {
+    "bhai", "bhaiya", "bhaiyya", "ji", "jee", "sir", "madam", "mam", "maam", "didi", "di", "uncle", "aunty", "auntie",
+    "mr", "mrs", "ms", "dr", "saab", "sahab", "saheb", "bro", "anna", "dada", "dost", "ko", "the", "my",
+}
+MATCH_THRESHOLD = 0.72
+AMBIGUITY_MARGIN = 0.05
+MAX_CANDIDATES = 5
+MAX_EDIT_DISTANCE = 1
+_NON_ALPHA_RE = re.compile(r"[^a-z0-9 ]+")
+_SPACE_RE = re.compile(r"\s+")
+_PHONETIC_RULES = (
+    (re.compile(r"(.)\1+"), r"\1"),
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"(?<=[bcdfgjklmnpqrstvwxz])h"), ""),
+    (re.compile(r"^h"), ""),
+    (re.compile(r"ck|q|c(?=[aou])|c$"), "k"),
+    (re.compile(r"c"), "s"),
+    (re.compile(r"z"), "j"),
+    (re.compile(r"x"), "ks"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"y(?=[aeiou])"), "i"),
+    (re.compile(r"ee|ea|ie|iy|y"), "i"),
+    (re.compile(r"oo|ou|u"), "u"),
+    (re.compile(r"aa|ah"), "a"),
+    (re.compile(r"o"), "u"),
+    (re.compile(r"e"), "i"),
+    (re.compile(r"(.)\1+"), r"\1"),
+    (re.compile(r"(?<=..)[ai]$"), ""),
+)
+
+def normalize_name(name: str) -> str:
+    return _SPACE_RE.sub(" ", _NON_ALPHA_RE.sub(" ", (name or "").lower())).strip()
+
+def strip_honorifics(query: str) -> str:
+    words = query.split()
+    while len(words) > 1 and words[0] in HONORIFICS:
+        words.pop(0)
+    while len(words) > 1 and words[-1] in HONORIFICS:
+        words.pop()
+    return " ".join(words)
+
+def phonetic_key(word: str) -> str:
+    for pattern, repl in _PHONETIC_RULES:
+        word = pattern.sub(repl, word)
+    return word
+
+def _deletes(word: str, distance: int = MAX_EDIT_DISTANCE):
+    found = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w)) if len(w) > 1}
+        found |= frontier
+    return found
+
+def edit_distance(a: str, b: str) -> int:
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+def _similarity(a: str, b: str) -> float:
+    longest = max(len(a), len(b))
+    return 1.0 - edit_distance(a, b) / longest if longest else 0.0
+
+def clean_phone(phone: str) -> str:
+    phone = (phone or "").strip()
+    digits = re.sub(r"[^\d]", "", phone)
+    return ("+" + digits) if phone.startswith("+") else digits
+
+@dataclass
+class Contact:
+    name: str
+    phone: str
+    aliases: list = field(default_factory=list)
+
+def _unfold_vcard(text: str):
+    lines = []
+    for raw in text.splitlines():
+        if raw[:1] in (" ", "\t") and lines:
+            lines[-1] += raw[1:]
+        else:
+            lines.append(raw)
+    return lines
+
+def load_vcard(path: str):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        lines = _unfold_vcard(f.read())
+    contacts = []
+    name, structured, phones, nick = "", "", [], []
+    for line in lines:
+        key, _, value = line.partition(":")
+        prop = key.split(";")[0].split(".")[-1].upper()
+        if prop == "BEGIN":
+            name, structured, phones, nick = "", "", [], []
+        elif prop == "FN":
+            name = value.strip()
+        elif prop == "N":
+            parts = [p.strip() for p in value.split(";")]
+            structured = " ".join(p for p in (parts[1:2] + parts[0:1]) if p)
+        elif prop == "NICKNAME":
+            nick.extend(n.strip() for n in value.split(",") if n.strip())
+        elif prop == "TEL":
+            preferred = "CELL" in key.upper() or "PREF" in key.upper()
+            phones.insert(0, value) if preferred else phones.append(value)
+        elif prop == "END":
+            display = name or structured
+            if display and phones:
+                aliases = [a for a in [structured] + nick if a and a != display]
+                contacts.append(Contact(display, clean_phone(phones[0]), aliases))
+    return contacts
+
+def _pick_column(header, include, exclude=()):
+    for i, col in enumerate(header):
+        low = col.lower()
+        if any(w in low for w in include) and not any(w in low for w in exclude):
+            return i
+    return None
+
+def load_csv(path: str):
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        return []
+    header = rows[0]
+    name_col = _pick_column(header, ("display name", "full name"), ()) if header else None
+    if name_col is None:
+        name_col = _pick_column(header, ("name",), ("given", "first", "last", "family", "middle", "nick", "yomi", "phonetic", "file"))
+    first_col = _pick_column(header, ("given name", "first name"))
+    last_col = _pick_column(header, ("family name", "last name"))
+    nick_col = _pick_column(header, ("nickname",))
+    phone_col = _pick_column(header, ("mobile", "phone 1 - value", "phone", "number", "tel"), ("type", "label", "fax"))
+    body = rows[1:]
+    if phone_col is None or (name_col is None and first_col is None):
+        name_col, phone_col, body = 0, 1, rows
+    contacts = []
+    for row in body:
+        def cell(i):
+            return row[i].strip() if i is not None and i < len(row) else ""
+        structured = " ".join(p for p in (cell(first_col), cell(last_col)) if p)
+        name = cell(name_col) or structured
+        phone = cell(phone_col).split(":::")[0]
+        if name and clean_phone(phone):
+            aliases = [a for a in (structured, cell(nick_col)) if a and a != name]
+            contacts.append(Contact(name, clean_phone(phone), aliases))
+    return contacts
+
+class ContactDirectory:
+    def __init__(self):
+        self.contacts = []
+        self._forms = []
+        self._exact = {}
+        self._tokens = {}
+        self._phonetic = {}
+        self._deletes = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.contacts)
+
+    def _add_key(self, index: dict, key: str, cid: int):
+        bucket = index.get(key)
+        if bucket is None:
+            index[key] = [cid]
+        elif bucket[-1] != cid:
+            bucket.append(cid)
+
+    def add(self, contact: Contact):
+        with self._lock:
+            cid = len(self.contacts)
+            forms = []
+            for name in [contact.name] + list(contact.aliases):
+                norm = normalize_name(name)
+                if not norm:
+                    continue
+                words = norm.split()
+                keys = [phonetic_key(w) for w in words]
+                forms.append((norm, words, keys))
+                self._add_key(self._exact, norm, cid)
+                self._add_key(self._phonetic, " ".join(keys), cid)
+                for word, key in zip(words, keys):
+                    self._add_key(self._tokens, word, cid)
+                    self._add_key(self._phonetic, key, cid)
+                    for deleted in _deletes(word):
+                        self._add_key(self._deletes, deleted, cid)
+            self.contacts.append(contact)
+            self._forms.append(forms)
+            return cid
+
+    def extend(self, contacts):
+        for contact in contacts:
+            self.add(contact)
+        return self
+
+    def load(self, directory: str | None = None, extra: dict | None = None):
+        directory = directory or paths.contacts_dir
+        contacts = []
+        for path in sorted(glob.glob(os.path.join(directory, "*"))):
+            ext = os.path.splitext(path)[1].lower()
+            try:
+                if ext in (".vcf", ".vcard"):
+                    contacts.extend(load_vcard(path))
+                elif ext == ".csv":
+                    contacts.extend(load_csv(path))
+            except Exception as e:
+                print(f"Contacts load error ({os.path.basename(path)}): {e}")
+        for name, phone in (extra or {}).items():
+            contacts.append(Contact(name, clean_phone(phone)))
+        with self._lock:
+            self.__init__()
+            self.extend(contacts)
+        print(f"Contacts: indexed {len(self.contacts)} entries from {directory}")
+        return self
+
+    def _score(self, query: str, query_words, query_keys, cid: int) -> float:
+        best = 0.0
+        for norm, words, keys in self._forms[cid]:
+            if norm == query:
+                return 1.0
+            word_scores = []
+            for qw, qk in zip(query_words, query_keys):
+                score = 0.0
+                for w, k in zip(words, keys):
+                    if w == qw:
+                        score = 1.0
+                        break
+                    if k == qk:
+                        score = max(score, 0.92)
+                    elif score < 0.9 and abs(len(w) - len(qw)) <= MAX_EDIT_DISTANCE + 1:
+                        score = max(score, _similarity(qw, w) * 0.9)
+                word_scores.append(score)
+            coverage = min(1.0, len(query_words) / len(words))
+            best = max(best, sum(word_scores) / len(word_scores) * (0.85 + 0.15 * coverage))
+        return best
+
+    def _word_candidates(self, word: str, key: str) -> set:
+        found = set(self._tokens.get(word, ()))
+        found.update(self._phonetic.get(key, ()))
+        for deleted in _deletes(word):
+            found.update(self._deletes.get(deleted, ()))
+        return found
+
+    def _rank_query(self, query: str, best: dict, expand: bool = True):
+        words = query.split()
+        keys = [phonetic_key(w) for w in words]
+        candidates = set(self._exact.get(query, ()))
+        candidates.update(self._phonetic.get(" ".join(keys), ()))
+        if expand:
+            per_word = [self._word_candidates(w, k) for w, k in zip(words, keys)]
+            shared = set.intersection(*per_word)
+            candidates.update(shared if shared else set().union(*per_word))
+        for cid in candidates:
+            score = self._score(query, words, keys, cid)
+            if score > best.get(cid, 0.0):
+                best[cid] = score
+
+    def rank(self, name: str, limit: int = MAX_CANDIDATES):
+        query = normalize_name(name)
+        if not query:
+            return []
+        best = {}
+        with self._lock:
+            stripped = strip_honorifics(query)
+            self._rank_query(query, best, expand=stripped == query)
+            if stripped != query:
+                self._rank_query(stripped, best)
+            scored = sorted(((score, cid) for cid, score in best.items()), reverse=True)
+            return [(self.contacts[cid], round(score, 3)) for score, cid in scored[:limit]]
+
+    def resolve(self, name: str):
+        ranked = self.rank(name, 2)
+        if not ranked or ranked[0][1] < MATCH_THRESHOLD:
+            return None, ranked
+        if len(ranked) > 1 and ranked[0][1] - ranked[1][1] < AMBIGUITY_MARGIN and ranked[0][0].phone != ranked[1][0].phone:
+            return None, ranked
+        return ranked[0][0], ranked
+
+_directory = None
+_directory_lock = threading.Lock()
+
+def get_contact_directory(extra: dict | None = None) -> ContactDirectory:
+    global _directory
+    with _directory_lock:
+        if _directory is None:
+            _directory = ContactDirectory().load(extra=extra)
+    return _directory
@@ -0,0 +1,154 @@
+import datetime
+import re
+
+WORD_NUMBERS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+    "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20, "thirty": 30,
+    "a": 1, "an": 1, "couple of": 2, "few": 3,
+}
+MONTHS = {
+    name: i + 1 for i, name in enumerate((
+        "january", "february", "march", "april", "may", "june",
+        "july", "august", "september", "october", "november", "december",
+    ))
+}
+MONTHS.update({name[:3]: num for name, num in list(MONTHS.items())})
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+_NUM = r"(\d+|" + "|".join(sorted((re.escape(w) for w in WORD_NUMBERS), key=len, reverse=True)) + r")"
+_MONTH = r"(" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")"
+_RELATIVE_RE = re.compile(r"\b(?:in the |over the )?(?:last|past|pichle)\s+" + _NUM + r"\s+(day|week|month|year)s?\b")
+_FIXED_RE = re.compile(r"\b(today|aaj|yesterday|this week|last week|this month|last month|this year|last year)\b")
+_WEEKDAY_RE = re.compile(r"\b(?:on |last )?(" + "|".join(WEEKDAYS) + r")\b")
+_MONTH_DAY_RE = re.compile(r"\b(?:on )?" + _MONTH + r"\s+(\d{1,2})(?:st|nd|rd|th)?\b|\b(?:on )?(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?" + _MONTH + r"\b")
+_MONTH_RE = re.compile(r"\b(?:in|during|from)\s+" + _MONTH + r"\b")
+_ISO_RE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+_SINCE_RE = re.compile(r"\bsince\s+(" + "|".join(WEEKDAYS) + r"|yesterday|last week|last month|" + _MONTH[1:-1] + r")\b")
+
+def parse_number(text: str, default=None):
+    text = (text or "").strip().lower()
+    if text.isdigit():
+        return int(text)
+    return WORD_NUMBERS.get(text, default)
+
+def _day_start(d: datetime.date) -> datetime.datetime:
+    return datetime.datetime.combine(d, datetime.time.min)
+
+def _month_start(year: int, month: int) -> datetime.datetime:
+    return datetime.datetime(year, month, 1)
+
+def _next_month(dt: datetime.datetime) -> datetime.datetime:
+    return dt.replace(year=dt.year + 1, month=1) if dt.month == 12 else dt.replace(month=dt.month + 1)
+
+def _past_month(now: datetime.datetime, month: int) -> datetime.datetime:
+    year = now.year if month <= now.month else now.year - 1
+    return _month_start(year, month)
+
+def _fixed_range(phrase: str, now: datetime.datetime):
+    today = _day_start(now.date())
+    if phrase in ("today", "aaj"):
+        return today, today + datetime.timedelta(days=1)
+    if phrase == "yesterday":
+        return today - datetime.timedelta(days=1), today
+    week = today - datetime.timedelta(days=today.weekday())
+    if phrase == "this week":
+        return week, week + datetime.timedelta(days=7)
+    if phrase == "last week":
+        return week - datetime.timedelta(days=7), week
+    month = _month_start(now.year, now.month)
+    if phrase == "this month":
+        return month, _next_month(month)
+    if phrase == "last month":
+        prev = _month_start(now.year - 1, 12) if now.month == 1 else _month_start(now.year, now.month - 1)
+        return prev, month
+    year = datetime.datetime(now.year, 1, 1)
+    if phrase == "this year":
+        return year, year.replace(year=now.year + 1)
+    return year.replace(year=now.year - 1), year
+
+def _weekday_start(name: str, now: datetime.datetime) -> datetime.datetime:
+    today = _day_start(now.date())
+    delta = (today.weekday() - WEEKDAYS.index(name)) % 7
+    return today - datetime.timedelta(days=delta or 7)
+
+def parse_date_range(text: str, now: datetime.datetime | None = None):
+    text = (text or "").lower()
+    now = now or datetime.datetime.now()
+
+    m = _SINCE_RE.search(text)
+    if m:
+        word = m.group(1)
+        if word in WEEKDAYS:
+            start = _weekday_start(word, now)
+        elif word in MONTHS:
+            start = _past_month(now, MONTHS[word])
+        else:
+            start = _fixed_range(word, now)[0]
+        return start, now + datetime.timedelta(seconds=1), m.group(0)
+
+    m = _RELATIVE_RE.search(text)
+    if m:
+        n = parse_number(m.group(1), 1)
+        unit = m.group(2)
+        if unit == "day":
+            start = _day_start(now.date()) - datetime.timedelta(days=n - 1)
+        elif unit == "week":
+            start = now - datetime.timedelta(weeks=n)
+        elif unit == "month":
+            start = now - datetime.timedelta(days=30 * n)
+        else:
+            start = now - datetime.timedelta(days=365 * n)
+        return start, now + datetime.timedelta(seconds=1), m.group(0)
+
+    m = _FIXED_RE.search(text)
+    if m:
+        start, end = _fixed_range(m.group(1), now)
+        return start, end, m.group(0)
+
+    m = _ISO_RE.search(text)
+    if m:
+        try:
+            start = datetime.datetime(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            return start, start + datetime.timedelta(days=1), m.group(0)
+        except ValueError:
+            pass
+
+    m = _MONTH_DAY_RE.search(text)
+    if m:
+        month = MONTHS[m.group(1) or m.group(4)]
+        day = int(m.group(2) or m.group(3))
+        try:
+            start = datetime.datetime(now.year, month, day)
+            if start > now:
+                start = start.replace(year=now.year - 1)
+            return start, start + datetime.timedelta(days=1), m.group(0)
+        except ValueError:
+            pass
+
+    m = _WEEKDAY_RE.search(text)
+    if m:
+        start = _weekday_start(m.group(1), now)
+        return start, start + datetime.timedelta(days=1), m.group(0)
+
+    m = _MONTH_RE.search(text)
+    if m:
+        start = _past_month(now, MONTHS[m.group(1)])
+        return start, _next_month(start), m.group(0)
+
+    return None
+
+def strip_date_phrase(text: str, now: datetime.datetime | None = None):
+    found = parse_date_range(text, now)
+    if not found:
+        return text, None, None
+    start, end, phrase = found
+    return re.sub(r"\s+", " ", text.replace(phrase, " ")).strip(), start, end
+
+def describe(ts: float) -> str:
+    dt = datetime.datetime.fromtimestamp(ts)
+    today = datetime.date.today()
+    if dt.date() == today:
+        return f"today at {dt.strftime('%I:%M %p').lstrip('0')}"
+    if dt.date() == today - datetime.timedelta(days=1):
+        return f"yesterday at {dt.strftime('%I:%M %p').lstrip('0')}"
+    return f"on {dt.strftime('%B')} {dt.day}"
@@ -0,0 +1,154 @@
+import re
+from collections import Counter
+
+DEDUP_THRESHOLD = 0.8
+DEDUP_PERMUTATIONS = 64
+DEDUP_CAPACITY = 1 << 17
+SHINGLE_BYTES = 4
+TOP_CLUSTERS = 5
+FALSE_POSITIVE_WEIGHT = 0.2
+_SPACE_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+def normalize(text: str) -> str:
+    return _SPACE_RE.sub(" ", _PUNCT_RE.sub("", text.lower())).strip()
+
+def _false_positive(threshold: float, b: int, r: int, steps: int = 200) -> float:
+    width = threshold / steps
+    return sum(1 - (1 - ((i + 0.5) * width) ** r) ** b for i in range(steps)) * width
+
+def _false_negative(threshold: float, b: int, r: int, steps: int = 200) -> float:
+    width = (1 - threshold) / steps
+    return sum((1 - (threshold + (i + 0.5) * width) ** r) ** b for i in range(steps)) * width
+
+def lsh_params(threshold: float, permutations: int, fp_weight: float = FALSE_POSITIVE_WEIGHT):
+    best = None
+    for b in range(1, permutations + 1):
+        if permutations % b:
+            continue
+        r = permutations // b
+        error = fp_weight * _false_positive(threshold, b, r) + (1 - fp_weight) * _false_negative(threshold, b, r)
+        if best is None or error < best[0]:
+            best = (error, b, r)
+    return best[1], best[2]
+
+class NearDuplicateFilter:
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, permutations: int = DEDUP_PERMUTATIONS,
+                 capacity: int = DEDUP_CAPACITY, seed: int = 1):
+        import numpy as np
+        self.np = np
+        self.threshold = threshold
+        self.permutations = permutations
+        self.capacity = capacity
+        self.bands, self.rows = lsh_params(threshold, permutations)
+        rng = np.random.default_rng(seed)
+        self._mul = rng.integers(1, 2 ** 32, size=permutations, dtype=np.uint32) | np.uint32(1)
+        self._add = rng.integers(0, 2 ** 32, size=permutations, dtype=np.uint32)
+        self._band_mul = rng.integers(1, 2 ** 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+        self._keys = np.zeros((self.bands, capacity), dtype=np.uint64)
+        self._owners = np.full((self.bands, capacity), -1, dtype=np.int64)
+        self._sigs = np.zeros((capacity, permutations), dtype=np.uint32)
+        self._sig_owner = np.full(capacity, -1, dtype=np.int64)
+        self.seen = 0
+        self.kept = 0
+        self.dropped = 0
+        self.verified = 0
+        self.cluster_sizes = Counter()
+        self.cluster_samples = {}
+
+    def signatures(self, texts):
+        np = self.np
+        encoded = [t.encode("utf-8").ljust(SHINGLE_BYTES) for t in texts]
+        lengths = np.fromiter((len(e) for e in encoded), dtype=np.intp, count=len(encoded))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint32)
+        grams = data[:-3] << 24 | data[1:-2] << 16 | data[2:-1] << 8 | data[3:]
+        grams ^= grams >> 16
+        grams *= np.uint32(0x7FEB352D)
+        grams ^= grams >> 15
+        grams *= np.uint32(0x846CA68B)
+        grams ^= grams >> 16
+        hashed = grams[None, :] * self._mul[:, None] + self._add[:, None]
+        ends = offsets + lengths
+        for k in range(1, SHINGLE_BYTES):
+            hashed[:, ends[:-1] - k] = np.uint32(0xFFFFFFFF)
+        return np.minimum.reduceat(hashed, offsets, axis=1).T.copy()
+
+    def _band_keys(self, sigs):
+        np = self.np
+        banded = sigs[:, :self.bands * self.rows].reshape(len(sigs), self.bands, self.rows).astype(np.uint64)
+        return (banded * self._band_mul).sum(axis=2, dtype=np.uint64)
+
+    def _similar(self, owner: int, sig) -> bool:
+        slot = owner % self.capacity
+        if self._sig_owner[slot] != owner:
+            return False
+        self.verified += 1
+        return float((self._sigs[slot] == sig).mean()) >= self.threshold
+
+    def _count_duplicate(self, owner: int, text: str):
+        self.cluster_sizes[owner] += 1
+        self.cluster_samples.setdefault(owner, text)
+        if len(self.cluster_sizes) > self.capacity:
+            self.cluster_sizes = Counter(dict(self.cluster_sizes.most_common(self.capacity // 2)))
+            self.cluster_samples = {o: self.cluster_samples[o] for o in self.cluster_sizes}
+
+    def filter(self, texts):
+        if not texts:
+            return []
+        np = self.np
+        sigs = self.signatures([normalize(t) for t in texts])
+        keys = self._band_keys(sigs)
+        slots = (keys % np.uint64(self.capacity)).astype(np.intp)
+        band_range = np.arange(self.bands)[None, :]
+        table_hits = (self._keys[band_range, slots] == keys).tolist()
+        table_owners = self._owners[band_range, slots].tolist()
+        owners = np.empty((len(texts), 1), dtype=np.int64)
+        batch = {}
+        keep = []
+        for i, text in enumerate(texts):
+            row_keys = keys[i].tolist()
+            owner = -1
+            for band, key in enumerate(row_keys):
+                candidate = batch.get((band, key))
+                if candidate is None and table_hits[i][band]:
+                    candidate = table_owners[i][band]
+                if candidate is not None and candidate >= 0 and self._similar(candidate, sigs[i]):
+                    owner = candidate
+                    break
+            self.seen += 1
+            if owner >= 0:
+                self.dropped += 1
+                self._count_duplicate(owner, text)
+                keep.append(False)
+            else:
+                owner = self.seen - 1
+                self._sigs[owner % self.capacity] = sigs[i]
+                self._sig_owner[owner % self.capacity] = owner
+                self.kept += 1
+                keep.append(True)
+            for band, key in enumerate(row_keys):
+                batch[(band, key)] = owner
+            owners[i] = owner
+        self._keys[band_range, slots] = keys
+        self._owners[band_range, slots] = owners
+        return keep
+
+    def stats(self) -> dict:
+        sizes = [n + 1 for n in self.cluster_sizes.values()]
+        buckets = Counter()
+        for size in sizes:
+            buckets["2" if size == 2 else "3-9" if size < 10 else "10-99" if size < 100 else "100+"] += 1
+        top = self.cluster_sizes.most_common(TOP_CLUSTERS)
+        return {
+            "seen": self.seen,
+            "kept": self.kept,
+            "dropped": self.dropped,
+            "clusters_with_duplicates": len(sizes),
+            "largest_cluster": max(sizes, default=1),
+            "cluster_size_histogram": dict(buckets),
+            "top_clusters": [(n + 1, self.cluster_samples[owner]) for owner, n in top],
+            "bands": self.bands,
+            "rows": self.rows,
+            "verified": self.verified,
+        }
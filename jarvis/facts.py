@@ -0,0 +1,153 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .paths import paths
+
+NAME_PATTERNS = (
+    re.compile(r"\bmy name is\s+(.+)", re.IGNORECASE),
+    re.compile(r"^(?:please\s+)?call me\s+(\w+(?:\s+\w+)?)[\s.,!?]*$", re.IGNORECASE),
+)
+NOT_A_CITY = r"(?!(?:the|a|an|my|your|our|his|her|their|this|that|fear|hope|peace|denial|work|school|home|here|there)\b)"
+CITY_WORD = r"(?!(?:of|for|with|at|to|and|in|on|about|because|since)\b)[\w.'-]+"
+CITY_PATTERNS = tuple(
+    re.compile(rf"^(?:that\s+)?(?:{lead})\s+{NOT_A_CITY}({CITY_WORD}(?:\s+{CITY_WORD}){{0,2}})[\s.,!?]*$", re.IGNORECASE)
+    for lead in (r"i live in", r"my city is", r"i(?: am|'m) from")
+)
+LEGACY_NAME_RE = re.compile(r"^- the user's name is (.+)$", re.IGNORECASE)
+LEGACY_FACT_RE = re.compile(r"^- the user told you to remember: (.+)$", re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    line TEXT NOT NULL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def _clean(value: str) -> str:
+    return value.strip().strip(" .,!?")
+
+def classify_fact(fact: str):
+    for pattern in NAME_PATTERNS:
+        m = pattern.search(fact)
+        if m and _clean(m.group(1)):
+            name = _clean(m.group(1))
+            return "name", "name", name, f"- The user's name is {name}\n"
+    for pattern in CITY_PATTERNS:
+        m = pattern.search(fact)
+        if m and _clean(m.group(1)):
+            city = _clean(m.group(1))
+            return "city", "city", city, f"- The user lives in {city}\n"
+    key = "fact:" + re.sub(r"\s+", " ", fact.lower()).strip(" .!?")
+    return key, "fact", fact, f"- The user told you to remember: {fact}\n"
+
+class FactStore:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = None
+        self._facts = {}
+        self._block = None
+
+    def open(self, legacy_file: str | None = None):
+        with self._lock:
+            if self._conn is not None:
+                return self
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+            migrated = self._conn.execute("SELECT value FROM meta WHERE key = 'legacy_migrated'").fetchone()
+            if not migrated and legacy_file and os.path.exists(legacy_file):
+                self._migrate(legacy_file)
+            rows = self._conn.execute("SELECT key, kind, value, line FROM facts ORDER BY created, rowid").fetchall()
+            self._facts = {key: (kind, value, line) for key, kind, value, line in rows}
+            self._block = None
+        return self
+
+    def _migrate(self, legacy_file: str):
+        with open(legacy_file, "r", encoding="utf-8") as f:
+            lines = [line.strip() for line in f if line.strip()]
+        now = time.time()
+        with self._conn:
+            for i, line in enumerate(lines):
+                m = LEGACY_NAME_RE.match(line)
+                if m:
+                    key, kind, value, text = classify_fact(f"my name is {m.group(1)}")
+                else:
+                    m = LEGACY_FACT_RE.match(line)
+                    if m:
+                        key, kind, value, text = classify_fact(m.group(1).strip())
+                    else:
+                        key, kind, value, text = "line:" + line.lower(), "fact", line, line + "\n"
+                self._upsert(key, kind, value, text, now + i * 1e-6)
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_migrated', ?)", (str(now),))
+        print(f"Migrated {len(lines)} facts from {os.path.basename(legacy_file)}.")
+
+    def _upsert(self, key, kind, value, line, now):
+        self._conn.execute(
+            "INSERT INTO facts (key, kind, value, line, created, updated) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, line = excluded.line, updated = excluded.updated",
+            (key, kind, value, line, now, now),
+        )
+
+    def remember(self, fact: str):
+        key, kind, value, line = classify_fact(fact)
+        with self._lock:
+            old = self._facts.get(key)
+            if old is not None and old[1] == value:
+                return key, False
+            with self._conn:
+                self._upsert(key, kind, value, line, time.time())
+            self._facts[key] = (kind, value, line)
+            self._block = None
+        return key, True
+
+    def forget(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._facts:
+                return False
+            with self._conn:
+                self._conn.execute("DELETE FROM facts WHERE key = ?", (key,))
+            del self._facts[key]
+            self._block = None
+            return True
+
+    def get(self, key: str):
+        fact = self._facts.get(key)
+        return fact[1] if fact else None
+
+    def __len__(self):
+        return len(self._facts)
+
+    def block(self) -> str:
+        with self._lock:
+            if self._block is None:
+                self._block = "".join(line for _, _, line in self._facts.values())
+            return self._block
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_fact_store() -> FactStore:
+    with _stores_lock:
+        store = _stores.get(paths.facts_db)
+        if store is None:
+            store = FactStore(paths.facts_db)
+            _stores[paths.facts_db] = store
+    return store.open(paths.memory_file)
@@ -4,16 +4,20 @@ import re
 import random
 import datetime
 import threading
-import requests
-import psutil
-import pyautogui
-import screen_brightness_control as sbc
-from newsapi import NewsApiClient
 import config
 from .paths import paths
 from .ai_engine import ai_generate
+from .dates import parse_date_range, strip_date_phrase, parse_number, describe
+from .notes import get_notes_store
+from .recall import get_recall_index, recall_terms
 
 CONFIRM_WORDS = ["yes", "yeah", "yep", "sure", "open it", "please", "okay", "do it"]
+CONTINUE_WORDS = ("yes", "yeah", "continue", "more", "next", "go on", "haan", "aur")
+NOTES_PAGE_SIZE = 5
+NOTES_SEARCH_LIMIT = 3
+RECALL_LIMIT = 3
+RECALL_REPLY_WORDS = 25
+_LAST_N_NOTES_RE = re.compile(r"\b(?:last|latest|recent)\s+([\w]+)\s+notes?\b")
 
 def check_command(query, action_words, subject_words):
     query = query.lower()
@@ -26,23 +30,90 @@ def take_note(audio_mgr):
     if "none" in note:
         say("I didn't catch that. Note cancelled.")
         return
-    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(paths.notes_file, "a", encoding="utf-8") as f:
-        f.write(f"{now}: {note}\n")
-    say("Note saved.")
+    try:
+        get_notes_store().add(note)
+        say("Note saved.")
+    except Exception as e:
+        print(f"Note save error: {e}")
+        say("I had trouble saving that note.")
 
-def read_notes(audio_mgr):
+def _speak_notes(say, rows):
+    for _, ts, text in rows:
+        say(f"{describe(ts).capitalize()}: {text}")
+
+def read_notes(audio_mgr, query_lower=""):
     say = audio_mgr.say
-    say("Reading your notes...")
     try:
-        with open(paths.notes_file, "r", encoding="utf-8") as f:
-            notes = f.read()
-        if notes:
-            say(notes)
-        else:
-            say("Your note file is empty.")
-    except FileNotFoundError:
-        say("I couldn't find any notes.")
+        store = get_notes_store()
+    except Exception as e:
+        print(f"Notes store error: {e}")
+        say("I couldn't open your notes.")
+        return
+
+    m = _LAST_N_NOTES_RE.search(query_lower)
+    requested = parse_number(m.group(1)) if m else None
+    page_size = requested or NOTES_PAGE_SIZE
+    found = parse_date_range(query_lower)
+    start = found[0].timestamp() if found else None
+    end = found[1].timestamp() if found else None
+
+    total = store.count_range(start, end)
+    if not total:
+        say("I couldn't find any notes for that time." if found else "You don't have any notes yet.")
+        return
+
+    say(f"You have {total} notes{' from ' + found[2] if found else ''}. Reading the latest {min(page_size, total)}.")
+    offset = 0
+    while True:
+        rows = store.latest(page_size, offset, start, end)
+        _speak_notes(say, rows)
+        offset += len(rows)
+        if requested or offset >= total or not rows:
+            return
+        say(f"{total - offset} more. Should I continue?")
+        reply = audio_mgr.listen()
+        if not any(w in reply for w in CONTINUE_WORDS):
+            say("Okay, stopping here.")
+            return
+
+def find_note(audio_mgr, query_lower):
+    say = audio_mgr.say
+    try:
+        store = get_notes_store()
+    except Exception as e:
+        print(f"Notes store error: {e}")
+        say("I couldn't open your notes.")
+        return
+
+    topic, start, end = strip_date_phrase(query_lower)
+    rows = store.search(topic, NOTES_SEARCH_LIMIT, start.timestamp() if start else None, end.timestamp() if end else None)
+    if not rows:
+        say("I couldn't find a note about that.")
+        return
+    say(f"I found {len(rows)} matching note{'s' if len(rows) > 1 else ''}.")
+    _speak_notes(say, rows)
+
+def recall_conversations(audio_mgr, query_lower):
+    say = audio_mgr.say
+    topic, start, end = strip_date_phrase(query_lower)
+    try:
+        index = get_recall_index()
+        index.sync()
+        found = index.search(topic, RECALL_LIMIT, start.timestamp() if start else None, end.timestamp() if end else None)
+    except Exception as e:
+        print(f"Recall index error: {e}")
+        say("I couldn't search our past conversations.")
+        return
+    if not found:
+        what = " ".join(recall_terms(topic))
+        say(f"I couldn't find a conversation about {what}." if what else "I couldn't find any conversations from then.")
+        return
+    for ep in found:
+        reply = " ".join(str(ep.get("assistant_reply") or "").split()[:RECALL_REPLY_WORDS])
+        text = f"{describe(float(ep.get('ts') or 0)).capitalize()} you asked: {ep.get('query')}."
+        if reply:
+            text += f" I said: {reply}"
+        say(text)
 
 def find_file(audio_mgr, update_gui_status):
     say = audio_mgr.say
@@ -158,6 +229,7 @@ def simple_weather(query, audio_mgr, state, update_gui_status):
     if "weather in" not in query:
         return False
     try:
+        import requests
         city = query.split("in")[-1].strip()
         say(f"Getting the weather for {city}...")
         url = f"https://wttr.in/{city}?format=%C+%t+%w"
@@ -179,6 +251,7 @@ def simple_weather(query, audio_mgr, state, update_gui_status):
 
 def get_latest_news():
     try:
+        from newsapi import NewsApiClient
         newsapi = NewsApiClient(api_key=config.NEWS_API_KEY)
 
         headlines = newsapi.get_top_headlines(
@@ -213,16 +286,17 @@ def speak_latest_news(audio_mgr, state, update_gui_status):
 def speak_system_status(audio_mgr):
     say = audio_mgr.say
     try:
-        cpu = psutil.cpu_percent()
-        ram = psutil.virtual_memory().percent
-        say(f"System is at {cpu} percent CPU usage and {ram} percent RAM usage.")
+        from .sysmon import monitor
+        status = monitor.describe()
     except Exception as e:
         print(e)
-        say("Sorry, I am unable to check system status right now.")
+        status = None
+    say(status or "Sorry, I am unable to check system status right now.")
 
 def volume_up(audio_mgr):
     say = audio_mgr.say
     try:
+        import pyautogui
         say("Increasing volume.")
         for _ in range(5):
             pyautogui.press("volumeup")
@@ -233,6 +307,7 @@ def volume_up(audio_mgr):
 def volume_down(audio_mgr):
     say = audio_mgr.say
     try:
+        import pyautogui
         say("Decreasing volume.")
         for _ in range(5):
             pyautogui.press("volumedown")
@@ -242,22 +317,26 @@ def volume_down(audio_mgr):
 
 def media_playpause(audio_mgr):
     say = audio_mgr.say
+    import pyautogui
     say("Okay.")
     pyautogui.press("playpause")
 
 def media_next(audio_mgr):
     say = audio_mgr.say
+    import pyautogui
     say("Next track.")
     pyautogui.hotkey("ctrl", "right")
 
 def media_prev(audio_mgr):
     say = audio_mgr.say
+    import pyautogui
     say("Previous track.")
     pyautogui.hotkey("ctrl", "left")
 
 def brightness_up(audio_mgr):
     say = audio_mgr.say
     try:
+        import screen_brightness_control as sbc
         current = sbc.get_brightness()
         if not current:
             say("Sorry, I am unable to get brightness data.")
@@ -272,6 +351,7 @@ def brightness_up(audio_mgr):
 def brightness_down(audio_mgr):
     say = audio_mgr.say
     try:
+        import screen_brightness_control as sbc
         current = sbc.get_brightness()
         if not current:
             say("Sorry, I am unable to get brightness data.")
@@ -3,17 +3,17 @@ import os
 import datetime as dt
 from typing import List, Dict, Any
 
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-
 SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]
 
 TOKEN_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "token.json")
 CREDS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "credentials.json")
 
 def _get_gmail_service():
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+    from googleapiclient.discovery import build
+
     creds = None
     if os.path.exists(TOKEN_PATH):
         creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
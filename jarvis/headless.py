@@ -0,0 +1,222 @@
+import argparse
+import json
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+
+from .paths import paths
+from .tracing import tracer, note_reply, current_turn
+
+class EventSink:
+    def __init__(self, maxlen: int = 50):
+        self.events = deque(maxlen=maxlen)
+
+    def put(self, msg: str):
+        self.events.append(msg)
+
+    def take(self):
+        events = list(self.events)
+        self.events.clear()
+        return events
+
+class CaptureAudio:
+    def __init__(self, update_gui_status=None):
+        self.update_gui_status = update_gui_status or (lambda text: None)
+        self.is_asleep = False
+        self.voice_profile = "friendly"
+        self.offline_mode = False
+        self.spoken = []
+        self.followups = []
+
+    def say(self, text: str):
+        turn = current_turn()
+        if turn is not None and turn.cancelled.is_set():
+            return
+        self.spoken.append(text)
+        note_reply(text)
+
+    def listen(self, barge_in: bool = False) -> str:
+        if self.followups:
+            return self.followups.pop(0).lower()
+        return "none"
+
+    def stop_speaking(self):
+        pass
+
+    def take_spoken(self):
+        spoken, self.spoken = self.spoken, []
+        return spoken
+
+    def set_sleep(self, sleep: bool):
+        self.is_asleep = sleep
+
+    def cleanup(self):
+        pass
+
+    def set_voice_profile(self, profile: str):
+        profile = (profile or "").lower()
+        if profile in ("friendly", "jarvis"):
+            self.voice_profile = profile
+
+def sandbox_paths(tmp_dir: str):
+    for name in ("memory_file", "facts_db", "commands_file", "notes_file", "notes_db"):
+        src = getattr(paths, name)
+        dst = os.path.join(tmp_dir, os.path.basename(src))
+        if os.path.exists(src):
+            shutil.copy(src, dst)
+        setattr(paths, name, dst)
+    paths.episode_log = os.path.join(tmp_dir, "episodes.jsonl")
+    paths.recall_db = os.path.join(tmp_dir, "recall.db")
+    paths.sysmon_export = os.path.join(tmp_dir, "sysmon.csv")
+    paths.residency_log = os.path.join(tmp_dir, "residency.jsonl")
+    paths.improvements_file = os.path.join(tmp_dir, "improvements.txt")
+    paths.improve_checkpoint = os.path.join(tmp_dir, "improve_checkpoint.json")
+    paths.snapshot_file = os.path.join(tmp_dir, "assistant_state.snap")
+    paths.openai_dir = os.path.join(tmp_dir, "Openai")
+
+def load_queries(path: str):
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                query = (data.get("query") or "").strip()
+                if query:
+                    items.append({"query": query, "expected": data.get("handler"), "followups": data.get("followups", [])})
+            else:
+                items.append({"query": line, "expected": None, "followups": []})
+    return items
+
+def make_assistant():
+    from .assistant import JarvisAssistant
+    audio = CaptureAudio()
+    assistant = JarvisAssistant(EventSink(), audio.update_gui_status, audio=audio)
+    assistant.initialize()
+    return assistant
+
+def _run_worker(items, results, route_only):
+    assistant = make_assistant()
+    audio = assistant.audio
+    while True:
+        try:
+            idx, item = items.get_nowait()
+        except queue.Empty:
+            return
+        query = item["query"]
+        start = time.perf_counter()
+        if route_only:
+            handler = assistant.route(query, query.lower())[0]
+            replies = []
+        else:
+            audio.followups = list(item["followups"])
+            with tracer.turn(query) as turn:
+                assistant.handle_query(query)
+            handler = turn.handler
+            replies = audio.take_spoken()
+            audio.set_sleep(False)
+        results[idx] = {
+            "query": query,
+            "handler": handler,
+            "expected": item["expected"],
+            "replies": replies,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+
+def replay(items, workers: int = 1, route_only: bool = False):
+    pending = queue.Queue()
+    for idx, item in enumerate(items):
+        pending.put((idx, item))
+    results = [None] * len(items)
+
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(target=_run_worker, args=(pending, results, route_only), daemon=True)
+        for _ in range(max(1, workers))
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return [r for r in results if r is not None], elapsed
+
+def print_summary(results, elapsed: float, workers: int):
+    total = len(results)
+    print("=== Headless replay summary ===")
+    print(f"Queries:            {total}")
+    print(f"Workers:            {workers}")
+    print(f"Wall time:          {elapsed:.3f} s")
+    print(f"Throughput:         {total / elapsed if elapsed else 0.0:.1f} queries/s")
+
+    latencies = sorted(r["latency_ms"] for r in results)
+    if latencies:
+        print(f"Latency p50/p95:    {latencies[len(latencies) // 2]:.2f} / {latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]:.2f} ms")
+
+    checked = [r for r in results if r["expected"]]
+    if checked:
+        mismatches = [r for r in checked if r["expected"] != r["handler"]]
+        print(f"Routing matches:    {len(checked) - len(mismatches)}/{len(checked)}")
+        for r in mismatches[:10]:
+            print(f"  '{r['query']}': expected {r['expected']}, routed to {r['handler']}")
+
+    print("Routing decisions:")
+    for handler, count in Counter(r["handler"] for r in results).most_common():
+        print(f"  {count:6d}  {handler}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Replay text queries through the assistant without mic, TTS or GUI.")
+    parser.add_argument("queries", help="Text file (one query per line) or episodes JSONL with a 'query' field.")
+    parser.add_argument("--workers", type=int, default=1, help="Replay workers, each with its own MemoryState.")
+    parser.add_argument("--route-only", action="store_true", help="Only record the routing decision, do not run handlers.")
+    parser.add_argument("--fake-backends", action="store_true", help="Use the zero-latency benchmark stand-ins for Ollama, Gmail, news, etc.")
+    parser.add_argument("--no-sandbox", action="store_true", help="Read and write the real memory, notes, commands and episode files.")
+    parser.add_argument("--out", default=None, help="Write per-query results as JSONL.")
+    parser.add_argument("--reply-cache", action="store_true", help="Serve repeated general chat questions from the semantic reply cache.")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.fake_backends:
+        sys.path.insert(0, paths.PROJECT_DIR)
+        from benchmarks.fakes import Recorder, install_fakes
+        install_fakes(Recorder({}, scale=0.0))
+
+    if args.reply_cache:
+        from .reply_cache import reply_cache
+        reply_cache.enable()
+
+    tmp_dir = None
+    if not args.no_sandbox:
+        tmp_dir = tempfile.mkdtemp(prefix="arjun_headless_")
+        sandbox_paths(tmp_dir)
+
+    try:
+        items = load_queries(args.queries)
+        results, elapsed = replay(items, workers=args.workers, route_only=args.route_only)
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print_summary(results, elapsed, args.workers)
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            for r in results:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        print(f"Per-query results written to {args.out}")
+
+if __name__ == "__main__":
+    main()
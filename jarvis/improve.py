@@ -0,0 +1,242 @@
+import json
+import os
+import queue
+import threading
+import time
+
+from . import llm
+from .paths import paths
+from .tracing import span
+
+CHECKPOINT_VERSION = 1
+CHUNK_EPISODES = 40
+CHUNK_CHARS = 6000
+MAX_CHUNKS_PER_RUN = 8
+EPISODE_FIELDS = ("query", "handler", "success", "notes")
+
+MAP_PROMPT = """You are Arjun's self-improvement module.
+
+Chat in a natural way. Do not use Sir often. Have a normal conversation like a friend.
+Below are recent interaction logs in JSONL format. Each line has: query, handler, success, and notes.
+
+1. Briefly summarize any recurring problems, user frustrations, or obvious misunderstandings.
+2. Propose:
+   - New trigger phrases that should map to EXISTING handler names I already use.
+   - Optional extra instructions to append to my system prompt to better match the user's preferences.
+3. Only use handlers that sound generic (like 'chat', 'weather_builtin', 'notes_add', 'media_playpause', etc.).
+4. DO NOT propose new arbitrary Python code.
+
+Respond ONLY in this strict JSON format (no extra commentary, no markdown):
+
+{
+  "new_triggers": [
+    {"trigger": "phrase user says", "handler": "existing_handler_name", "reason": "why this helps"}
+  ],
+  "system_prompt_append": "extra natural-language instructions to append to the current prompt or empty string"
+}
+"""
+
+REDUCE_PROMPT = """You are Arjun's self-improvement module.
+
+Below are several JSON suggestion objects, each produced from a different slice of the interaction logs.
+Merge them into ONE object in the same format:
+- Keep each distinct trigger once; drop duplicates and triggers that contradict each other.
+- Combine the system_prompt_append texts into a short, non-repetitive set of instructions (or an empty string).
+
+Respond ONLY in this strict JSON format (no extra commentary, no markdown):
+
+{
+  "new_triggers": [
+    {"trigger": "phrase user says", "handler": "existing_handler_name", "reason": "why this helps"}
+  ],
+  "system_prompt_append": "merged instructions or empty string"
+}
+"""
+
+_job_lock = threading.Lock()
+
+def parse_suggestions(raw: str):
+    raw = (raw or "").strip()
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except Exception as e1:
+        start = raw.find("{")
+        end = raw.rfind("}")
+        if start != -1 and end != -1 and end > start:
+            try:
+                return json.loads(raw[start:end + 1])
+            except Exception as e2:
+                print(f"JSON parse error (second attempt): {e2}")
+        else:
+            print(f"JSON parse error: {e1}")
+    return None
+
+def load_checkpoint() -> dict:
+    try:
+        with open(paths.improve_checkpoint, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == CHECKPOINT_VERSION:
+            return data
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Improve checkpoint error: {e}")
+    return {"version": CHECKPOINT_VERSION, "offset": 0, "episodes": 0, "runs": 0}
+
+def save_checkpoint(checkpoint: dict):
+    os.makedirs(os.path.dirname(paths.improve_checkpoint) or ".", exist_ok=True)
+    tmp = paths.improve_checkpoint + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp, paths.improve_checkpoint)
+
+def pending_bytes(checkpoint: dict) -> int:
+    try:
+        size = os.path.getsize(paths.episode_log)
+    except OSError:
+        return 0
+    if size < checkpoint["offset"]:
+        return size
+    return size - checkpoint["offset"]
+
+def read_new_episodes(offset: int, max_chunks: int = MAX_CHUNKS_PER_RUN):
+    chunks = []
+    current, current_chars = [], 0
+    with open(paths.episode_log, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() < offset:
+            offset = 0
+        f.seek(offset)
+        pos = offset
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                ep = json.loads(raw)
+            except json.JSONDecodeError:
+                pos += len(raw)
+                continue
+            line = json.dumps({k: ep.get(k) for k in EPISODE_FIELDS}, ensure_ascii=False)
+            if current and (len(current) >= CHUNK_EPISODES or current_chars + len(line) > CHUNK_CHARS):
+                chunks.append((current, pos))
+                if len(chunks) >= max_chunks:
+                    return chunks
+                current, current_chars = [], 0
+            current.append(line)
+            current_chars += len(line) + 1
+            pos += len(raw)
+    if current:
+        chunks.append((current, pos))
+    return chunks
+
+def _map(lines):
+    with span("improve.map", episodes=len(lines)):
+        resp = llm.generate("llama3:8b", MAP_PROMPT + "\n\nLOGS:\n" + "\n".join(lines), priority=llm.BACKGROUND)
+    return parse_suggestions(resp.get("response"))
+
+def _merge_locally(partials):
+    triggers, seen, appends = [], set(), []
+    for p in partials:
+        for t in p.get("new_triggers") or []:
+            key = (str(t.get("trigger", "")).lower(), t.get("handler"))
+            if key[0] and key not in seen:
+                seen.add(key)
+                triggers.append(t)
+        text = (p.get("system_prompt_append") or "").strip()
+        if text and text not in appends:
+            appends.append(text)
+    return {"new_triggers": triggers, "system_prompt_append": "\n".join(appends)}
+
+def _reduce(partials):
+    if len(partials) == 1:
+        return partials[0]
+    with span("improve.reduce", parts=len(partials)):
+        try:
+            resp = llm.generate(
+                "llama3:8b",
+                REDUCE_PROMPT + "\n\nSUGGESTIONS:\n" + "\n".join(json.dumps(p, ensure_ascii=False) for p in partials),
+                priority=llm.BACKGROUND,
+            )
+            merged = parse_suggestions(resp.get("response"))
+        except Exception as e:
+            print(f"Self-improvement reduce error: {e}")
+            merged = None
+    return merged if isinstance(merged, dict) else _merge_locally(partials)
+
+class SelfImprover:
+    def __init__(self):
+        self.pending = queue.SimpleQueue()
+        self.last_error = None
+
+    def has_new_episodes(self) -> bool:
+        return pending_bytes(load_checkpoint()) > 0
+
+    def start(self) -> bool:
+        if not _job_lock.acquire(blocking=False):
+            return False
+        threading.Thread(target=self._run, daemon=True, name="self-improve").start()
+        return True
+
+    def _run(self):
+        try:
+            checkpoint = load_checkpoint()
+            chunks = read_new_episodes(checkpoint["offset"])
+            if not chunks:
+                return
+            start = time.perf_counter()
+            partials = []
+            for lines, _ in chunks:
+                try:
+                    result = _map(lines)
+                except Exception as e:
+                    print(f"Self-evolution LLM error: {e}")
+                    self.last_error = str(e)
+                    break
+                if not isinstance(result, dict):
+                    print("Self-evolution LLM reply could not be parsed; will retry these episodes.")
+                    self.last_error = "unparseable suggestions"
+                    break
+                partials.append(result)
+            else:
+                update = _reduce(partials) if partials else {"new_triggers": [], "system_prompt_append": ""}
+                self.pending.put({
+                    "suggestions": update,
+                    "offset": chunks[-1][1],
+                    "episodes": sum(len(lines) for lines, _ in chunks),
+                    "seconds": round(time.perf_counter() - start, 1),
+                })
+        except Exception as e:
+            print(f"Self-improvement job error: {e}")
+            self.last_error = str(e)
+        finally:
+            _job_lock.release()
+
+    def apply_pending(self, state) -> list:
+        applied = []
+        while True:
+            try:
+                update = self.pending.get_nowait()
+            except queue.Empty:
+                return applied
+            sp_append = (update["suggestions"].get("system_prompt_append") or "").strip()
+            if sp_append:
+                state.evolution_append = f"{state.evolution_append}\n\n{sp_append}" if state.evolution_append else sp_append
+                state.refresh_prompt()
+                try:
+                    with open(paths.improvements_file, "a", encoding="utf-8") as f:
+                        f.write("SYSTEM_PROMPT_APPEND:\n" + sp_append + "\n\n")
+                except Exception as e:
+                    print(f"Improvement file error: {e}")
+
+            checkpoint = load_checkpoint()
+            checkpoint["offset"] = update["offset"]
+            checkpoint["episodes"] += update["episodes"]
+            checkpoint["runs"] += 1
+            checkpoint["updated"] = time.time()
+            try:
+                save_checkpoint(checkpoint)
+            except Exception as e:
+                print(f"Improve checkpoint error: {e}")
+            applied.append(update)
@@ -0,0 +1,346 @@
+import json
+import re
+import threading
+import zlib
+
+INTENT_DIM = 1 << 12
+INTENT_THRESHOLD = 0.45
+INTENT_MARGIN = 0.08
+SIDE_EFFECT_THRESHOLD = 0.55
+SIDE_EFFECT_MARGIN = 0.12
+SIDE_EFFECT_INTENTS = {
+    "sleep", "notes_add", "learn_command", "music", "volume_up", "volume_down", "media_playpause", "media_next",
+    "media_prev", "brightness_up", "brightness_down", "shutdown", "restart", "persona_jarvis", "persona_friendly",
+    "reset_chat", "self_improve",
+}
+CHAR_GRAM = 3
+CHAR_WEIGHT = 0.35
+BIGRAM_WEIGHT = 1.2
+FALLBACK_LABEL = "chat"
+STOPWORDS = {
+    "a", "an", "the", "my", "me", "i", "you", "your", "please", "can", "could", "would", "will", "to", "for",
+    "of", "is", "it", "this", "that", "some", "just", "bit", "little", "now", "arjun", "jarvis", "hey", "yaar",
+}
+
+INTENT_EXAMPLES = {
+    "sleep": (
+        "go to sleep", "take a nap", "sleep now", "stop listening to me", "go offline for a while", "rest for now",
+    ),
+    "clipboard": (
+        "read my clipboard", "what did i copy", "what's on my clipboard", "read what i copied", "paste what i copied",
+        "what have i got copied", "what is in the clipboard",
+    ),
+    "notes_add": (
+        "take a note", "jot this down", "note this down", "write something down for me", "add a note",
+        "save a note", "remember to write this down", "jot down a note", "jot it down",
+    ),
+    "notes_read": (
+        "read my notes", "what did i write down", "what's in my notes", "go through my notes", "list my notes",
+        "what notes do i have", "check my notes", "read back my notes",
+    ),
+    "recall": (
+        "what did i ask you about", "what did we talk about yesterday", "what did you tell me about",
+        "remind me what i asked", "did i ask you about", "when did i ask about", "what was our conversation about",
+        "search our past conversations",
+    ),
+    "learn_command": (
+        "learn a new command", "teach you a new command", "i want to add a shortcut", "add a custom command",
+        "create a new voice command", "teach you a shortcut", "let me teach you a command",
+    ),
+    "gmail_summary": (
+        "gmail summary", "what's in my inbox", "check my email", "any new emails", "summarize my inbox",
+        "do i have mail", "read my emails", "check my mail", "how many unread emails", "did i get any mail",
+        "anything new in my inbox", "open my inbox",
+    ),
+    "gmail_important": (
+        "important emails", "show my starred mail", "any important mail", "urgent emails in my inbox",
+        "priority emails", "anything urgent in my mail", "urgent mail",
+    ),
+    "gmail_attachments": (
+        "email attachments", "did anyone send me a file", "any attachments in my mail", "files attached to my emails",
+        "attachment in my email", "did i receive any attachments",
+    ),
+    "music": (
+        "play some music", "put on a song", "play my song", "i want to listen to music", "start some tunes",
+    ),
+    "whoami": (
+        "who am i", "what is my name", "do you know my name", "tell me my name", "what do you call me",
+        "remember my name", "what's my name",
+    ),
+    "time": (
+        "what is the time", "what time is it", "tell me the time", "current time", "time kya hua", "got the time",
+        "what's the time", "time right now", "check the clock",
+    ),
+    "news": (
+        "latest news", "news headlines", "what's happening in the world", "read me the news", "any news today",
+        "top stories", "what's in the headlines", "today's news", "headlines today",
+        "what's going on today", "world news",
+    ),
+    "system_status": (
+        "system status", "how is my computer doing", "cpu usage", "ram usage", "how much memory is used",
+        "is my pc under load", "battery and cpu status", "how is my pc holding up",
+        "processor usage", "how much cpu is used", "computer health", "how is my computer holding up",
+    ),
+    "latency_report": (
+        "latency report", "how fast are you", "performance report", "why are you slow", "show your timings",
+    ),
+    "volume_up": (
+        "increase volume", "volume up", "turn it up", "crank up the volume", "make it louder", "louder please",
+        "raise the volume", "turn up the sound", "boost the volume", "awaaz badhao", "turn the sound up",
+        "crank it up", "pump it up", "i can't hear you, louder",
+    ),
+    "volume_down": (
+        "decrease volume", "volume down", "turn it down", "make it quieter", "lower the volume", "too loud",
+        "reduce the sound", "softer please", "awaaz kam karo", "sound down",
+        "bring the volume down", "turn the sound down",
+    ),
+    "media_playpause": (
+        "pause the music", "resume playback", "pause it", "hold the song", "unpause", "stop the song for a second",
+        "pause this track", "pause the song please",
+    ),
+    "media_next": (
+        "next song", "skip this song", "skip track", "play the next one", "change the song", "skip this",
+        "skip to the next track",
+    ),
+    "media_prev": (
+        "previous song", "go back a song", "play the last song again", "previous track", "back one track",
+    ),
+    "brightness_up": (
+        "increase brightness", "brightness up", "make the screen brighter", "brighten the screen",
+        "screen is too dark", "more light on the display", "brighten the display",
+        "monitor is too dim", "display brighter", "screen looks too dim", "brighten up the screen",
+    ),
+    "brightness_down": (
+        "decrease brightness", "brightness down", "dim the screen", "make the screen darker", "screen is too bright",
+        "lower the display brightness", "dim the display", "dim the monitor", "display darker",
+    ),
+    "joke": (
+        "tell me a joke", "make me laugh", "say something funny", "cheer me up with a joke", "know any jokes",
+        "joke sunao", "got a joke for me", "tell me something funny", "a good joke",
+    ),
+    "shutdown": (
+        "shutdown", "turn off the computer", "shut the laptop", "power off the pc", "switch off my computer",
+        "shut down the system", "turn the pc off", "switch off the laptop", "power down", "turn off my laptop",
+        "turn my computer off",
+    ),
+    "restart": (
+        "restart", "reboot the computer", "restart my laptop", "reboot the system", "restart the pc", "reboot pc",
+        "reboot my laptop",
+    ),
+    "persona_jarvis": (
+        "switch to jarvis mode", "be jarvis", "become jarvis", "formal mode", "talk like jarvis",
+    ),
+    "persona_friendly": (
+        "friendly mode", "back to normal", "be my friend again", "talk normally", "friend mode",
+    ),
+    "reset_chat": (
+        "reset chat", "start a fresh conversation", "forget this conversation", "clear the chat", "new conversation",
+    ),
+    "self_improve": (
+        "improve yourself", "learn from our chats", "optimize yourself", "get better from your mistakes",
+        "review your past conversations", "learn from your errors",
+    ),
+    FALLBACK_LABEL: (
+        "explain recursion simply", "i had a bad day", "who is alan turing", "how are you", "what should i cook",
+        "tell me about black holes", "i am feeling stressed", "write me a poem", "what is the meaning of life",
+        "how do i learn python", "recommend a movie", "why is the sky blue", "thank you", "good morning",
+        "what do you think about ai", "help me plan my day", "translate hello into french", "i'm bored",
+        "what can you do", "how far is the moon", "give me some advice", "do you like music",
+        "what time zone is japan in", "how does time dilation work", "what is the history of the internet",
+        "who wrote this famous song", "who writes the news for newspapers", "tell me something about space travel",
+        "remind me what a variable is", "remind me how photosynthesis works", "is it too loud to sing at night",
+        "why are concerts so loud", "how do speakers make sound", "what is the speed of light",
+        "how did the roman empire fall", "what is the time complexity of binary search", "what happened in the world war", "can you explain how email works",
+        "what does a cpu do", "what is a good name for a cat", "how do i become a better writer",
+    ),
+}
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+def _hash(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8")) & (INTENT_DIM - 1)
+
+def featurize(text: str) -> dict:
+    words = [w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS]
+    features = {}
+    for w in words:
+        idx = _hash("w:" + w)
+        features[idx] = features.get(idx, 0.0) + 1.0
+        padded = f"<{w}>"
+        for i in range(len(padded) - CHAR_GRAM + 1):
+            idx = _hash("c:" + padded[i:i + CHAR_GRAM])
+            features[idx] = features.get(idx, 0.0) + CHAR_WEIGHT
+    for a, b in zip(words, words[1:]):
+        idx = _hash(f"b:{a} {b}")
+        features[idx] = features.get(idx, 0.0) + BIGRAM_WEIGHT
+    return features
+
+def custom_command_examples(commands):
+    examples = {}
+    for cmd in commands:
+        trigger = (cmd.get("trigger") or "").strip().lower()
+        if not trigger:
+            continue
+        examples[f"custom:open:{trigger}"] = (f"open {trigger}", f"launch {trigger}", f"put {trigger} on", f"show me {trigger}")
+        if cmd.get("type") == "app":
+            examples[f"custom:close:{trigger}"] = (f"close {trigger}", f"exit {trigger}", f"kill {trigger}", f"shut {trigger}")
+    return examples
+
+def _rows(examples: dict):
+    labels, rows = [], []
+    for label, phrases in examples.items():
+        for phrase in phrases:
+            features = featurize(phrase)
+            if features:
+                labels.append(label)
+                rows.append(features)
+    return labels, rows
+
+def _idf(np, rows):
+    df = np.zeros(INTENT_DIM, dtype=np.float32)
+    for features in rows:
+        df[list(features)] += 1
+    return (np.log((len(rows) + 1) / (df + 1)) + 1).astype(np.float32)
+
+def sparse_dump(np, matrix):
+    rows, cols = np.nonzero(matrix)
+    return (
+        matrix.shape, rows.astype(np.int32).tobytes(), cols.astype(np.int32).tobytes(),
+        matrix[rows, cols].astype(np.float32).tobytes(),
+    )
+
+def sparse_load(np, data, out=None):
+    shape, rows, cols, values = data
+    if out is None:
+        out = np.zeros(shape, dtype=np.float32)
+    elif out.shape != tuple(shape):
+        raise ValueError(f"matrix shape {tuple(shape)} does not match {out.shape}")
+    out[np.frombuffer(rows, dtype=np.int32), np.frombuffer(cols, dtype=np.int32)] = np.frombuffer(values, dtype=np.float32)
+    return out
+
+class _Index:
+    def __init__(self, np, labels, rows, idf):
+        self.labels = labels
+        self.matrix = np.zeros((INTENT_DIM, len(rows)), dtype=np.float32)
+        for j, features in enumerate(rows):
+            for idx, weight in features.items():
+                self.matrix[idx, j] += weight
+        self.matrix *= idf[:, None]
+        norms = np.linalg.norm(self.matrix, axis=0)
+        self.matrix /= np.where(norms > 0, norms, 1.0)
+
+    @classmethod
+    def from_matrix(cls, labels, matrix):
+        index = cls.__new__(cls)
+        index.labels = labels
+        index.matrix = matrix
+        return index
+
+    def scores(self, idx, weights):
+        if not self.labels:
+            return None
+        return weights @ self.matrix[idx]
+
+class IntentClassifier:
+    def __init__(self, examples=None, threshold: float = INTENT_THRESHOLD, margin: float = INTENT_MARGIN):
+        self.examples = dict(INTENT_EXAMPLES if examples is None else examples)
+        self.threshold = threshold
+        self.margin = margin
+        self._np = None
+        self._base = None
+        self._idf = None
+        self._custom = None
+        self._custom_version = None
+        self._lock = threading.Lock()
+        self.enabled = True
+
+    def build(self):
+        with self._lock:
+            if self._base is not None or not self.enabled:
+                return self
+            try:
+                import numpy as np
+            except ImportError:
+                print("numpy not installed; intent classifier disabled.")
+                self.enabled = False
+                return self
+            self._np = np
+            labels, rows = _rows(self.examples)
+            self._idf = _idf(np, rows)
+            self._base = _Index(np, labels, rows, self._idf)
+        return self
+
+    def fingerprint(self) -> int:
+        return zlib.crc32(json.dumps([INTENT_DIM, self.examples], sort_keys=True).encode("utf-8"))
+
+    def snapshot(self):
+        with self._lock:
+            if self._base is None:
+                return None
+            np = self._np
+            return {
+                "fingerprint": self.fingerprint(), "labels": list(self._base.labels),
+                "matrix": sparse_dump(np, self._base.matrix), "idf": self._idf.tobytes(),
+            }
+
+    def restore(self, data) -> bool:
+        if not data or data.get("fingerprint") != self.fingerprint():
+            return False
+        try:
+            import numpy as np
+        except ImportError:
+            return False
+        with self._lock:
+            self._np = np
+            self._idf = np.frombuffer(data["idf"], dtype=np.float32).copy()
+            self._base = _Index.from_matrix(data["labels"], sparse_load(np, data["matrix"]))
+            self._custom = None
+            self._custom_version = None
+        return True
+
+    def _sync_commands(self, commands):
+        version = getattr(commands, "version", None)
+        if commands is None or (version is not None and version == self._custom_version):
+            return
+        with self._lock:
+            self._custom = _Index(self._np, *_rows(custom_command_examples(commands)), self._idf)
+            self._custom_version = version
+
+    def rank(self, text: str, commands=None):
+        if self._base is None:
+            self.build()
+        if not self.enabled:
+            return []
+        np = self._np
+        self._sync_commands(commands)
+        features = featurize(text)
+        if not features:
+            return []
+        idx = np.fromiter(features.keys(), dtype=np.intp, count=len(features))
+        weights = np.fromiter(features.values(), dtype=np.float32, count=len(features)) * self._idf[idx]
+        weights /= np.linalg.norm(weights)
+        best = {}
+        for index in (self._base, self._custom):
+            if index is None:
+                continue
+            scores = index.scores(idx, weights)
+            if scores is None:
+                continue
+            for j in np.argsort(scores)[::-1][:8]:
+                label = index.labels[j]
+                if label not in best or scores[j] > best[label]:
+                    best[label] = float(scores[j])
+        return sorted(best.items(), key=lambda kv: kv[1], reverse=True)
+
+    def classify(self, text: str, commands=None):
+        ranked = self.rank(text, commands)
+        if not ranked:
+            return None, 0.0
+        label, score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        threshold, margin = self.threshold, self.margin
+        if label in SIDE_EFFECT_INTENTS or label.startswith("custom:"):
+            threshold, margin = max(threshold, SIDE_EFFECT_THRESHOLD), max(margin, SIDE_EFFECT_MARGIN)
+        if label == FALLBACK_LABEL or score < threshold or score - runner_up < margin:
+            return None, score
+        return label, score
@@ -0,0 +1,322 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, CancelledError, wait
+
+from .tracing import span, tracer, current_turn
+
+INTERACTIVE = 0
+PHRASING = 1
+BACKGROUND = 2
+PRIORITY_NAMES = {INTERACTIVE: "interactive", PHRASING: "phrasing", BACKGROUND: "background"}
+
+MODEL_CONCURRENCY = {"llama3:8b": 1}
+DEFAULT_MODEL_CONCURRENCY = 1
+MAX_TOTAL_CONCURRENCY = 2
+MAX_BACKGROUND_CONCURRENCY = 1
+WAIT_WINDOW = 500
+DEFAULT_NUM_PREDICT = 256
+RESPONSE_STAT_KEYS = (
+    "model", "created_at", "done", "done_reason", "total_duration", "load_duration",
+    "prompt_eval_count", "prompt_eval_duration", "eval_count", "eval_duration", "context",
+)
+
+class LLMCancelled(Exception):
+    pass
+
+class _Progress:
+    def __init__(self, num_predict: int, on_token=None):
+        self.started = time.perf_counter()
+        self.tokens = 0
+        self.num_predict = num_predict
+        self.on_token = on_token
+
+    def token(self, piece: str):
+        self.tokens += 1
+        if self.on_token is not None and piece:
+            self.on_token(piece)
+
+class AsyncOllama:
+    def __init__(self):
+        self._loop = None
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True, name="ollama-async").start()
+                self._loop = loop
+        return self._loop
+
+    def _get_client(self):
+        if self._client is None:
+            import ollama
+            self._client = ollama.AsyncClient() if hasattr(ollama, "AsyncClient") else False
+        return self._client
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    async def _sync_fallback(self, fn_name, kwargs):
+        import ollama
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: getattr(ollama, fn_name)(**kwargs))
+
+    async def chat(self, progress: _Progress, **kwargs):
+        client = self._get_client()
+        if not client:
+            resp = await self._sync_fallback("chat", kwargs)
+            progress.token(resp["message"]["content"])
+            return resp
+        parts = []
+        final = None
+        async for chunk in await client.chat(stream=True, **kwargs):
+            parts.append(chunk["message"]["content"])
+            progress.token(chunk["message"]["content"])
+            final = chunk
+        resp = {k: final.get(k) for k in RESPONSE_STAT_KEYS} if final is not None else {}
+        resp["message"] = {"role": "assistant", "content": "".join(parts)}
+        return resp
+
+    async def generate(self, progress: _Progress, **kwargs):
+        client = self._get_client()
+        if not client:
+            resp = await self._sync_fallback("generate", kwargs)
+            progress.token(resp["response"])
+            return resp
+        parts = []
+        final = None
+        async for chunk in await client.generate(stream=True, **kwargs):
+            parts.append(chunk["response"])
+            progress.token(chunk["response"])
+            final = chunk
+        resp = {k: final.get(k) for k in RESPONSE_STAT_KEYS} if final is not None else {}
+        resp["response"] = "".join(parts)
+        return resp
+
+class _Request:
+    def __init__(self, priority: int, seq: int, model: str):
+        self.priority = priority
+        self.seq = seq
+        self.model = model
+        self.enqueued = time.perf_counter()
+
+class LLMScheduler:
+    def __init__(self, model_limits=None, default_limit=DEFAULT_MODEL_CONCURRENCY,
+                 max_total=MAX_TOTAL_CONCURRENCY, max_background=MAX_BACKGROUND_CONCURRENCY):
+        self.model_limits = dict(MODEL_CONCURRENCY if model_limits is None else model_limits)
+        self.default_limit = default_limit
+        self.max_total = max_total
+        self.max_background = max_background
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting = []
+        self._active = defaultdict(int)
+        self._active_total = 0
+        self._active_background = 0
+        self._inflight = {}
+        self._waits = defaultdict(lambda: deque(maxlen=WAIT_WINDOW))
+        self._durations = {}
+        self.counters = defaultdict(int)
+        self.usage_hooks = []
+
+    def _limit(self, model: str) -> int:
+        return self.model_limits.get(model, self.default_limit)
+
+    def _eligible(self, req: _Request) -> bool:
+        if self._active_total >= self.max_total:
+            return False
+        if self._active[req.model] >= self._limit(req.model):
+            return False
+        if req.priority == BACKGROUND and self._active_background >= self.max_background:
+            return False
+        return True
+
+    def _next_admissible(self):
+        best = None
+        for req in self._waiting:
+            if best is not None and (req.priority, req.seq) >= (best.priority, best.seq):
+                continue
+            if self._eligible(req):
+                best = req
+        if best is not None and best.priority == BACKGROUND:
+            if any(r.priority < BACKGROUND for r in self._waiting):
+                return None
+        return best
+
+    def _count(self, key: str, amount: int = 1):
+        with self._cond:
+            self.counters[key] += amount
+
+    def _wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def _acquire(self, model: str, priority: int, turn=None):
+        req = _Request(priority, next(self._seq), model)
+        wake = turn.on_cancel(self._wake) if turn is not None else None
+        try:
+            with self._cond:
+                self._waiting.append(req)
+                while self._next_admissible() is not req:
+                    if turn is not None and turn.cancelled.is_set():
+                        self._waiting.remove(req)
+                        self._cond.notify_all()
+                        raise LLMCancelled("cancelled while queued")
+                    self._cond.wait()
+                self._waiting.remove(req)
+                self._active[model] += 1
+                self._active_total += 1
+                if priority == BACKGROUND:
+                    self._active_background += 1
+                self._cond.notify_all()
+        finally:
+            if wake is not None:
+                turn.remove_cancel_callback(wake)
+        wait_ms = (time.perf_counter() - req.enqueued) * 1000.0
+        self._waits[priority].append(wait_ms)
+        tracer.record(f"llm.queue.{PRIORITY_NAMES.get(priority, priority)}", wait_ms)
+        return wait_ms
+
+    def _release(self, model: str, priority: int):
+        with self._cond:
+            self._active[model] -= 1
+            self._active_total -= 1
+            if priority == BACKGROUND:
+                self._active_background -= 1
+            self._cond.notify_all()
+
+    def run(self, kind: str, model: str, priority: int, call, coalesce_key=None):
+        turn = current_turn()
+        self._count(f"submitted.{PRIORITY_NAMES.get(priority, priority)}")
+        while coalesce_key is not None:
+            with self._cond:
+                future = self._inflight.get(coalesce_key)
+                if future is None:
+                    self._inflight[coalesce_key] = Future()
+                    break
+            self._count("coalesced")
+            try:
+                with span(f"llm.{kind}", model=model, coalesced=True):
+                    return self._wait_follower(future, turn)
+            except LLMCancelled:
+                if turn is not None and turn.cancelled.is_set():
+                    raise
+
+        result = None
+        for begin, _ in self.usage_hooks:
+            begin(model)
+        try:
+            try:
+                wait_ms = self._acquire(model, priority, turn)
+                try:
+                    with span(f"llm.{kind}", model=model, priority=PRIORITY_NAMES.get(priority, priority), queue_ms=round(wait_ms, 1)):
+                        result = call(turn)
+                finally:
+                    self._release(model, priority)
+            finally:
+                for _, end in self.usage_hooks:
+                    end(model, result)
+        except BaseException as e:
+            self._count("cancelled" if isinstance(e, LLMCancelled) else "failed")
+            if coalesce_key is not None:
+                self._finish(coalesce_key, error=e)
+            raise
+
+        self._count("completed")
+        if coalesce_key is not None:
+            self._finish(coalesce_key, result=result)
+        return result
+
+    def _wait_follower(self, future, turn):
+        if turn is None:
+            return future.result()
+        while not future.done():
+            if turn.cancelled.is_set():
+                raise LLMCancelled("cancelled while waiting for a coalesced request")
+            wait([future], timeout=0.05)
+        return future.result()
+
+    def observe_duration(self, kind: str, model: str, seconds: float):
+        key = (kind, model)
+        old = self._durations.get(key)
+        self._durations[key] = seconds if old is None else 0.8 * old + 0.2 * seconds
+
+    def record_cancellation(self, kind: str, model: str, progress: _Progress):
+        elapsed = time.perf_counter() - progress.started
+        if progress.tokens > 5:
+            remaining = max(0, progress.num_predict - progress.tokens)
+            saved = remaining * elapsed / progress.tokens
+        else:
+            saved = max(0.0, self._durations.get((kind, model), 0.0) - elapsed)
+        self._count("cancel_saved_ms", int(saved * 1000))
+        tracer.record("llm.cancel_saved", saved * 1000)
+        return saved
+
+    def _finish(self, key, result=None, error=None):
+        with self._cond:
+            future = self._inflight.pop(key, None)
+        if future is None:
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def stats(self) -> dict:
+        waits = {}
+        for priority, values in list(self._waits.items()):
+            ordered = sorted(values)
+            if not ordered:
+                continue
+            waits[PRIORITY_NAMES.get(priority, str(priority))] = {
+                "count": len(ordered),
+                "p50_ms": round(ordered[len(ordered) // 2], 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+                "max_ms": round(ordered[-1], 1),
+            }
+        with self._cond:
+            queued = len(self._waiting)
+            active = self._active_total
+            counters = dict(self.counters)
+        return {"queued": queued, "active": active, "queue_wait": waits, "counters": counters}
+
+scheduler = LLMScheduler()
+backend = AsyncOllama()
+
+def _key(kind: str, model: str, payload: dict) -> str:
+    return kind + "|" + model + "|" + json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+
+def _call(kind: str, model: str, kwargs: dict, on_token=None):
+    def call(turn):
+        num_predict = (kwargs.get("options") or {}).get("num_predict") or DEFAULT_NUM_PREDICT
+        progress = _Progress(num_predict, on_token)
+        coro = getattr(backend, kind)(progress, model=model, **kwargs)
+        future = backend.submit(coro)
+        cancel = None
+        if turn is not None:
+            cancel = turn.on_cancel(future.cancel)
+        try:
+            result = future.result()
+        except CancelledError:
+            scheduler.record_cancellation(kind, model, progress)
+            raise LLMCancelled(f"{kind} on {model} was cancelled")
+        finally:
+            if cancel is not None:
+                turn.remove_cancel_callback(cancel)
+        scheduler.observe_duration(kind, model, time.perf_counter() - progress.started)
+        return result
+    return call
+
+def chat(model: str, messages, priority: int = INTERACTIVE, on_token=None, **kwargs):
+    key = None if on_token else _key("chat", model, {"messages": messages, **kwargs})
+    return scheduler.run("chat", model, priority, _call("chat", model, {"messages": messages, **kwargs}, on_token), coalesce_key=key)
+
+def generate(model: str, prompt: str, priority: int = PHRASING, on_token=None, **kwargs):
+    key = None if on_token else _key("generate", model, {"prompt": prompt, **kwargs})
+    return scheduler.run("generate", model, priority, _call("generate", model, {"prompt": prompt, **kwargs}, on_token), coalesce_key=key)
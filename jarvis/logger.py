@@ -2,6 +2,7 @@
 import json
 import time
 from jarvis.paths import paths
+from jarvis.tracing import current_turn
 
 def log_episode(query: str,
                 reply: str,
@@ -17,6 +18,11 @@ def log_episode(query: str,
         "notes": notes,
     }
 
+    turn = current_turn()
+    if turn is not None:
+        record.update(turn.trace())
+        turn.logged = True
+
     try:
         with open(paths.episode_log, "a", encoding="utf-8") as f:
             f.write(json.dumps(record, ensure_ascii=False) + "\n")
@@ -1,7 +1,7 @@
 
-import os
+import itertools
 from dataclasses import dataclass, field
-from .paths import paths
+from .facts import get_fact_store
 
 BASE_SYSTEM_PROMPT = (
     "You are speaking to your user. "
@@ -53,6 +53,9 @@ Adopt the personality of Jarvis from Iron Man:
 - Prefer concrete output: steps, bullet points, or exact values.
 """.strip()
 
+NO_FACTS_TEXT = "No facts saved yet.\n"
+_prompt_versions = itertools.count(1)
+
 @dataclass
 class MemoryState:
     system_prompt: str = BASE_SYSTEM_PROMPT + "\n\n" + FRIENDLY_PERSONA_PROMPT
@@ -60,64 +63,54 @@ class MemoryState:
     current_persona: str = "friendly"
     evolution_append: str = ""
     user_name: str = ""
+    facts_block: str = NO_FACTS_TEXT
+    prompt_version: int = field(default_factory=lambda: next(_prompt_versions))
 
-    def rebuild_prompt(self):
-        if self.current_persona == "friendly":
-            persona_block = FRIENDLY_PERSONA_PROMPT
-        else:
-            persona_block = JARVIS_PERSONA_PROMPT
-
-        self.system_prompt = BASE_SYSTEM_PROMPT + "\n\n" + persona_block
+    def compose_prompt(self) -> str:
+        persona_block = FRIENDLY_PERSONA_PROMPT if self.current_persona == "friendly" else JARVIS_PERSONA_PROMPT
+        prompt = BASE_SYSTEM_PROMPT + self.facts_block + "\n\n" + persona_block
         if self.evolution_append:
-            self.system_prompt += "\n\n" + self.evolution_append
+            prompt += "\n\n" + self.evolution_append
+        return prompt
 
+    def _set_prompt(self, prompt: str):
+        if prompt != self.system_prompt:
+            self.system_prompt = prompt
+            self.prompt_version = next(_prompt_versions)
+
+    def rebuild_prompt(self):
+        self._set_prompt(self.compose_prompt())
         self.chat_history = [{"role": "system", "content": self.system_prompt}]
 
-def load_memory(state: MemoryState):
-    state.user_name = ""
-    facts_found = False
-    system_prompt = BASE_SYSTEM_PROMPT
+    def refresh_prompt(self):
+        self._set_prompt(self.compose_prompt())
+        if self.chat_history and self.chat_history[0].get("role") == "system":
+            self.chat_history[0] = {"role": "system", "content": self.system_prompt}
+
+    def set_facts(self, store):
+        self.facts_block = store.block() or NO_FACTS_TEXT
+        self.user_name = store.get("name") or ""
 
+def load_memory(state: MemoryState):
     try:
-        if os.path.exists(paths.memory_file):
-            with open(paths.memory_file, "r", encoding="utf-8") as f:
-                facts = f.read()
-            if facts:
-                system_prompt += facts
-                facts_found = True
-
-                for line in facts.splitlines():
-                    if "user's name is" in line.lower():
-                        name = line.split(" is ")[-1].strip().replace(".", "")
-                        state.user_name = name
-        if not facts_found:
-            system_prompt += "No facts saved yet.\n"
+        state.set_facts(get_fact_store())
     except Exception as e:
         print(f"Error loading memory: {e}")
-        system_prompt += "No facts saved due to an error.\n"
-
-    state.system_prompt = system_prompt + "\n\n" + (
-        FRIENDLY_PERSONA_PROMPT if state.current_persona == "friendly" else JARVIS_PERSONA_PROMPT
-    )
-    if state.evolution_append:
-        state.system_prompt += "\n\n" + state.evolution_append
-
-    state.chat_history = [{"role": "system", "content": state.system_prompt}]
+        state.facts_block = "No facts saved due to an error.\n"
+    state.rebuild_prompt()
 
-def remember_fact(raw_query: str):
+def remember_fact(raw_query: str, state: MemoryState | None = None):
     fact = raw_query.replace("arjun remember", "").replace("remember this", "").strip()
     if not fact:
         return False, "What would you like me to remember?"
 
     try:
-        if "my name is" in fact:
-            clear_fact = f"- The user's name is {fact.split('my name is')[-1].strip()}\n"
-        else:
-            clear_fact = f"- The user told you to remember: {fact}\n"
-
-        with open(paths.memory_file, "a", encoding="utf-8") as f:
-            f.write(clear_fact)
-        return True, "Okay, I'll remember that."
+        store = get_fact_store()
+        _, changed = store.remember(fact)
+        if changed and state is not None:
+            state.set_facts(store)
+            state.refresh_prompt()
+        return True, "Okay, I'll remember that." if changed else "I already know that."
     except Exception as e:
         print(f"Error saving memory: {e}")
         return False, "Sorry, I had trouble remembering that."
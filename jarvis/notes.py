@@ -0,0 +1,165 @@
+import datetime
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .paths import paths
+
+LEGACY_LINE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}): (.*)$")
+SEARCH_STOPWORDS = {
+    "find", "search", "show", "read", "my", "me", "the", "a", "an", "note", "notes", "about", "on", "from",
+    "for", "in", "of", "with", "any", "all", "what", "did", "i", "write", "wrote", "regarding", "related", "to",
+    "mentioning", "mentions", "mention", "containing", "contains", "that",
+}
+_WORD_RE = re.compile(r"[\w']+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notes_ts ON notes (ts);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(text, content='notes', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+def search_terms(text: str):
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in SEARCH_STOPWORDS]
+
+class NotesStore:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = None
+        self.fts = False
+
+    def open(self, legacy_file: str | None = None):
+        with self._lock:
+            if self._conn is not None:
+                return self
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+            try:
+                self._conn.executescript(FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError as e:
+                print(f"FTS5 unavailable, note search falls back to LIKE: {e}")
+            migrated = self._conn.execute("SELECT value FROM meta WHERE key = 'legacy_migrated'").fetchone()
+            if not migrated and legacy_file and os.path.exists(legacy_file):
+                self._migrate(legacy_file)
+        return self
+
+    def _migrate(self, legacy_file: str):
+        rows = []
+        with open(legacy_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if not line.strip():
+                    continue
+                m = LEGACY_LINE_RE.match(line)
+                if m:
+                    ts = datetime.datetime.strptime(m.group(1), "%Y-%m-%d %H:%M:%S").timestamp()
+                    rows.append((ts, m.group(2)))
+                elif rows:
+                    rows[-1] = (rows[-1][0], rows[-1][1] + "\n" + line)
+                else:
+                    rows.append((os.path.getmtime(legacy_file), line))
+        with self._conn:
+            self._conn.executemany("INSERT INTO notes (ts, text) VALUES (?, ?)", rows)
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_migrated', ?)", (str(time.time()),))
+        print(f"Migrated {len(rows)} notes from {os.path.basename(legacy_file)}.")
+
+    def add(self, text: str, ts: float | None = None) -> int:
+        with self._lock, self._conn:
+            cur = self._conn.execute("INSERT INTO notes (ts, text) VALUES (?, ?)", (ts or time.time(), text))
+            return cur.lastrowid
+
+    def add_many(self, rows):
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT INTO notes (ts, text) VALUES (?, ?)", rows)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    @staticmethod
+    def _range_sql(start, end, column="ts"):
+        clauses, args = [], []
+        if start is not None:
+            clauses.append(f"{column} >= ?")
+            args.append(start)
+        if end is not None:
+            clauses.append(f"{column} < ?")
+            args.append(end)
+        return clauses, args
+
+    def latest(self, limit: int = 5, offset: int = 0, start: float | None = None, end: float | None = None):
+        clauses, args = self._range_sql(start, end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT id, ts, text FROM notes {where} ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?",
+                (*args, limit, offset),
+            ).fetchall()
+
+    def count_range(self, start: float | None = None, end: float | None = None) -> int:
+        clauses, args = self._range_sql(start, end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM notes {where}", args).fetchone()[0]
+
+    def search(self, text: str, limit: int = 5, start: float | None = None, end: float | None = None):
+        terms = search_terms(text)
+        if not terms:
+            return self.latest(limit, start=start, end=end)
+        with self._lock:
+            if self.fts:
+                match = " ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+                clauses, args = self._range_sql(start, end, "n.ts")
+                extra = "".join(f" AND {c}" for c in clauses)
+                return self._conn.execute(
+                    "SELECT n.id, n.ts, n.text FROM notes_fts JOIN notes n ON n.id = notes_fts.rowid "
+                    f"WHERE notes_fts MATCH ?{extra} ORDER BY bm25(notes_fts), n.ts DESC LIMIT ?",
+                    (match, *args, limit),
+                ).fetchall()
+            clauses, args = self._range_sql(start, end)
+            for t in terms:
+                clauses.append("text LIKE ?")
+                args.append(f"%{t}%")
+            return self._conn.execute(
+                f"SELECT id, ts, text FROM notes WHERE {' AND '.join(clauses)} ORDER BY ts DESC LIMIT ?",
+                (*args, limit),
+            ).fetchall()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_notes_store() -> NotesStore:
+    with _stores_lock:
+        store = _stores.get(paths.notes_db)
+        if store is None:
+            store = NotesStore(paths.notes_db)
+            _stores[paths.notes_db] = store
+    return store.open(paths.notes_file)
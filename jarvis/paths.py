@@ -11,11 +11,21 @@ class Paths:
     PROJECT_DIR: str = PROJECT_DIR
 
     memory_file: str = os.path.join(PROJECT_DIR, "arjun_memory.txt")
+    facts_db: str = os.path.join(PROJECT_DIR, "arjun_facts.db")
     commands_file: str = os.path.join(PROJECT_DIR, "custom_commands.json")
     notes_file: str = os.path.join(PROJECT_DIR, "notes.txt")
+    notes_db: str = os.path.join(PROJECT_DIR, "notes.db")
+    contacts_dir: str = os.path.join(PROJECT_DIR, "contacts")
     episode_log: str = os.path.join(PROJECT_DIR, "episodes.jsonl")
+    recall_db: str = os.path.join(PROJECT_DIR, "recall.db")
+    residency_log: str = os.path.join(PROJECT_DIR, "residency.jsonl")
+    sysmon_export: str = os.path.join(PROJECT_DIR, "sysmon.csv")
     improvements_file: str = os.path.join(PROJECT_DIR, "improvements.txt")
+    improve_checkpoint: str = os.path.join(PROJECT_DIR, "improve_checkpoint.json")
+    snapshot_file: str = os.path.join(PROJECT_DIR, ".cache", "assistant_state.snap")
     openai_dir: str = os.path.join(PROJECT_DIR, "Openai")
     assistant_gif: str = os.path.join(PROJECT_DIR, "assistant.gif")
+    cache_dir: str = os.path.join(PROJECT_DIR, ".cache")
+    frame_cache_dir: str = os.path.join(PROJECT_DIR, ".cache", "frames")
 
 paths = Paths()
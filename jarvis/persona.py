@@ -0,0 +1,216 @@
+import re
+
+STIFF_PREFIXES = ("Dear sir", "Greetings", "Hello sir")
+EMOTIONAL_CUES = ("sad", "stress", "stressed", "low", "anxious", "anxiety", "upset", "tired", "lonely", "hurt", "depressed", "bad day")
+ONE_WORD_ALLOW = ("one word", "single word", "just one word", "yes or no", "only yes or no")
+SHORT_REPLY_MAX_WORDS = 4
+LONG_REPLY_MIN_WORDS = 10
+RECIPE_MAX_WORDS = 30
+RECIPE_CUES = ("recipe", "how to make", "make", "cook", "cooking", "sandwich", "anda", "egg")
+GENERIC_REPLY_CUES = ("i will", "with you", "sure", "okay", "ok", "done", "let's do it", "ill do it", "i'll do it")
+EXPLAIN_CUES = ("what", "why", "how", "kaise", "kya", "kyu", "explain")
+PLAN_CUES = ("plan", "career", "job", "study", "exam", "project", "help")
+JARVIS_FLUFF_PREFIXES = (
+    "absolutely",
+    "certainly",
+    "of course",
+    "great question",
+    "that's a great question",
+    "i'd be happy to",
+    "sure",
+)
+JARVIS_FLUFF_PHRASES = (
+    "that is a great question",
+    "i hope this helps",
+    "let me know if you need anything else",
+    "if you want, i can",
+    "feel free to ask",
+)
+
+RECIPE_REPLY = (
+    "Perfect, egg sandwich banate hain. Quick recipe: 1) 2 ande bowl me todkar namak, kali mirch, thoda chopped pyaz mirchi mix karo. "
+    "2) Pan me thoda butter daalke mixture ko scramble ya omelette style paka lo. "
+    "3) 2 bread slices ko butter ke sath light toast karo. "
+    "4) Bread par mayo ya chutney lagao, egg filling rakho, chahe to cheese/tomato add karo, phir close karke 1 minute press-toast karo. "
+    "5) Half cut karke garam serve karo. Chahe to main spicy ya healthy version bhi bata du."
+)
+DEFAULT_TAIL = "Tu chahe to main thoda detail me samjha du ya next step bata du?"
+EXPLAIN_TAIL = "Agar bole to main isko simple aur clear way me step-by-step explain kar deta hu."
+PLAN_TAIL = "Chal isko easy banate hain, main abhi 2-3 practical steps de deta hu."
+SUPPORT_TAIL = "Koi na, main tere sath hu, I will support you. Tu chahe to bata kya hua, ya main abhi ek chhota next step suggest kar du?"
+
+def _any_of(cues):
+    return re.compile("|".join(re.escape(c) for c in cues))
+
+_RECIPE_RE = _any_of(RECIPE_CUES)
+_GENERIC_RE = _any_of(GENERIC_REPLY_CUES)
+_ONE_WORD_RE = _any_of(ONE_WORD_ALLOW)
+_EMOTIONAL_RE = _any_of(EMOTIONAL_CUES)
+_EXPLAIN_RE = _any_of(EXPLAIN_CUES)
+_PLAN_RE = _any_of(PLAN_CUES)
+
+_FLUFF_LEAD_RE = re.compile(r"^[^,.!?]*[,.!?]\s*")
+_FLUFF_PHRASE_RES = tuple(re.compile(rf"\b{re.escape(p)}\b[,.!?\s]*", re.IGNORECASE) for p in JARVIS_FLUFF_PHRASES)
+_STIFF_PREFIXES = tuple((p.lower(), len(p)) for p in STIFF_PREFIXES)
+_HONORIFIC_RE = re.compile(r"^(sir|madam|dear)\b[,:\s-]*", re.IGNORECASE)
+_WS_RE = re.compile(r"\s+")
+# A safe cut sits right after the whitespace that follows a sentence end, in
+# front of a character the fluff-phrase regexes would not swallow. Nothing any
+# rule matches can straddle such a point, so chunks style independently.
+_CUT_RE = re.compile(r"[.!?][,.!?\s]*(?<=\s)(?=[^,.!?\s])")
+_SAFE_END_RE = re.compile(r"[.!?]\s*$")
+
+def enrich_friendly_reply(query_lower: str, reply: str) -> str:
+    words = len(reply.split())
+    if _RECIPE_RE.search(query_lower) and (words < RECIPE_MAX_WORDS or _GENERIC_RE.search(reply.lower().strip())):
+        return RECIPE_REPLY
+
+    if words > LONG_REPLY_MIN_WORDS:
+        return reply
+    if _ONE_WORD_RE.search(query_lower):
+        return reply
+    if not _EMOTIONAL_RE.search(query_lower):
+        if words > SHORT_REPLY_MAX_WORDS:
+            return reply
+        tail = DEFAULT_TAIL
+        if _EXPLAIN_RE.search(query_lower):
+            tail = EXPLAIN_TAIL
+        elif _PLAN_RE.search(query_lower):
+            tail = PLAN_TAIL
+        if reply and reply[-1] not in ".!?":
+            reply += "."
+        return f"{reply} {tail}"
+    if reply and reply[-1] not in ".!?":
+        reply += "."
+    return f"{reply} {SUPPORT_TAIL}"
+
+class PersonaFilter:
+    def __init__(self, persona: str, query_lower: str | None = None):
+        self.jarvis = persona == "jarvis"
+        self.query_lower = query_lower if not self.jarvis else None
+        self._recipe = self.query_lower is not None and bool(_RECIPE_RE.search(self.query_lower))
+        self._buf = ""
+        self._head = ""
+        self._head_done = False
+        self._carry = ""
+        self._started = False
+        self._pending_ws = ""
+        self._last_char = ""
+        self._saw_text = False
+        self._held = ""
+        self._passing = self.query_lower is None
+
+    def feed(self, text: str) -> str:
+        if not text:
+            return ""
+        self._buf += text
+        cut = 0
+        for m in _CUT_RE.finditer(self._buf):
+            cut = m.end()
+        if not cut:
+            return ""
+        chunk, self._buf = self._buf[:cut], self._buf[cut:]
+        return self._enrich(self._style(chunk, False), False)
+
+    def finish(self) -> str:
+        chunk, self._buf = self._buf, ""
+        out = self._style(chunk, True)
+        if self.jarvis and self._saw_text:
+            if not self._started:
+                out += self._emit("Done.")
+            if self._last_char not in ".!?":
+                out += "."
+                self._last_char = "."
+        return self._enrich(out, True)
+
+    def _style(self, chunk: str, final: bool) -> str:
+        if not self._head_done:
+            self._head += chunk
+            head = self._head.lstrip()
+            if not head:
+                return ""
+            self._saw_text = True
+            body = self._strip_head(head, final)
+            if body is None:
+                return ""
+            self._head_done = True
+            self._head = ""
+            chunk = body
+        if self.jarvis:
+            chunk = self._carry + chunk
+            styled = chunk
+            for pattern in _FLUFF_PHRASE_RES:
+                styled = pattern.sub("", styled)
+            styled = _WS_RE.sub(" ", styled)
+            if not final and styled and not _SAFE_END_RE.search(styled):
+                self._carry = chunk
+                return ""
+            self._carry = ""
+            chunk = styled
+        return self._emit(chunk)
+
+    def _strip_head(self, head: str, final: bool):
+        if self.jarvis:
+            if head.lower().startswith(JARVIS_FLUFF_PREFIXES):
+                m = _FLUFF_LEAD_RE.match(head)
+                if m:
+                    rest = head[m.end():]
+                    if rest.strip():
+                        return rest
+                    if not final:
+                        return None
+            return head
+        low = head.lower()
+        for prefix, n in _STIFF_PREFIXES:
+            if low.startswith(prefix):
+                head = head[n:].lstrip(" ,.")
+                break
+        head = _HONORIFIC_RE.sub("", head).lstrip()
+        if not head and not final:
+            return None
+        return head
+
+    def _emit(self, piece: str) -> str:
+        if not self._started:
+            piece = piece.lstrip()
+            if not piece:
+                return ""
+            self._started = True
+            if self.jarvis and not piece.lower().startswith("sir"):
+                piece = "Sir, " + piece[0].lower() + piece[1:]
+        core = piece.rstrip()
+        if not core:
+            self._pending_ws += piece
+            return ""
+        out = self._pending_ws + core
+        self._pending_ws = piece[len(core):]
+        self._last_char = core[-1]
+        return out
+
+    def _enrich(self, out: str, final: bool) -> str:
+        if self._passing:
+            return out
+        self._held += out
+        if final:
+            self._passing = True
+            held, self._held = self._held, ""
+            return enrich_friendly_reply(self.query_lower, held)
+        if not self._recipe and len(self._held.split()) > LONG_REPLY_MIN_WORDS:
+            self._passing = True
+            held, self._held = self._held, ""
+            return held
+        return ""
+
+def style_reply(reply: str, persona: str) -> str:
+    styler = PersonaFilter(persona)
+    return styler.feed(reply) + styler.finish()
+
+def style_stream(pieces, persona: str, query_lower: str | None = None):
+    styler = PersonaFilter(persona, query_lower)
+    for piece in pieces:
+        out = styler.feed(piece)
+        if out:
+            yield out
+    out = styler.finish()
+    if out:
+        yield out
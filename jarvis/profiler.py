@@ -0,0 +1,121 @@
+import importlib.abc
+import sys
+import threading
+import time
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, profiler, loader, name):
+        self._profiler = profiler
+        self._loader = loader
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = self._profiler._stack()
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += total
+            self._profiler._record_import(self._name, total, total - nested, len(stack))
+
+    def __getattr__(self, item):
+        return getattr(self._loader, item)
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(self._profiler, spec.loader, fullname)
+                return spec
+        return None
+
+class StartupProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.t0 = time.perf_counter()
+        self.imports = []
+        self.phases = []
+        self._local = threading.local()
+        self._finder = None
+        self._lock = threading.Lock()
+
+    def install(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.t0 = time.perf_counter()
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record_import(self, name, total, self_time, depth):
+        with self._lock:
+            self.imports.append((name, total, self_time, depth))
+
+    def phase(self, name: str):
+        return _Phase(self, name)
+
+    def mark(self, name: str):
+        if self.enabled:
+            with self._lock:
+                self.phases.append((name, time.perf_counter() - self.t0, 0.0))
+
+    def report(self, top: int = 15) -> str:
+        lines = ["=== Startup profile ==="]
+        with self._lock:
+            imports = list(self.imports)
+        roots = [i for i in imports if i[3] == 0]
+        lines.append(f"Top-level imports ({sum(i[1] for i in roots) * 1000:.0f} ms total):")
+        for name, total, _, _ in sorted(roots, key=lambda i: i[1], reverse=True)[:top]:
+            lines.append(f"  {total * 1000:8.1f} ms  {name}")
+        lines.append("Slowest modules (self time):")
+        for name, _, self_time, _ in sorted(imports, key=lambda i: i[2], reverse=True)[:top]:
+            lines.append(f"  {self_time * 1000:8.1f} ms  {name}")
+        lines.append("Phases (since start / duration):")
+        with self._lock:
+            for name, at, duration in self.phases:
+                lines.append(f"  {at * 1000:8.1f} ms  {duration * 1000:8.1f} ms  {name}")
+        return "\n".join(lines)
+
+class _Phase:
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        p = self._profiler
+        if p.enabled:
+            end = time.perf_counter()
+            with p._lock:
+                p.phases.append((self._name, end - p.t0, end - self._start))
+        return False
+
+profiler = StartupProfiler()
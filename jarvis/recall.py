@@ -0,0 +1,211 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+
+from .notes import SEARCH_STOPWORDS
+from .paths import paths
+
+RECALL_HANDLER = "recall"
+SYNC_BATCH = 5000
+HEAD_BYTES = 256
+RECENT_WINDOW = 20000
+WINDOW_GROWTH = 8
+OPTIMIZE_AFTER = 50000
+QUERY_WEIGHT = 2.0
+REPLY_WEIGHT = 1.0
+RECALL_STOPWORDS = SEARCH_STOPWORDS | {
+    "ask", "asked", "asking", "you", "we", "us", "talk", "talked", "talking", "tell", "told", "say", "said",
+    "when", "was", "were", "that", "time", "conversation", "conversations", "remind", "recall", "remember",
+    "maine", "tumse", "kya", "pucha", "poocha", "tha", "baat", "ki", "ke", "baare", "mein",
+}
+_WORD_RE = re.compile(r"[\w']+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    handler TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS episodes_ts ON episodes (ts);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS episodes_fts USING fts5(query, reply, content='', tokenize='unicode61 remove_diacritics 2');
+"""
+
+def recall_terms(text: str):
+    words = (w for w in _WORD_RE.findall(text.lower()) if w not in RECALL_STOPWORDS)
+    return [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w for w in words]
+
+class RecallIndex:
+    def __init__(self, db_path: str, log_path: str):
+        self.db_path = db_path
+        self.log_path = log_path
+        self._lock = threading.RLock()
+        self._conn = None
+
+    def open(self):
+        with self._lock:
+            if self._conn is None:
+                os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._conn.executescript(SCHEMA)
+        return self
+
+    def _meta(self, key: str, default: str = "") -> str:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _reset(self):
+        with self._conn:
+            self._conn.execute("DELETE FROM episodes")
+            self._conn.execute("INSERT INTO episodes_fts (episodes_fts) VALUES ('delete-all')")
+            self._conn.execute("DELETE FROM meta")
+
+    def _insert(self, rows, offset: int):
+        with self._conn:
+            cur = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM episodes")
+            next_id = cur.fetchone()[0] + 1
+            ids = range(next_id, next_id + len(rows))
+            self._conn.executemany(
+                "INSERT INTO episodes (id, ts, handler, offset, length) VALUES (?, ?, ?, ?, ?)",
+                [(i, ts, handler, pos, length) for i, (ts, handler, pos, length, _, _) in zip(ids, rows)],
+            )
+            self._conn.executemany(
+                "INSERT INTO episodes_fts (rowid, query, reply) VALUES (?, ?, ?)",
+                [(i, query, reply) for i, (_, _, _, _, query, reply) in zip(ids, rows)],
+            )
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('offset', ?)", (str(offset),))
+
+    def sync(self) -> int:
+        if not os.path.exists(self.log_path):
+            return 0
+        with self._lock:
+            self.open()
+            size = os.path.getsize(self.log_path)
+            with open(self.log_path, "rb") as f:
+                head = f.read(HEAD_BYTES).hex()
+            offset = int(self._meta("offset", "0"))
+            if size < offset or (offset and self._meta("head") != head[:offset * 2]):
+                self._reset()
+                offset = 0
+            if size == offset:
+                return 0
+            added = 0
+            rows = []
+            with open(self.log_path, "rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    pos, offset = offset, offset + len(raw)
+                    try:
+                        ep = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if not isinstance(ep, dict) or ep.get("handler") == RECALL_HANDLER:
+                        continue
+                    query = str(ep.get("query") or "")
+                    if not query:
+                        continue
+                    rows.append((float(ep.get("ts") or 0.0), str(ep.get("handler") or ""), pos, len(raw), query, str(ep.get("assistant_reply") or "")))
+                    if len(rows) >= SYNC_BATCH:
+                        self._insert(rows, offset)
+                        added += len(rows)
+                        rows = []
+            self._insert(rows, offset)
+            added += len(rows)
+            with self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('head', ?)", (head[:offset * 2],))
+                if added >= OPTIMIZE_AFTER:
+                    self._conn.execute("INSERT INTO episodes_fts (episodes_fts) VALUES ('optimize')")
+            return added
+
+    def count(self) -> int:
+        with self._lock:
+            self.open()
+            return self._conn.execute("SELECT COUNT(*) FROM episodes").fetchone()[0]
+
+    def _load(self, offset: int, length: int):
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            try:
+                return json.loads(f.read(length))
+            except ValueError:
+                return None
+
+    def _id_bounds(self, start: float | None, end: float | None):
+        clauses, args = [], []
+        if start is not None:
+            clauses.append("ts >= ?")
+            args.append(start)
+        if end is not None:
+            clauses.append("ts < ?")
+            args.append(end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._conn.execute(
+            f"SELECT (SELECT MIN(id) FROM episodes {where}), (SELECT MAX(id) FROM episodes {where})", args * 2,
+        ).fetchone()
+
+    def _match(self, match: str, lo: int, hi: int, limit: int):
+        window = RECENT_WINDOW
+        while True:
+            first = max(lo, hi - window + 1)
+            ids = self._conn.execute(
+                "SELECT rowid FROM episodes_fts WHERE episodes_fts MATCH ? AND rowid BETWEEN ? AND ? "
+                f"ORDER BY bm25(episodes_fts, {QUERY_WEIGHT}, {REPLY_WEIGHT}), rowid DESC LIMIT ?",
+                (match, first, hi, limit),
+            ).fetchall()
+            if len(ids) >= limit or first == lo:
+                return [
+                    self._conn.execute("SELECT offset, length FROM episodes WHERE id = ?", row).fetchone()
+                    for row in ids
+                ]
+            window *= WINDOW_GROWTH
+
+    def search(self, text: str, limit: int = 3, start: float | None = None, end: float | None = None):
+        terms = recall_terms(text)
+        with self._lock:
+            self.open()
+            lo, hi = self._id_bounds(start, end)
+            if lo is None:
+                return []
+            if not terms:
+                rows = self._conn.execute(
+                    "SELECT offset, length FROM episodes WHERE id BETWEEN ? AND ? ORDER BY id DESC LIMIT ?", (lo, hi, limit),
+                ).fetchall()
+            else:
+                quoted = ['"' + t.replace('"', '""') + '"*' for t in terms]
+                rows = []
+                for match in (" ".join(quoted), " OR ".join(quoted)) if len(quoted) > 1 else (quoted[0],):
+                    rows = self._match(match, lo, hi, limit)
+                    if rows:
+                        break
+        found = []
+        for offset, length in rows:
+            ep = self._load(offset, length)
+            if ep is not None:
+                found.append(ep)
+        return found
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_recall_index() -> RecallIndex:
+    key = (paths.recall_db, paths.episode_log)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = RecallIndex(*key)
+    return index.open()
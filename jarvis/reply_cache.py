@@ -0,0 +1,214 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from .intents import INTENT_DIM, STOPWORDS, featurize, sparse_dump, sparse_load
+from .tracing import tracer
+
+REPLY_CACHE_THRESHOLD = 0.4
+REPLY_CACHE_TTL = 24 * 3600
+REPLY_CACHE_SIZE = 256
+REPLY_CACHE_CANDIDATES = 5
+PERSONAL_WORDS = {
+    "i", "i'm", "im", "i've", "i'd", "my", "mine", "myself", "we", "our", "mera", "meri", "mere", "mujhe",
+}
+CONTEXT_WORDS = {
+    "it", "that", "this", "those", "these", "he", "she", "they", "him", "her", "them", "again", "more", "also",
+    "above", "previous", "earlier", "last", "continue", "else",
+}
+VOLATILE_WORDS = {
+    "today", "tonight", "now", "currently", "latest", "current", "news", "weather", "time", "date", "yesterday",
+    "tomorrow", "aaj", "abhi",
+}
+FILLER_WORDS = {
+    "what", "what's", "whats", "how", "why", "who", "is", "are", "was", "do", "does", "explain", "tell", "about",
+    "simply", "simple", "quickly", "briefly", "short", "give", "show", "in", "on", "with", "and", "or", "kya", "hai",
+    "hota", "batao", "de", "do", "karo", "kaise", "samjhao",
+}
+REQUEST_WORDS = {
+    "make", "recipe", "cook", "prepare", "step", "guide", "tutorial", "instruction", "way", "meaning", "mean",
+    "define", "definition",
+}
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+def content_words(text: str) -> frozenset:
+    words = (w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS and w not in FILLER_WORDS)
+    return frozenset(w[:-1] if len(w) > 3 and w.endswith("s") else w for w in words)
+
+def same_topic(a: frozenset, b: frozenset) -> bool:
+    return (a - REQUEST_WORDS or a) == (b - REQUEST_WORDS or b)
+
+def cacheable(query_lower: str, user_name: str = "") -> bool:
+    words = set(_WORD_RE.findall(query_lower))
+    if not words or words & PERSONAL_WORDS or words & CONTEXT_WORDS or words & VOLATILE_WORDS:
+        return False
+    return not (user_name and user_name.lower() in query_lower)
+
+class _PersonaCache:
+    def __init__(self, np, capacity: int):
+        self.matrix = np.zeros((capacity, INTENT_DIM), dtype=np.float32)
+        self.entries = OrderedDict()
+        self.keys = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+
+class ReplyCache:
+    def __init__(self, threshold: float = REPLY_CACHE_THRESHOLD, ttl: float = REPLY_CACHE_TTL, capacity: int = REPLY_CACHE_SIZE):
+        self.enabled = False
+        self.threshold = threshold
+        self.ttl = ttl
+        self.capacity = capacity
+        self._np = None
+        self._personas = {}
+        self._lock = threading.Lock()
+        self.counters = {
+            "lookups": 0, "hits": 0, "skipped": 0, "stores": 0,
+            "evicted_lru": 0, "evicted_ttl": 0, "saved_ms": 0,
+        }
+
+    def enable(self) -> bool:
+        try:
+            import numpy as np
+        except ImportError:
+            print("numpy not installed; reply cache disabled.")
+            return False
+        self._np = np
+        self.enabled = True
+        return True
+
+    def _vector(self, text: str):
+        features = featurize(text)
+        if not features:
+            return None, None
+        np = self._np
+        idx = np.fromiter(features.keys(), dtype=np.intp, count=len(features))
+        weights = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+        return idx, weights / np.linalg.norm(weights)
+
+    def _cache(self, persona: str):
+        cache = self._personas.get(persona)
+        if cache is None:
+            cache = _PersonaCache(self._np, self.capacity)
+            self._personas[persona] = cache
+        return cache
+
+    def _evict(self, cache, key, reason: str):
+        entry = cache.entries.pop(key)
+        cache.matrix[entry["slot"]] = 0.0
+        cache.keys[entry["slot"]] = None
+        cache.free.append(entry["slot"])
+        self.counters[f"evicted_{reason}"] += 1
+
+    def lookup(self, query_lower: str, persona: str, user_name: str = ""):
+        if not self.enabled:
+            return None
+        if not cacheable(query_lower, user_name):
+            with self._lock:
+                self.counters["skipped"] += 1
+            return None
+        start = time.perf_counter()
+        np = self._np
+        idx, weights = self._vector(query_lower)
+        with self._lock:
+            self.counters["lookups"] += 1
+            cache = self._personas.get(persona)
+            if idx is None or cache is None or not cache.entries:
+                return None
+            scores = cache.matrix[:, idx] @ weights
+            k = min(REPLY_CACHE_CANDIDATES, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            words = content_words(query_lower)
+            now = time.time()
+            entry = None
+            for slot in top[np.argsort(-scores[top])]:
+                if scores[slot] < self.threshold:
+                    break
+                key = cache.keys[slot]
+                if key is None:
+                    continue
+                if now - cache.entries[key]["created"] > self.ttl:
+                    self._evict(cache, key, "ttl")
+                    continue
+                if same_topic(words, cache.entries[key]["words"]):
+                    entry = cache.entries[key]
+                    break
+            if entry is None:
+                return None
+            cache.entries.move_to_end(key)
+            lookup_ms = (time.perf_counter() - start) * 1000.0
+            self.counters["hits"] += 1
+            self.counters["saved_ms"] += int(max(0.0, entry["generate_ms"] - lookup_ms))
+        tracer.record("reply_cache.hit", lookup_ms)
+        return entry["reply"]
+
+    def store(self, query_lower: str, persona: str, reply: str, generate_ms: float, user_name: str = ""):
+        if not self.enabled or not reply or not cacheable(query_lower, user_name):
+            return
+        if user_name and user_name.lower() in reply.lower():
+            return
+        idx, weights = self._vector(query_lower)
+        if idx is None:
+            return
+        with self._lock:
+            cache = self._cache(persona)
+            if query_lower in cache.entries:
+                self._evict(cache, query_lower, "lru")
+                self.counters["evicted_lru"] -= 1
+            now = time.time()
+            for key in [k for k, e in cache.entries.items() if now - e["created"] > self.ttl]:
+                self._evict(cache, key, "ttl")
+            if not cache.free:
+                self._evict(cache, next(iter(cache.entries)), "lru")
+            slot = cache.free.pop()
+            cache.matrix[slot, idx] = weights
+            cache.keys[slot] = query_lower
+            cache.entries[query_lower] = {
+                "slot": slot, "reply": reply, "words": content_words(query_lower), "created": now, "generate_ms": generate_ms,
+            }
+            self.counters["stores"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._personas.clear()
+
+    def snapshot(self):
+        if not self.enabled:
+            return None
+        with self._lock:
+            return {
+                persona: {"matrix": sparse_dump(self._np, cache.matrix), "entries": [(k, dict(e)) for k, e in cache.entries.items()]}
+                for persona, cache in self._personas.items() if cache.entries
+            }
+
+    def restore(self, data) -> bool:
+        if not self.enabled or data is None:
+            return False
+        np = self._np
+        now = time.time()
+        personas = {}
+        for persona, saved in data.items():
+            cache = _PersonaCache(np, self.capacity)
+            sparse_load(np, saved["matrix"], cache.matrix)
+            for key, entry in saved["entries"]:
+                if now - entry["created"] > self.ttl:
+                    cache.matrix[entry["slot"]] = 0.0
+                    continue
+                cache.entries[key] = entry
+                cache.keys[entry["slot"]] = key
+            cache.free = [slot for slot in range(self.capacity - 1, -1, -1) if cache.keys[slot] is None]
+            personas[persona] = cache
+        with self._lock:
+            self._personas = personas
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.counters["lookups"]
+            return {
+                "enabled": self.enabled,
+                "entries": sum(len(c.entries) for c in self._personas.values()),
+                "hit_rate": round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+                **self.counters,
+            }
+
+reply_cache = ReplyCache()
@@ -0,0 +1,280 @@
+import json
+import threading
+import time
+from collections import deque
+
+from . import llm
+from .paths import paths
+
+CHECK_INTERVAL = 10.0
+HIGH_WATER_PERCENT = 85.0
+LOW_WATER_PERCENT = 70.0
+MIN_IDLE_SECONDS = 60.0
+IDLE_UNLOAD_SECONDS = {"llama3:8b": 300.0}
+NO_RESTORE = {"llama3:8b"}
+COLD_LOAD_MS = 300.0
+KEEP_ALIVE = "60m"
+EVENT_HISTORY = 200
+
+class _Resident:
+    def __init__(self, name: str, load, unload, restore: bool = True, idle_unload: float | None = None, kind: str = "local"):
+        self.name = name
+        self.kind = kind
+        self.load = load
+        self.unload = unload
+        self.restore = restore
+        self.idle_unload = idle_unload
+        self.resident = False
+        self.evicted = False
+        self.active = 0
+        self.uses = 0
+        self.last_used = 0.0
+        self.size_mb = None
+        self.load_ms = None
+
+    def observe_load(self, ms: float):
+        self.load_ms = ms if self.load_ms is None else 0.7 * self.load_ms + 0.3 * ms
+
+class ResidencyManager:
+    def __init__(self, interval: float = CHECK_INTERVAL, high_water: float = HIGH_WATER_PERCENT,
+                 low_water: float = LOW_WATER_PERCENT, min_idle: float = MIN_IDLE_SECONDS):
+        self.interval = interval
+        self.high_water = high_water
+        self.low_water = low_water
+        self.min_idle = min_idle
+        self.entries = {}
+        self.events = deque(maxlen=EVENT_HISTORY)
+        self.counters = {"unloads": 0, "cold_loads": 0, "cold_load_ms": 0, "preloads": 0, "load_errors": 0}
+        self._psutil = None
+        self._lock = threading.RLock()
+        self._loading = set()
+        self._unloading = set()
+        self._settled = threading.Condition(self._lock)
+        self._internal = threading.local()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self, name: str, load, unload, restore: bool = True, idle_unload: float | None = None,
+                 resident: bool = True, kind: str = "local"):
+        with self._lock:
+            entry = self.entries.get(name)
+            if entry is None:
+                entry = self.entries[name] = _Resident(name, load, unload, restore, idle_unload, kind)
+            else:
+                entry.load, entry.unload = load, unload
+            entry.resident = resident
+            entry.last_used = time.monotonic()
+            return entry
+
+    def _ollama_entry(self, model: str):
+        entry = self.entries.get(model)
+        if entry is None:
+            entry = self.register(
+                model,
+                load=lambda: llm.generate(model, "", priority=llm.BACKGROUND, keep_alive=KEEP_ALIVE),
+                unload=lambda: llm.generate(model, "", priority=llm.BACKGROUND, keep_alive=0),
+                restore=model not in NO_RESTORE,
+                idle_unload=IDLE_UNLOAD_SECONDS.get(model),
+                resident=False,
+                kind="ollama",
+            )
+        return entry
+
+    def begin(self, name: str):
+        if getattr(self._internal, "active", False):
+            return None
+        with self._lock:
+            while name in self._unloading:
+                self._settled.wait()
+            entry = self.entries.get(name) or self._ollama_entry(name)
+            entry.active += 1
+            entry.uses += 1
+            entry.last_used = time.monotonic()
+            return entry.resident
+
+    def end(self, name: str, resp=None, load_ms: float | None = None):
+        if getattr(self._internal, "active", False):
+            return
+        with self._lock:
+            entry = self.entries.get(name)
+            if entry is None:
+                return
+            entry.active = max(0, entry.active - 1)
+            entry.last_used = time.monotonic()
+            if load_ms is None and isinstance(resp, dict) and resp.get("load_duration"):
+                load_ms = resp["load_duration"] / 1e6
+            was_resident = entry.resident
+            entry.resident = True
+            if load_ms is None or load_ms < COLD_LOAD_MS:
+                return
+            entry.observe_load(load_ms)
+            if not was_resident or entry.evicted:
+                self.counters["cold_loads"] += 1
+                self.counters["cold_load_ms"] += int(load_ms)
+                self._event(entry, "cold_load", "evicted before use" if entry.evicted else "on demand", load_ms)
+            entry.evicted = False
+
+    def _memory_percent(self):
+        if self._psutil is None:
+            try:
+                import psutil
+                self._psutil = psutil
+            except ImportError:
+                print("Model residency needs psutil to watch memory pressure (pip install psutil).")
+                self._psutil = False
+        return self._psutil.virtual_memory().percent if self._psutil else None
+
+    def _event(self, entry: _Resident, action: str, reason: str, ms: float | None = None):
+        event = {
+            "ts": round(time.time(), 3), "name": entry.name, "action": action, "reason": reason,
+            "ms": None if ms is None else round(ms, 1), "memory_percent": self._memory_percent(),
+        }
+        self.events.append(event)
+        try:
+            with open(paths.residency_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event) + "\n")
+        except OSError as e:
+            print(f"Residency log error: {e}")
+
+    def _unload(self, entry: _Resident, reason: str, min_idle: float = 0.0) -> bool:
+        with self._lock:
+            if entry.active or not entry.resident or entry.name in self._loading or entry.name in self._unloading:
+                return False
+            if time.monotonic() - entry.last_used < min_idle:
+                return False
+            self._unloading.add(entry.name)
+        start = time.perf_counter()
+        unloaded = False
+        self._internal.active = True
+        try:
+            entry.unload()
+            unloaded = True
+        except Exception as e:
+            print(f"Unload error ({entry.name}): {e}")
+        finally:
+            self._internal.active = False
+            with self._lock:
+                self._unloading.discard(entry.name)
+                if unloaded:
+                    entry.resident = False
+                    entry.evicted = True
+                    self.counters["unloads"] += 1
+                self._settled.notify_all()
+        if unloaded:
+            self._event(entry, "unload", reason, (time.perf_counter() - start) * 1000.0)
+        return unloaded
+
+    def _load(self, entry: _Resident, reason: str):
+        start = time.perf_counter()
+        self._internal.active = True
+        try:
+            entry.load()
+        except Exception as e:
+            self.counters["load_errors"] += 1
+            print(f"Preload error ({entry.name}): {e}")
+            return
+        finally:
+            self._internal.active = False
+            with self._lock:
+                self._loading.discard(entry.name)
+        ms = (time.perf_counter() - start) * 1000.0
+        with self._lock:
+            entry.resident = True
+            entry.evicted = False
+            entry.observe_load(ms)
+            self.counters["preloads"] += 1
+        self._event(entry, "load", reason, ms)
+
+    def expect(self, name: str, reason: str = "predicted use") -> bool:
+        with self._lock:
+            entry = self.entries.get(name) or self._ollama_entry(name)
+            if entry.resident or name in self._loading:
+                return False
+            memory = self._memory_percent()
+            if memory is not None and memory >= self.high_water:
+                return False
+            self._loading.add(name)
+        threading.Thread(target=self._load, args=(entry, reason), daemon=True, name="arjun-preload").start()
+        return True
+
+    def _sync_ollama(self):
+        try:
+            import ollama
+            listing = ollama.ps()
+        except Exception:
+            return
+        models = listing.get("models") if isinstance(listing, dict) else getattr(listing, "models", None)
+        if models is None:
+            return
+        loaded = {}
+        for m in models:
+            get = m.get if isinstance(m, dict) else lambda k, m=m: getattr(m, k, None)
+            loaded[get("model") or get("name")] = get("size")
+        with self._lock:
+            for name, size in loaded.items():
+                entry = self._ollama_entry(name)
+                entry.resident = True
+                if size:
+                    entry.size_mb = round(size / 1e6)
+            for entry in self.entries.values():
+                if entry.kind == "ollama" and entry.name not in loaded and entry.active == 0:
+                    entry.resident = False
+
+    def check(self):
+        self._sync_ollama()
+        now = time.monotonic()
+        memory = self._memory_percent()
+        with self._lock:
+            idle = sorted(
+                (e for e in self.entries.values() if e.resident and e.active == 0 and e.name not in self._loading),
+                key=lambda e: e.last_used,
+            )
+        for entry in idle:
+            if entry.idle_unload is not None and now - entry.last_used >= entry.idle_unload:
+                self._unload(entry, f"idle {now - entry.last_used:.0f}s", entry.idle_unload)
+        if memory is not None and memory >= self.high_water:
+            for entry in idle:
+                if not entry.resident or now - entry.last_used < self.min_idle:
+                    continue
+                if not self._unload(entry, f"memory {memory:.0f}%", self.min_idle):
+                    continue
+                memory = self._memory_percent()
+                if memory < self.low_water:
+                    break
+        elif memory is None or memory < self.low_water:
+            with self._lock:
+                restore = [e for e in self.entries.values() if e.evicted and e.restore and not e.resident]
+            for entry in restore:
+                self.expect(entry.name, "memory recovered")
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Residency check error: {e}")
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="arjun-residency")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = {
+                e.name: {
+                    "resident": e.resident, "active": e.active, "uses": e.uses,
+                    "idle_s": round(time.monotonic() - e.last_used, 1) if e.last_used else None,
+                    "load_ms": None if e.load_ms is None else round(e.load_ms), "size_mb": e.size_mb,
+                }
+                for e in self.entries.values()
+            }
+            return {"memory_percent": self._memory_percent(), "entries": entries, **self.counters, "recent": list(self.events)[-10:]}
+
+residency = ResidencyManager()
+llm.scheduler.usage_hooks.append((residency.begin, residency.end))
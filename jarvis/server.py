@@ -0,0 +1,407 @@
+import argparse
+import asyncio
+import base64
+import contextvars
+import hashlib
+import json
+import struct
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .paths import paths
+from . import llm
+from .ai_engine import context_cache
+from .reply_cache import reply_cache
+from .sysmon import FIELDS as SYSMON_FIELDS, monitor
+from .residency import residency
+from .tracing import tracer, Turn
+from .headless import CaptureAudio, EventSink, make_assistant
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11B22"
+MAX_BODY_BYTES = 8 * 1024 * 1024
+SESSION_IDLE_SECONDS = 30 * 60
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+class Session:
+    def __init__(self, context, rate: float, burst: int):
+        self.id = uuid.uuid4().hex[:16]
+        self.context = context
+        self.lock = asyncio.Lock()
+        self.bucket = TokenBucket(rate, burst)
+        self.last_seen = time.monotonic()
+        self.turns = 0
+        self.active_turn = None
+
+    def cancel(self) -> bool:
+        turn = self.active_turn
+        if turn is None or turn.cancelled.is_set():
+            return False
+        turn.cancel()
+        return True
+
+class Rejected(Exception):
+    def __init__(self, status: int, reason: str):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+
+class AssistantServer:
+    def __init__(self, max_sessions=200, max_inflight=8, max_queued=64, rate=2.0, burst=5, workers=8):
+        self.sessions = {}
+        self.assistant = None
+        self._assistant_lock = asyncio.Lock()
+        self.max_sessions = max_sessions
+        self.max_queued = max_queued
+        self.rate = rate
+        self.burst = burst
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="arjun-turn")
+        self.inflight = asyncio.Semaphore(max_inflight)
+        self.waiting = 0
+        self.counters = {"turns": 0, "rejected_rate": 0, "rejected_busy": 0, "errors": 0, "cancelled": 0}
+
+    async def create_session(self) -> Session:
+        self._evict_idle()
+        if len(self.sessions) >= self.max_sessions:
+            raise Rejected(503, "too many sessions")
+        loop = asyncio.get_running_loop()
+        async with self._assistant_lock:
+            if self.assistant is None:
+                self.assistant = await loop.run_in_executor(self.executor, make_assistant)
+        context = await loop.run_in_executor(self.executor, self.assistant.new_session, EventSink(), CaptureAudio())
+        session = Session(context, self.rate, self.burst)
+        self.sessions[session.id] = session
+        return session
+
+    def close_session(self, session_id: str) -> bool:
+        return self.sessions.pop(session_id, None) is not None
+
+    def _evict_idle(self):
+        cutoff = time.monotonic() - SESSION_IDLE_SECONDS
+        for sid in [sid for sid, s in self.sessions.items() if s.last_seen < cutoff and not s.lock.locked()]:
+            del self.sessions[sid]
+
+    async def run_turn(self, session: Session, payload: dict) -> dict:
+        session.last_seen = time.monotonic()
+        if not session.bucket.take():
+            self.counters["rejected_rate"] += 1
+            raise Rejected(429, "rate limit exceeded for this session")
+        if self.waiting >= self.max_queued:
+            self.counters["rejected_busy"] += 1
+            raise Rejected(503, "server busy")
+
+        text = (payload.get("text") or "").strip()
+        audio_b64 = payload.get("audio_wav_b64")
+        if not text and not audio_b64:
+            raise Rejected(400, "turn needs 'text' or 'audio_wav_b64'")
+        if payload.get("interrupt") and session.cancel():
+            self.counters["cancelled"] += 1
+
+        loop = asyncio.get_running_loop()
+        self.waiting += 1
+        admitted = False
+        queued_at = time.perf_counter()
+        try:
+            async with session.lock, self.inflight:
+                self.waiting -= 1
+                admitted = True
+                queue_ms = (time.perf_counter() - queued_at) * 1000
+                ctx = contextvars.copy_context()
+                result = await loop.run_in_executor(
+                    self.executor, ctx.run, self._blocking_turn, session, text, audio_b64, payload.get("followups") or []
+                )
+        finally:
+            if not admitted:
+                self.waiting -= 1
+        result["queue_ms"] = round(queue_ms, 2)
+        self.counters["turns"] += 1
+        session.turns += 1
+        return result
+
+    def _blocking_turn(self, session: Session, text: str, audio_b64: str | None, followups):
+        context = session.context
+        if not text:
+            text = transcribe_wav(base64.b64decode(audio_b64))
+            if not text:
+                return {"session_id": session.id, "text": "", "handler": None, "replies": [], "events": []}
+
+        context.audio.followups = list(followups)
+        start = time.perf_counter()
+        turn = Turn(text, session.id)
+        session.active_turn = turn
+        try:
+            with self.assistant.session(context), tracer.turn(turn=turn):
+                route = self.assistant.handle_query(text)
+        finally:
+            session.active_turn = None
+        return {
+            "session_id": session.id,
+            "turn_id": turn.id,
+            "text": text,
+            "handler": turn.handler,
+            "route": route,
+            "cancelled": turn.cancelled.is_set(),
+            "replies": context.audio.take_spoken(),
+            "events": context.gui_queue.take(),
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self.sessions),
+            "waiting": self.waiting,
+            "counters": dict(self.counters),
+            "stages": tracer.stats(),
+            "llm": llm.scheduler.stats(),
+            "prompt_context": context_cache.stats(),
+            "reply_cache": reply_cache.stats(),
+            "system": monitor.summary(),
+            "residency": residency.stats(),
+        }
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                if headers.get("upgrade", "").lower() == "websocket":
+                    await self._websocket(reader, writer, path, headers)
+                    break
+                status, data = await self._dispatch(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await _write_json(writer, status, data, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _dispatch(self, method: str, path: str, body: bytes):
+        parts = [p for p in path.split("?", 1)[0].split("/") if p]
+        try:
+            if method == "GET" and parts == ["stats"]:
+                return 200, self.stats()
+            if method == "GET" and parts == ["sysmon"]:
+                return 200, {"fields": list(SYSMON_FIELDS), "samples": monitor.snapshot()}
+            if method == "POST" and parts == ["sessions"]:
+                session = await self.create_session()
+                return 201, {"session_id": session.id}
+            if len(parts) >= 2 and parts[0] == "sessions":
+                session = self.sessions.get(parts[1])
+                if session is None:
+                    return 404, {"error": "unknown session"}
+                if method == "DELETE" and len(parts) == 2:
+                    self.close_session(session.id)
+                    return 200, {"closed": session.id}
+                if method == "POST" and parts[2:] == ["cancel"]:
+                    cancelled = session.cancel()
+                    if cancelled:
+                        self.counters["cancelled"] += 1
+                    return 200, {"cancelled": cancelled}
+                if method == "POST" and parts[2:] == ["turns"]:
+                    payload = json.loads(body or b"{}")
+                    return 200, await self.run_turn(session, payload)
+            return 404, {"error": "not found"}
+        except Rejected as e:
+            return e.status, {"error": e.reason}
+        except json.JSONDecodeError:
+            return 400, {"error": "invalid JSON body"}
+        except Exception as e:
+            self.counters["errors"] += 1
+            print(f"Server error: {e}")
+            return 500, {"error": str(e)}
+
+    async def _websocket(self, reader, writer, path, headers):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            await _write_json(writer, 400, {"error": "missing Sec-WebSocket-Key"}, False)
+            return
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+        await writer.drain()
+
+        session = None
+        if "session=" in path:
+            session = self.sessions.get(path.split("session=", 1)[1].split("&", 1)[0])
+        try:
+            if session is None:
+                session = await self.create_session()
+            await _ws_send(writer, {"session_id": session.id})
+            while True:
+                opcode, data = await _ws_recv(reader)
+                if opcode == 0x8:
+                    break
+                if opcode == 0x9:
+                    await _ws_send_frame(writer, 0xA, data)
+                    continue
+                if opcode != 0x1:
+                    continue
+                try:
+                    result = await self.run_turn(session, json.loads(data.decode("utf-8")))
+                except Rejected as e:
+                    result = {"error": e.reason, "status": e.status}
+                except json.JSONDecodeError:
+                    result = {"error": "invalid JSON message", "status": 400}
+                await _ws_send(writer, result)
+        except Rejected as e:
+            await _ws_send(writer, {"error": e.reason, "status": e.status})
+        finally:
+            try:
+                await _ws_send_frame(writer, 0x8, b"")
+            except Exception:
+                pass
+
+def transcribe_wav(data: bytes) -> str:
+    import io
+    import speech_recognition as sr
+    recognizer = sr.Recognizer()
+    with sr.AudioFile(io.BytesIO(data)) as source:
+        audio = recognizer.record(source)
+    try:
+        return recognizer.recognize_google(audio, language="en-in").lower()
+    except Exception:
+        return ""
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").strip().split(" ", 2)
+    except ValueError:
+        return None
+    headers = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = h.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0") or 0)
+    if length > MAX_BODY_BYTES:
+        return None
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, headers, body
+
+async def _write_json(writer, status: int, data: dict, keep_alive: bool):
+    reasons = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable"}
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {reasons.get(status, 'OK')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+    )
+    if status == 429:
+        head += "Retry-After: 1\r\n"
+    writer.write(head.encode() + b"\r\n" + body)
+    await writer.drain()
+
+async def _ws_recv(reader):
+    b1, b2 = await reader.readexactly(2)
+    opcode = b1 & 0x0F
+    length = b2 & 0x7F
+    if length == 126:
+        length = struct.unpack(">H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack(">Q", await reader.readexactly(8))[0]
+    if length > MAX_BODY_BYTES:
+        raise ConnectionError("WebSocket frame too large")
+    mask = await reader.readexactly(4) if b2 & 0x80 else None
+    data = await reader.readexactly(length)
+    if mask:
+        data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+    return opcode, data
+
+async def _ws_send_frame(writer, opcode: int, data: bytes):
+    header = bytes([0x80 | opcode])
+    if len(data) < 126:
+        header += bytes([len(data)])
+    elif len(data) < (1 << 16):
+        header += bytes([126]) + struct.pack(">H", len(data))
+    else:
+        header += bytes([127]) + struct.pack(">Q", len(data))
+    writer.write(header + data)
+    await writer.drain()
+
+async def _ws_send(writer, payload: dict):
+    await _ws_send_frame(writer, 0x1, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+async def serve(host: str, port: int, ready=None, **options):
+    app = AssistantServer(**options)
+    monitor.start()
+    residency.start()
+    server = await asyncio.start_server(app.handle_connection, host, port)
+    bound = server.sockets[0].getsockname()
+    print(f"Arjun server listening on http://{bound[0]}:{bound[1]}")
+    if ready is not None:
+        ready(bound[1], app)
+    async with server:
+        await server.serve_forever()
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serve the assistant to many clients over HTTP/WebSocket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-sessions", type=int, default=200)
+    parser.add_argument("--max-inflight", type=int, default=8, help="Turns executed at the same time across all sessions.")
+    parser.add_argument("--max-queued", type=int, default=64, help="Turns allowed to wait before new ones get 503.")
+    parser.add_argument("--rate", type=float, default=2.0, help="Per-session turns per second (0 disables the limit).")
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--fake-backends", action="store_true", help="Use the zero-latency benchmark stand-ins.")
+    parser.add_argument("--reply-cache", action="store_true", help="Serve repeated general chat questions from the semantic reply cache.")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.fake_backends:
+        sys.path.insert(0, paths.PROJECT_DIR)
+        from benchmarks.fakes import Recorder, install_fakes
+        install_fakes(Recorder({}, scale=0.0))
+    if args.reply_cache:
+        reply_cache.enable()
+    try:
+        asyncio.run(serve(
+            args.host, args.port,
+            max_sessions=args.max_sessions,
+            max_inflight=args.max_inflight,
+            max_queued=args.max_queued,
+            rate=args.rate,
+            burst=args.burst,
+            workers=args.max_inflight,
+        ))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
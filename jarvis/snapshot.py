@@ -0,0 +1,175 @@
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+
+from .ai_engine import context_cache
+from .facts import get_fact_store
+from .paths import paths
+from .reply_cache import reply_cache
+
+SNAPSHOT_MAGIC = b"ARJS"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_INTERVAL = 300
+COMPRESS_LEVEL = 1
+SOURCE_FILES = ("facts_db", "improvements_file")
+MEMORY_FIELDS = ("chat_history", "current_persona", "evolution_append", "user_name", "facts_block")
+_HEADER = struct.Struct("<4sHI")
+
+def file_stamp(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def encode(payload) -> bytes:
+    body = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), COMPRESS_LEVEL)
+    return _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, zlib.crc32(body)) + body
+
+def decode(blob: bytes):
+    if len(blob) < _HEADER.size:
+        return None
+    magic, version, crc = _HEADER.unpack_from(blob)
+    body = memoryview(blob)[_HEADER.size:]
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or zlib.crc32(body) != crc:
+        return None
+    return pickle.loads(zlib.decompress(body))
+
+class SnapshotManager:
+    def __init__(self, assistant, path: str | None = None, interval: float = SNAPSHOT_INTERVAL):
+        self.assistant = assistant
+        self.path = path
+        self.interval = interval
+        self.restored = set()
+        self._signature = None
+        self._armed = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.counters = {"saves": 0, "skipped": 0, "errors": 0, "bytes": 0, "save_ms": 0.0, "restore_ms": 0.0}
+
+    def _path(self) -> str:
+        return self.path or paths.snapshot_file
+
+    def _signature_now(self):
+        state = self.assistant.state
+        history = state.chat_history
+        return (
+            state.prompt_version, state.current_persona, len(history), history[-1]["content"] if history else "",
+            self.assistant.commands.version, reply_cache.counters["stores"], context_cache.counters["primes"],
+        )
+
+    def capture(self) -> dict:
+        state = self.assistant.state
+        memory = {name: getattr(state, name) for name in MEMORY_FIELDS}
+        memory["chat_history"] = [dict(m) for m in state.chat_history]
+        return {
+            "created": time.time(),
+            "sources": {name: file_stamp(getattr(paths, name)) for name in SOURCE_FILES},
+            "memory": memory,
+            "commands": self.assistant.commands.snapshot(),
+            "intents": self.assistant.intents.snapshot(),
+            "reply_cache": reply_cache.snapshot(),
+            "context_cache": context_cache.snapshot(state),
+        }
+
+    def save(self) -> bool:
+        if not self._armed:
+            return False
+        with self._lock:
+            signature = self._signature_now()
+            if signature == self._signature:
+                self.counters["skipped"] += 1
+                return False
+            start = time.perf_counter()
+            path = self._path()
+            tmp = f"{path}.tmp"
+            try:
+                blob = encode(self.capture())
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with open(tmp, "wb") as f:
+                    f.write(blob)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, path)
+            except Exception as e:
+                print(f"Snapshot save error: {e}")
+                self.counters["errors"] += 1
+                return False
+            self._signature = signature
+            self.counters["saves"] += 1
+            self.counters["bytes"] = len(blob)
+            self.counters["save_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            return True
+
+    def _restore_memory(self, saved: dict, fresh: set):
+        state = self.assistant.state
+        state.current_persona = saved["current_persona"]
+        state.chat_history = saved["chat_history"] or [{"role": "system", "content": ""}]
+        if "improvements_file" in fresh:
+            state.evolution_append = saved["evolution_append"]
+        if "facts_db" in fresh:
+            state.facts_block = saved["facts_block"]
+            state.user_name = saved["user_name"]
+        else:
+            state.set_facts(get_fact_store())
+        state.refresh_prompt()
+
+    def restore(self) -> set:
+        start = time.perf_counter()
+        try:
+            with open(self._path(), "rb") as f:
+                payload = decode(f.read())
+        except FileNotFoundError:
+            return set()
+        except Exception as e:
+            print(f"Snapshot load error: {e}")
+            return set()
+        if payload is None:
+            print("Snapshot is from another version or is damaged; starting cold.")
+            return set()
+
+        sources = payload.get("sources") or {}
+        fresh = {name for name in SOURCE_FILES if sources.get(name) == file_stamp(getattr(paths, name))}
+        restored = set()
+        try:
+            self._restore_memory(payload["memory"], fresh)
+            restored.add("memory")
+            if self.assistant.commands.restore(payload.get("commands")):
+                restored.add("commands")
+            if self.assistant.intents.restore(payload.get("intents")):
+                restored.add("intents")
+            if reply_cache.restore(payload.get("reply_cache")):
+                restored.add("reply_cache")
+            if context_cache.restore(payload.get("context_cache"), self.assistant.state):
+                restored.add("context_cache")
+        except Exception as e:
+            print(f"Snapshot restore error: {e}")
+        self.restored = restored
+        self.counters["restore_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        age = time.time() - (payload.get("created") or time.time())
+        print(f"Restored {', '.join(sorted(restored)) or 'nothing'} from a snapshot {age / 60:.0f} min old in {self.counters['restore_ms']} ms.")
+        return restored
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.save()
+
+    def start(self):
+        self._armed = True
+        if self.restored:
+            self._signature = self._signature_now()
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="arjun-snapshot")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> dict:
+        return {"path": self._path(), "restored": sorted(self.restored), **self.counters}
@@ -0,0 +1,182 @@
+import csv
+import json
+import os
+import threading
+import time
+from collections import deque
+
+SAMPLE_INTERVAL = 2.0
+HISTORY_SECONDS = 15 * 60
+TREND_SECONDS = 60
+TREND_DELTAS = {"cpu": 10.0, "ram": 3.0, "proc_cpu": 10.0, "proc_rss_mb": 50.0}
+FIELDS = (
+    "ts", "cpu", "ram", "disk", "net_sent_kbps", "net_recv_kbps",
+    "proc_cpu", "proc_rss_mb", "proc_threads",
+)
+
+class SystemMonitor:
+    def __init__(self, interval: float = SAMPLE_INTERVAL, history_seconds: float = HISTORY_SECONDS):
+        self.interval = interval
+        self.samples = deque(maxlen=max(2, int(history_seconds / interval)))
+        self.errors = 0
+        self._psutil = None
+        self._process = None
+        self._net = None
+        self._disk_path = os.path.abspath(os.sep)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _prime(self) -> bool:
+        if self._psutil is False:
+            return False
+        if self._psutil is None:
+            try:
+                import psutil
+            except ImportError:
+                print("System monitor needs psutil (pip install psutil).")
+                self._psutil = False
+                return False
+            self._psutil = psutil
+            self._process = psutil.Process()
+            psutil.cpu_percent(None)
+            self._process.cpu_percent(None)
+            self._net = (time.monotonic(), psutil.net_io_counters())
+        return True
+
+    def sample(self):
+        psutil = self._psutil
+        now = time.monotonic()
+        net = psutil.net_io_counters()
+        last_t, last_net = self._net
+        elapsed = max(now - last_t, 1e-6)
+        self._net = (now, net)
+        with self._process.oneshot():
+            proc_cpu = self._process.cpu_percent(None)
+            rss = self._process.memory_info().rss
+            threads = self._process.num_threads()
+        row = (
+            time.time(),
+            psutil.cpu_percent(None),
+            psutil.virtual_memory().percent,
+            psutil.disk_usage(self._disk_path).percent,
+            round(max(0, net.bytes_sent - last_net.bytes_sent) / 1024 / elapsed, 1),
+            round(max(0, net.bytes_recv - last_net.bytes_recv) / 1024 / elapsed, 1),
+            proc_cpu,
+            round(rss / 1e6, 1),
+            threads,
+        )
+        with self._lock:
+            self.samples.append(row)
+        return row
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                self.errors += 1
+                if self.errors <= 3:
+                    print(f"System monitor error: {e}")
+
+    def start(self) -> bool:
+        if self.running:
+            return True
+        if not self._prime():
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="arjun-sysmon")
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+        self._thread = None
+
+    def snapshot(self, seconds: float | None = None):
+        with self._lock:
+            rows = list(self.samples)
+        if seconds is not None and rows:
+            cutoff = rows[-1][0] - seconds
+            rows = [r for r in rows if r[0] >= cutoff]
+        return rows
+
+    def latest(self) -> dict | None:
+        if not self.samples and self._prime():
+            time.sleep(0.2)
+            self.sample()
+        rows = self.snapshot()
+        return dict(zip(FIELDS, rows[-1])) if rows else None
+
+    def trend(self, field: str, seconds: float = TREND_SECONDS):
+        rows = self.snapshot(seconds)
+        if len(rows) < 4:
+            return "steady", 0.0
+        i = FIELDS.index(field)
+        third = max(1, len(rows) // 3)
+        before = sum(r[i] for r in rows[:third]) / third
+        after = sum(r[i] for r in rows[-third:]) / third
+        delta = after - before
+        threshold = TREND_DELTAS.get(field, 0.0)
+        if delta >= threshold:
+            return "rising", delta
+        if delta <= -threshold:
+            return "falling", delta
+        return "steady", delta
+
+    def summary(self) -> dict:
+        current = self.latest()
+        if current is None:
+            return {"running": False, "samples": 0}
+        rows = self.snapshot(TREND_SECONDS)
+        return {
+            "running": self.running,
+            "samples": len(self.samples),
+            "interval_s": self.interval,
+            "current": current,
+            "minute_peak": {f: max(r[FIELDS.index(f)] for r in rows) for f in ("cpu", "ram", "proc_cpu", "proc_rss_mb")},
+            "trends": {f: self.trend(f)[0] for f in TREND_DELTAS},
+            "errors": self.errors,
+        }
+
+    def describe(self) -> str | None:
+        current = self.latest()
+        if current is None:
+            return None
+        parts = []
+        for field, label in (("cpu", "CPU"), ("ram", "RAM")):
+            direction, delta = self.trend(field)
+            text = f"{label} is at {current[field]:.0f} percent"
+            if direction != "steady":
+                text += f", {direction} by {abs(delta):.0f} points over the last minute"
+            parts.append(text)
+        parts.append(f"the disk is {current['disk']:.0f} percent full")
+        net = current["net_recv_kbps"] + current["net_sent_kbps"]
+        if net >= 1:
+            parts.append(f"network traffic is about {net:.0f} kilobytes per second")
+        parts.append(
+            f"I am using {current['proc_cpu']:.0f} percent CPU, {current['proc_rss_mb']:.0f} megabytes "
+            f"and {current['proc_threads']} threads"
+        )
+        return ". ".join(p[0].upper() + p[1:] for p in parts) + "."
+
+    def export(self, path: str) -> int:
+        rows = self.snapshot()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if path.endswith(".jsonl"):
+                for row in rows:
+                    f.write(json.dumps(dict(zip(FIELDS, row))) + "\n")
+            else:
+                writer = csv.writer(f)
+                writer.writerow(FIELDS)
+                writer.writerows(rows)
+        return len(rows)
+
+monitor = SystemMonitor()
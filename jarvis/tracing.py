@@ -0,0 +1,160 @@
+import contextvars
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+HISTOGRAM_WINDOW = 500
+HISTOGRAM_BUCKETS_MS = (50, 100, 250, 500, 1000, 2000, 5000, 10000)
+
+_current_turn = contextvars.ContextVar("arjun_turn", default=None)
+
+def _percentile(ordered, pct: float) -> float:
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+class Turn:
+    def __init__(self, query: str = "", session_id: str | None = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.query = query
+        self.session_id = session_id
+        self.started = time.perf_counter()
+        self.spans = []
+        self.replies = []
+        self.handler = None
+        self.logged = False
+        self.cancelled = threading.Event()
+        self._cancel_lock = threading.Lock()
+        self._on_cancel = []
+
+    def on_cancel(self, callback):
+        with self._cancel_lock:
+            if not self.cancelled.is_set():
+                self._on_cancel.append(callback)
+                return callback
+        callback()
+        return callback
+
+    def remove_cancel_callback(self, callback):
+        with self._cancel_lock:
+            if callback in self._on_cancel:
+                self._on_cancel.remove(callback)
+
+    def cancel(self):
+        with self._cancel_lock:
+            if self.cancelled.is_set():
+                return
+            self.cancelled.set()
+            callbacks, self._on_cancel = self._on_cancel, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Cancel callback error: {e}")
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def trace(self) -> dict:
+        record = {
+            "turn_id": self.id,
+            "latency_ms": round(self.elapsed_ms(), 1),
+            "spans": [dict(s) for s in self.spans],
+        }
+        if self.session_id:
+            record["session_id"] = self.session_id
+        if self.cancelled.is_set():
+            record["cancelled"] = True
+        return record
+
+class Tracer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows = defaultdict(lambda: deque(maxlen=HISTOGRAM_WINDOW))
+
+    def record(self, name: str, ms: float):
+        with self._lock:
+            self._windows[name].append(ms)
+
+    @contextmanager
+    def turn(self, query: str = "", session_id: str | None = None, turn: Turn | None = None):
+        turn = turn or Turn(query, session_id)
+        token = _current_turn.set(turn)
+        try:
+            yield turn
+        finally:
+            _current_turn.reset(token)
+            if turn.query:
+                self.record("turn", turn.elapsed_ms())
+
+    @contextmanager
+    def activate(self, turn: Turn):
+        token = _current_turn.set(turn)
+        try:
+            yield turn
+        finally:
+            _current_turn.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        turn = _current_turn.get()
+        start = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            ms = (time.perf_counter() - start) * 1000.0
+            self.record(name, ms)
+            if turn is not None:
+                entry = {"name": name, "start_ms": round((start - turn.started) * 1000.0, 1), "ms": round(ms, 1)}
+                if attrs:
+                    entry.update(attrs)
+                turn.spans.append(entry)
+
+    def stats(self, name: str | None = None) -> dict:
+        with self._lock:
+            windows = {k: sorted(v) for k, v in self._windows.items() if name is None or k == name}
+        return {
+            k: {
+                "count": len(v),
+                "p50": round(_percentile(v, 50), 1),
+                "p95": round(_percentile(v, 95), 1),
+                "p99": round(_percentile(v, 99), 1),
+                "max": round(v[-1], 1) if v else 0.0,
+            }
+            for k, v in windows.items()
+        }
+
+    def histogram(self, name: str) -> dict:
+        with self._lock:
+            values = list(self._windows.get(name, ()))
+        counts = {}
+        lower = 0
+        for upper in HISTOGRAM_BUCKETS_MS:
+            counts[f"{lower}-{upper}ms"] = sum(1 for v in values if lower <= v < upper)
+            lower = upper
+        counts[f">={lower}ms"] = sum(1 for v in values if v >= lower)
+        return counts
+
+    def report_lines(self, top: int = 8) -> list:
+        stats = self.stats()
+        stats.pop("query", None)
+        ordered = sorted(stats.items(), key=lambda kv: kv[1]["p95"], reverse=True)[:top]
+        return [f"{name}: p50 {s['p50']:.0f} ms, p95 {s['p95']:.0f} ms (n={s['count']})" for name, s in ordered]
+
+tracer = Tracer()
+
+def current_turn():
+    return _current_turn.get()
+
+def span(name: str, **attrs):
+    return tracer.span(name, **attrs)
+
+def note_reply(text: str):
+    turn = _current_turn.get()
+    if turn is not None:
+        turn.replies.append(text)
@@ -6,6 +6,8 @@ import sys
 import os
 import subprocess
 
+from .contacts import MATCH_THRESHOLD, Contact, get_contact_directory
+
 CONTACTS = {
 }
 
@@ -28,10 +30,16 @@ def parse_send_message_command(text: str):
     return contact_name, message
 
 def resolve_contact(name: str) -> str | None:
+    contact, _ = find_contact(name)
+    return contact.phone if contact else None
+
+def find_contact(name: str):
     if not name:
-        return None
+        return None, []
     key = name.strip().lower()
-    return CONTACTS.get(key)
+    if CONTACTS.get(key):
+        return Contact(name.strip(), CONTACTS[key]), []
+    return get_contact_directory(CONTACTS).resolve(name)
 
 def _open_uri(uri: str):
     try:
@@ -71,16 +79,23 @@ def handle_whatsapp_command(text: str, audio_mgr, update_gui_status=None) -> boo
     if update_gui_status:
         update_gui_status("Preparing WhatsApp message...")
 
-    phone = resolve_contact(contact_name)
-    if not phone:
+    contact, candidates = find_contact(contact_name)
+    if not contact:
+        if len(candidates) > 1 and candidates[1][1] >= MATCH_THRESHOLD:
+            audio_mgr.say(
+                f"Did you mean {candidates[0][0].name} or {candidates[1][0].name}? "
+                "Please say the full name."
+            )
+            return True
         audio_mgr.say(
             f"I recognised this as a WhatsApp message command, "
             f"but I don't have a number saved for {contact_name}."
         )
         return True
+    phone = contact.phone
 
     audio_mgr.say(
-        f"Opening WhatsApp to message {contact_name}. "
+        f"Opening WhatsApp to message {contact.name}. "
         "Check the chat window and press Enter to send."
     )
 
@@ -1,5 +1,60 @@
+import argparse
 
-from gui.window import run_app
+from jarvis.profiler import profiler
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Arjun AI desktop assistant.")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Replay a file of text queries without mic, TTS or GUI (see --headless --help).",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run the multi-session HTTP/WebSocket server (see --serve --help).",
+    )
+    parser.add_argument(
+        "--analytics",
+        action="store_true",
+        help="Summarize the episode log instead of starting the assistant (see --analytics --help).",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print per-module import and init timings once the assistant is ready.",
+    )
+    parser.add_argument(
+        "--reply-cache",
+        action="store_true",
+        help="Serve repeated general chat questions from the semantic reply cache instead of regenerating.",
+    )
+    args, rest = parser.parse_known_args()
+
+    if args.headless:
+        from jarvis.headless import main as headless_main
+        headless_main(rest)
+        return
+    if args.serve:
+        from jarvis.server import main as server_main
+        server_main(rest)
+        return
+    if args.analytics:
+        from jarvis.analytics import main as analytics_main
+        analytics_main(rest)
+        return
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+
+    if args.profile_startup:
+        profiler.install()
+    if args.reply_cache:
+        from jarvis.reply_cache import reply_cache
+        reply_cache.enable()
+
+    with profiler.phase("import gui.window"):
+        from gui.window import run_app
     run_app()
+
+if __name__ == "__main__":
+    main()